@@ -2,19 +2,23 @@ import bpy # type: ignore
 import json
 from bpy.app.handlers import persistent
 from .op_apply_preset import register as register_op_apply_preset, unregister as unregister_op_apply_preset
+from .op_collection_entries import register as register_op_collection_entries, unregister as unregister_op_collection_entries
+from .component_search import get_component_index, search_components
 from .cli_dump_component_data import dump_component_data # type: ignore
 from .cli_change_component_path import change_component_path # type: ignore
 from .op_insert_component import register as register_op_insert_component, unregister as unregister_op_insert_component
-from .op_registry_loading import FetchRemoteTypeRegistry, ReloadSkeinRegistryJson
+from .op_registry_loading import ExpandSkeinRegistryJson, FetchRemoteTypeRegistry, MaterializeSkeinComponents, ReloadSkeinRegistryJson, materialize_components
 from .op_remove_component import register as register_op_remove_component, unregister as unregister_op_remove_component
 from .op_debug_check_components import DebugCheckComponents
+from .export_cache import clear_component_cache, mark_dirty
 from .property_groups import ComponentData
+from .registry_state import get_registry, set_registry
 from .skein_panel import register as register_skein_panel, unregister as unregister_skein_panel
 from .skein_panel_presets import register as register_skein_panel_presets, unregister as unregister_skein_panel_presets
 from .skein_sidepanel import register as register_skein_sidepanel, unregister as unregister_skein_sidepanel
 from .op_trigger_collection_exporters import register as register_op_trigger_collection_exporters, unregister as unregister_op_trigger_collection_exporters
 # these imports appear unused, but are *required* for the export extension to work
-from .gltf_export_extension import glTF_extension_name, extension_is_required, SkeinExtensionProperties, draw_export, glTF2ExportUserExtension, pre_export_hook, glTF2_pre_export_callback
+from .gltf_export_extension import glTF_extension_name, extension_is_required, SkeinExtensionProperties, draw_export, glTF2ExportUserExtension, pre_export_hook, glTF2_pre_export_callback, glTF2_post_export_callback
 
 class SkeinAddonPreferences(bpy.types.AddonPreferences):
     # This must match the add-on name, use `__package__`
@@ -31,6 +35,72 @@ class SkeinAddonPreferences(bpy.types.AddonPreferences):
         description="Enable the fetching of Default and Preset implementations from Bevy, and the usage of Defaults when inserting a new Component.",
         default=True
     ) # type: ignore
+    incremental: bpy.props.BoolProperty(
+        name="Incremental Registry Processing",
+        description="When a registry is re-processed, only rebuild the types whose schema changed since the last time a registry was processed",
+        default=True
+    ) # type: ignore
+    registry_cache: bpy.props.BoolProperty(
+        name="Compiled Registry Cache",
+        description="Cache compiled registries on disk, so that opening a file with a registry that was already processed only has to register classes",
+        default=True
+    ) # type: ignore
+    lazy: bpy.props.BoolProperty(
+        name="Lazy Component PropertyGroups",
+        description="Only build PropertyGroups for components used in the open file or selected for insertion. Other components are built the first time they are selected or inserted",
+        default=False
+    ) # type: ignore
+    snapshot_export: bpy.props.BoolProperty(
+        name="Snapshot Export",
+        description="When exporting, copy each object's component data in one go and convert it to Bevy's format in Python, instead of reading every field through Blender's property system",
+        default=True
+    ) # type: ignore
+    export_cache: bpy.props.BoolProperty(
+        name="Export Cache",
+        description="Keep each object's exported component data between exports, and only gather it again after the object changes",
+        default=True
+    ) # type: ignore
+    build_report: bpy.props.BoolProperty(
+        name="Registry Build Report",
+        description="Write a report of where time was spent processing a registry to the skein-registry-report.txt text block, and to a json file in the extension's user directory",
+        default=False
+    ) # type: ignore
+    registry_storage: bpy.props.EnumProperty(
+        name="Registry Storage",
+        description="How fetched registry and presets json is stored in the .blend file",
+        items=[
+            ("PRETTY", "Readable", "Indented json, which is easy to read and edit but large"),
+            ("COMPACT", "Compact", "json without whitespace"),
+            ("COMPRESSED", "Compressed", "zlib compressed and base64 encoded json. Use Expand Skein Registry Json to read it"),
+        ],
+        default="COMPACT",
+    ) # type: ignore
+    registry_store: bpy.props.StringProperty(
+        name="Shared Registry Store",
+        description="A directory (// is relative to the .blend file) that fetched registries and presets are written to and read from, so that every .blend file in a project shares them. Leave empty to only embed them in the .blend file",
+        default="",
+        subtype="DIR_PATH",
+    ) # type: ignore
+    embed_registry: bpy.props.BoolProperty(
+        name="Embed Registry Copy",
+        description="Also keep a full copy of the registry and presets in the .blend file, which is used if the shared registry store is missing",
+        default=True
+    ) # type: ignore
+    allow_prefixes: bpy.props.StringProperty(
+        name="Allow",
+        description="Comma separated crate or module prefixes (ex: my_game, avian3d::dynamics). If set, only types that start with one of these prefixes are processed",
+        default=""
+    ) # type: ignore
+    deny_prefixes: bpy.props.StringProperty(
+        name="Deny",
+        description="Comma separated crate or module prefixes (ex: bevy_render, bevy_pbr::light). Types that start with one of these prefixes are not processed, even if they are allowed",
+        default=""
+    ) # type: ignore
+    filter_on_server: bpy.props.BoolProperty(
+        name="Filter When Fetching",
+        description="Also send the crates in the allow and deny lists to Bevy when fetching a registry, so that filtered types are never downloaded. Types from filtered crates that allowed components reference will be missing from the registry",
+        default=False
+    ) # type: ignore
     host: bpy.props.StringProperty(
         name="Host",
         description="A custom BRP host, if you configured your Bevy application with a custom BRP host.",
@@ -42,14 +112,34 @@ class SkeinAddonPreferences(bpy.types.AddonPreferences):
         description="A custom BRP port, if you configured your Bevy application with a custom BRP port.",
         default=""
     ) # type: ignore
+    timeout: bpy.props.FloatProperty(
+        name="Request Timeout",
+        description="Seconds to wait for the Bevy application to respond to each BRP request",
+        default=10.0,
+        min=0.1,
+    ) # type: ignore
     def draw(self, context):
         layout = self.layout
         layout.label(text="Skein Preferences")
         layout.prop(self, "debug")
         layout.prop(self, "presets")
+        layout.prop(self, "incremental")
+        layout.prop(self, "registry_cache")
+        layout.prop(self, "lazy")
+        layout.prop(self, "snapshot_export")
+        layout.prop(self, "export_cache")
+        layout.prop(self, "build_report")
+        layout.prop(self, "registry_storage")
+        layout.prop(self, "registry_store")
+        layout.prop(self, "embed_registry")
+        layout.label(text="crate/module filters:")
+        layout.prop(self, "allow_prefixes")
+        layout.prop(self, "deny_prefixes")
+        layout.prop(self, "filter_on_server")
         layout.label(text="custom host/port:")
         layout.prop(self, "host")
         layout.prop(self, "port")
+        layout.prop(self, "timeout")
 
 class ComponentTypeData(bpy.types.PropertyGroup):
     name: bpy.props.StringProperty(name="Name", default="Unknown") # type: ignore
@@ -58,33 +148,57 @@ class ComponentTypeData(bpy.types.PropertyGroup):
     short_path: bpy.props.StringProperty(name="Short Path", default="Unknown") # type: ignore
 
 class PGSkeinWindowProps(bpy.types.PropertyGroup):
-    registry: bpy.props.StringProperty(name="Bevy Registry", default="{}") # type: ignore
     components: bpy.props.CollectionProperty(type=ComponentTypeData) # type: ignore
 
 def on_select_new_component(self, context):
     """Executed when a new component is selected for insertion onto an object
 
-    currently just for debugging. you can infer what fields should be shown in the ui by reading the registry data.
+    When lazy PropertyGroups are enabled, this builds the PropertyGroup
+    for the selected component. Otherwise it is just for debugging.
     """
 
     debug = False
+    lazy = False
     if __package__ in bpy.context.preferences.addons:
         debug = bpy.context.preferences.addons[__package__].preferences.debug
+        lazy = bpy.context.preferences.addons[__package__].preferences.lazy
+
+    if lazy and context.window_manager.selected_component:
+        materialize_components(context, [context.window_manager.selected_component])
 
     if debug:
         print("\n###### on_select_new_component")
         selected_component = context.window_manager.selected_component;
 
         print("\nselected_component: ", selected_component)
-        global_skein = context.window_manager.skein
-        if global_skein.registry:
-            data = json.loads(global_skein.registry)
+        data = get_registry()
+        if data:
             if selected_component in data and len(data.keys()) > 0:
                 print("\n", json.dumps(data[selected_component], indent=4))
             else:
                 print("\nno data in registry")
         print("\n######\n")
 
+# Blender crashes if python doesn't hold on to the
+# strings in dynamic EnumProperty items
+_crate_items = []
+
+def crate_filter_items(self, context):
+    """the crates in the component search index, for the crate filter"""
+    _crate_items[:] = [("ALL", "All Crates", "Search Components from every crate")] + [
+        (crate, crate, "Only search Components from " + crate)
+        for crate in get_component_index().crates()
+    ]
+    return _crate_items
+
+def on_search_components(self, context, edit_text):
+    """the ranked Components that match the text typed into the component picker"""
+    crate = context.window_manager.selected_component_crate
+    return [
+        (entry.type_path, entry.short_path)
+        for entry in search_components(edit_text, None if crate == "ALL" else crate)
+    ]
+
 # --------------------------------- #
 #  a hook to run when opening a     #
 #  new blend file                   #
@@ -93,8 +207,20 @@ def on_select_new_component(self, context):
 @persistent
 def on_post_blend_file_load(blend_file):
     """blend file is empty if its the startup scene"""
+    clear_component_cache()
     bpy.ops.wm.reload_skein_registry()
 
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    """exported component data of updated IDs is out of date"""
+    for update in depsgraph.updates:
+        mark_dirty(update.id.original)
+
+@persistent
+def on_undo_redo(scene):
+    """undo and redo can change any data without a depsgraph update"""
+    clear_component_cache()
+
 
 cli_commands = []
 
@@ -107,6 +233,7 @@ def menu_func(self, context):
     self.layout.operator(FetchRemoteTypeRegistry.bl_idname)
     # self.layout.operator(DebugCheckComponents.bl_idname)
     self.layout.operator(ReloadSkeinRegistryJson.bl_idname)
+    self.layout.operator(ExpandSkeinRegistryJson.bl_idname)
 
 def register():
     bpy.utils.register_class(SkeinAddonPreferences)
@@ -157,15 +284,34 @@ def register():
         name="component type path",
         description="The component that will be added if selected",
         update=on_select_new_component,
+        # the search index ranks results, so Blender shouldn't re-sort them
+        search=on_search_components,
+        search_options=set(),
+    )
+    bpy.types.WindowManager.selected_component_crate = bpy.props.EnumProperty(
+        name="crate",
+        description="Only search Components from this crate",
+        items=crate_filter_items,
     )
     # skein_property_groups is a dict keyed by component type_path
     # each type_path's value is a PropertyGroup that we can introspect
     # via __annotations__ to build the UI
     bpy.types.WindowManager.skein_property_groups = {}
+    # skein_type_fingerprints is a dict keyed by type_path.
+    # Each value is a hash of the type's schema and the schemas
+    # of everything it references, as of the last time a registry
+    # was processed. Used to only rebuild types that changed.
+    bpy.types.WindowManager.skein_type_fingerprints = {}
+    # skein_property_specs is a dict keyed by type_path.
+    # Each value is the compiled, bpy-independent description
+    # of the PropertyGroup or property for that type.
+    bpy.types.WindowManager.skein_property_specs = {}
 
     # operations
     bpy.utils.register_class(FetchRemoteTypeRegistry)
     bpy.utils.register_class(ReloadSkeinRegistryJson)
+    bpy.utils.register_class(ExpandSkeinRegistryJson)
+    bpy.utils.register_class(MaterializeSkeinComponents)
     bpy.utils.register_class(DebugCheckComponents)
     ## Insertion Operations
     register_op_insert_component()
@@ -175,6 +321,8 @@ def register():
     register_op_trigger_collection_exporters()
     ## Preset Operations
     register_op_apply_preset()
+    ## List, Set, and Map Operations
+    register_op_collection_entries()
     # panel
     register_skein_panel()
     register_skein_sidepanel()
@@ -189,6 +337,10 @@ def register():
 
     # add handlers to run when .blend file loads
     bpy.app.handlers.load_post.append(on_post_blend_file_load)
+    # keep the export cache up to date, see export_cache.py
+    bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    bpy.app.handlers.undo_post.append(on_undo_redo)
+    bpy.app.handlers.redo_post.append(on_undo_redo)
 
     cli_commands.append(bpy.utils.register_cli_command("dump_component_data", dump_component_data))
     cli_commands.append(bpy.utils.register_cli_command("change_component_path", change_component_path))
@@ -203,6 +355,7 @@ def unregister():
 
     # clear the list we use as a component type selector for the UI
     global_skein.components.clear()
+    set_registry({})
     # unregister all of the PropertyGroups that were created the
     # last time we processed a registry schema
     for type_path, property_group in skein_property_groups.items():
@@ -217,6 +370,13 @@ def unregister():
 
     # Clear the list that held the PropertyGroups
     skein_property_groups.clear()
+    bpy.context.window_manager.skein_type_fingerprints.clear()
+    bpy.context.window_manager.skein_property_specs.clear()
+
+    bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+    bpy.app.handlers.undo_post.remove(on_undo_redo)
+    bpy.app.handlers.redo_post.remove(on_undo_redo)
+    clear_component_cache()
 
     bpy.utils.unregister_class(SkeinAddonPreferences)
     # data types that are stored on the window because blender
@@ -228,6 +388,8 @@ def unregister():
     # operations
     bpy.utils.unregister_class(FetchRemoteTypeRegistry)
     bpy.utils.unregister_class(ReloadSkeinRegistryJson)
+    bpy.utils.unregister_class(ExpandSkeinRegistryJson)
+    bpy.utils.unregister_class(MaterializeSkeinComponents)
     bpy.utils.unregister_class(DebugCheckComponents)
     ## Insertion Operations
     unregister_op_insert_component()
@@ -237,6 +399,8 @@ def unregister():
     unregister_op_trigger_collection_exporters()
     ## Preset Operations
     unregister_op_apply_preset()
+    ## List, Set, and Map Operations
+    unregister_op_collection_entries()
     # panel
     unregister_skein_panel()
     unregister_skein_sidepanel()
@@ -0,0 +1,128 @@
+import itertools
+import threading
+import requests # type: ignore
+
+# --------------------------------- #
+#  A small Bevy Remote Protocol     #
+#  client that re-uses connections  #
+#  and batches requests             #
+# --------------------------------- #
+#
+# Nothing in this module touches bpy, because requests are
+# made from worker threads.
+
+# one keep-alive session per BRP url
+_sessions = {}
+# the result of rpc.discover per BRP url, see remember_discovery
+_discovered = {}
+# BRP urls that didn't answer a batch with a list of responses
+_unbatched = set()
+_lock = threading.Lock()
+_ids = itertools.count(1)
+
+def brp_url(host, port):
+    return host + ":" + str(port)
+
+def brp_session(host, port):
+    """the shared requests.Session for a BRP url"""
+    url = brp_url(host, port)
+    with _lock:
+        if url not in _sessions:
+            _sessions[url] = requests.Session()
+        return _sessions[url]
+
+def brp_request(host, port, method, params=None, timeout=None):
+    """send a single JSON-RPC request and return the response"""
+    data = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+    r = brp_session(host, port).post(brp_url(host, port), json=data, timeout=timeout)
+    return r.json()
+
+def brp_batch(host, port, calls, timeout=None):
+    """send a list of (method, params) calls as a single JSON-RPC batch
+
+    Returns the responses in the same order as the calls. If the
+    server doesn't answer the batch with a list of responses, the
+    calls are sent one at a time over the same connection instead,
+    and so is every later batch to that server (Bevy doesn't
+    support batches) until forget_discovery is called.
+    """
+    url = brp_url(host, port)
+    with _lock:
+        batching = url not in _unbatched
+    if not batching:
+        return [
+            brp_request(host, port, method, params, timeout)
+            for method, params in calls
+        ]
+
+    ids = [next(_ids) for _ in calls]
+    data = [
+        {"jsonrpc": "2.0", "id": id, "method": method, "params": params or {}}
+        for id, (method, params) in zip(ids, calls)
+    ]
+    r = brp_session(host, port).post(url, json=data, timeout=timeout)
+    try:
+        responses = r.json()
+    except ValueError:
+        responses = None
+
+    if not isinstance(responses, list):
+        with _lock:
+            _unbatched.add(url)
+        return [
+            brp_request(host, port, method, params, timeout)
+            for method, params in calls
+        ]
+
+    # batch responses are allowed to come back in any order
+    by_id = {
+        response.get("id"): response
+        for response in responses
+        if isinstance(response, dict)
+    }
+    return [
+        by_id.get(id, {"error": {"message": "no response for " + method}})
+        for id, (method, _) in zip(ids, calls)
+    ]
+
+def remember_discovery(host, port, rpc_response):
+    """store the methods and version from an rpc.discover response
+
+    Returns the stored discovery ({"version": str, "methods": set}),
+    or None if the response was an error (Bevy 0.15 has no rpc.discover).
+    """
+    try:
+        discovery = {
+            "version": rpc_response["result"]["info"]["version"],
+            "methods": {method["name"] for method in rpc_response["result"]["methods"]},
+        }
+    except (KeyError, TypeError):
+        return None
+    with _lock:
+        _discovered[brp_url(host, port)] = discovery
+    return discovery
+
+def discovered_methods(host, port):
+    """the discovery stored by remember_discovery, or None"""
+    with _lock:
+        return _discovered.get(brp_url(host, port))
+
+def forget_discovery(host, port):
+    """drop the stored discovery, for example because the Bevy app was restarted"""
+    with _lock:
+        _discovered.pop(brp_url(host, port), None)
+        _unbatched.discard(brp_url(host, port))
+
+def schema_method(discovery):
+    """the registry schema method a Bevy app supports"""
+    if discovery is None:
+        # 0.15 didn't have rpc.discover
+        return "bevy/registry/schema"
+    if "registry.schema" in discovery["methods"]:
+        return "registry.schema"
+    if "bevy/registry/schema" in discovery["methods"]:
+        # 0.16
+        return "bevy/registry/schema"
+    # assume anything else is a bevy version "from the future"
+    # and use the most recent version's endpoint
+    return "registry.schema"
@@ -0,0 +1,78 @@
+import pytest
+
+# Blender ships requests, plain Python environments may not
+pytest.importorskip("requests")
+
+from . import brp_client
+from .brp_client import brp_batch, brp_url, forget_discovery
+
+HOST = "http://localhost"
+PORT = 15702
+
+class Response:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+class NoBatchSession:
+    """a BRP server that, like Bevy, doesn't support batches"""
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, json=None, timeout=None):
+        self.posts.append(json)
+        if isinstance(json, list):
+            return Response({"jsonrpc": "2.0", "error": {"code": -32600, "message": "Invalid request"}})
+        return Response({"jsonrpc": "2.0", "result": json["method"]})
+
+class BatchSession(NoBatchSession):
+    def post(self, url, json=None, timeout=None):
+        self.posts.append(json)
+        # in reverse, batch responses can come back in any order
+        return Response([
+            {"jsonrpc": "2.0", "id": call["id"], "result": call["method"]}
+            for call in reversed(json)
+        ])
+
+class TestClass:
+    def setup_method(self):
+        forget_discovery(HOST, PORT)
+
+    def teardown_method(self):
+        brp_client._sessions.pop(brp_url(HOST, PORT), None)
+        forget_discovery(HOST, PORT)
+
+    def use_session(self, session):
+        brp_client._sessions[brp_url(HOST, PORT)] = session
+        return session
+
+    def test_batch(self):
+        session = self.use_session(BatchSession())
+        responses = brp_batch(HOST, PORT, [("world.query", None), ("registry.schema", None)])
+        assert [response["result"] for response in responses] == ["world.query", "registry.schema"]
+        assert len(session.posts) == 1
+
+    def test_falls_back_to_single_requests(self):
+        session = self.use_session(NoBatchSession())
+        calls = [("world.query", None), ("registry.schema", None)]
+        responses = brp_batch(HOST, PORT, calls)
+        assert [response["result"] for response in responses] == ["world.query", "registry.schema"]
+        # the batch, then each call
+        assert len(session.posts) == 3
+
+        # the server doesn't support batches, so they aren't tried again
+        session.posts.clear()
+        responses = brp_batch(HOST, PORT, calls)
+        assert [response["result"] for response in responses] == ["world.query", "registry.schema"]
+        assert not any(isinstance(post, list) for post in session.posts)
+        assert len(session.posts) == 2
+
+    def test_forget_discovery_tries_batches_again(self):
+        session = self.use_session(NoBatchSession())
+        brp_batch(HOST, PORT, [("world.query", None)])
+        forget_discovery(HOST, PORT)
+        session.posts.clear()
+        brp_batch(HOST, PORT, [("world.query", None)])
+        assert isinstance(session.posts[0], list)
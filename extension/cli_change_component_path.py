@@ -5,9 +5,9 @@ import sys
 
 import bpy
 
-from .object_to_form import object_to_form
-from .form_to_object import get_data_from_active_editor
-from .property_groups import hash_over_64
+from .component_writer import write_component
+from .serializers import serialize_component
+from .type_names import field_name
 
 
 def argparse_create():
@@ -85,6 +85,12 @@ def change_component_path(argv):
         for object in armature.bones:
             change_selected_type_path(object, args.old_path, args.new_path, data)
             modifications["bone"] = data
+    # after making modifications, we must save to persist the changes.
+    # Saving once at the end, instead of after every component, keeps
+    # changing paths across thousands of objects fast.
+    if any(modifications.values()):
+        bpy.ops.wm.save_mainfile()
+
     # with open(args.output, 'w') as json_file:
     #     json.dump(component_data, json_file, indent=4)
 
@@ -94,28 +100,16 @@ def change_component_path(argv):
 def change_selected_type_path(object, old_path, new_path, changed):
     for component in object.skein_two:
         if component.selected_type_path == old_path:
-            data = get_data_from_active_editor(
+            data = serialize_component(
                 component,
-                hash_over_64(component.selected_type_path),
+                field_name(component.selected_type_path),
+                component.selected_type_path,
             )
             component.selected_type_path = new_path
             # We should set the name here even though it is arbitrary, because
             # this name is what a user sees to identify components in the UI
             # by short name
             component.name = new_path.split("::")[-1]
-            object_to_form(component, hash_over_64(component.selected_type_path), data)
-
-            # after making modifications, we must save to persist the changes
-            bpy.ops.wm.save_mainfile()
+            write_component(component, field_name(new_path), new_path, data)
 
             changed.append(object.name)
-
-def touch_all_fields(context, key):
-    try:
-        obj = getattr(context, key)
-        annotations = getattr(obj, "__annotations__")
-        for key, value in annotations.items():
-            if "PointerProperty" == value.function.__name__:
-                touch_all_fields(obj, key)
-    except:
-        pass
\ No newline at end of file
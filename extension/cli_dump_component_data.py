@@ -5,8 +5,7 @@ import sys
 
 import bpy
 
-from .form_to_object import get_data_from_active_editor
-from .property_groups import hash_over_64
+from .snapshot_export import component_snapshots, serialize_snapshot
 
 
 def argparse_create():
@@ -103,7 +102,12 @@ def gather(source, sink, type_path_filters):
         skein_property_groups = bpy.context.window_manager.skein_property_groups
         if type_path_filters and component.selected_type_path not in type_path_filters:
             return
-        for component in source.skein_two:
+        snapshots = None
+        if snapshot_export_enabled():
+            # copy every component's IDProperties in one go,
+            # instead of reading each field through RNA
+            snapshots = component_snapshots(source)
+        for index, component in enumerate(source.skein_two):
             obj = {}
             type_path = component["selected_type_path"]
 
@@ -120,17 +124,17 @@ def gather(source, sink, type_path_filters):
                             obj[type_path] = []
                     objs.append(obj)
                 except AttributeError:
-                    value = get_data_from_active_editor(
+                    value = serialize_snapshot(
+                        snapshots[index] if snapshots else None,
                         component,
-                        hash_over_64(type_path),
+                        type_path,
                     )
                     obj[type_path] = value
                     objs.append(obj)
             else:
                 # if the component is a tuple struct, etc
-                # retrieve the value directly instead of
-                # recursing
-                obj[type_path] = getattr(component, hash_over_64(type_path))
+                # there's a single value instead of a PropertyGroup
+                obj[type_path] = serialize_snapshot(snapshots[index] if snapshots else None, component, type_path)
                 objs.append(obj)
 
         if objs or unrecognized_components:
@@ -142,3 +146,7 @@ def gather(source, sink, type_path_filters):
                 output["unrecognized_components"] = unrecognized_components
             sink.append(output)
 
+def snapshot_export_enabled():
+    if __package__ in bpy.context.preferences.addons:
+        return bpy.context.preferences.addons[__package__].preferences.snapshot_export
+    return True
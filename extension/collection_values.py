@@ -0,0 +1,96 @@
+from array import array
+
+from .glam_types import VECTOR_PROPERTIES, from_glam, to_glam
+
+# --------------------------------- #
+#  Lists, Sets, and Maps stored as  #
+#  CollectionProperty entries       #
+# --------------------------------- #
+#
+# A List, Set, or Map is a PropertyGroup with an `entries`
+# CollectionProperty. Each entry is a PropertyGroup with a `value`
+# field, and Map entries also have a `key` field.
+#
+# Lists and Sets of numbers, bools, and vectors are read and written
+# with a single foreach_get/foreach_set over a flat array of every
+# entry's value, instead of an attribute access per entry, which is
+# what keeps lists with thousands of entries fast to export.
+#
+# Nothing in this module touches bpy.
+
+ENTRIES_FIELD = "entries"
+KEY_FIELD = "key"
+VALUE_FIELD = "value"
+
+# properties that can be Map keys. Bevy serializes Maps as json
+# objects, so keys have to be strings, or something that
+# round-trips through a string.
+KEY_PROPERTIES = ("StringProperty", "IntProperty", "EnumProperty")
+
+# array typecodes matching how Blender stores float and int
+# properties, so foreach_get/foreach_set can copy memory directly
+_TYPECODES = {
+    "FloatProperty": "f",
+    "FloatVectorProperty": "f",
+    "IntProperty": "i",
+    "IntVectorProperty": "i",
+}
+_BOOL_PROPERTIES = ("BoolProperty", "BoolVectorProperty")
+
+def is_flat(property):
+    """whether values of a property can be read with foreach_get"""
+    return property in _TYPECODES or property in _BOOL_PROPERTIES
+
+def flat_size(property, options):
+    """how many numbers each value of a property takes up in a flat array,
+    or None for scalar properties"""
+    if property in VECTOR_PROPERTIES:
+        return options.get("size", 3)
+    return None
+
+def flat_buffer(property, length):
+    """a zeroed buffer for foreach_get to fill with length numbers"""
+    if property in _TYPECODES:
+        return array(_TYPECODES[property], [0]) * length
+    # bool buffers have no array typecode Blender accepts everywhere
+    return [False] * length
+
+def unflatten(property, flat, size=None, subtype=None):
+    """the json value of each entry, from a buffer filled by foreach_get
+
+    @param: size the size of vector properties, None for scalars
+    @param: subtype the subtype of vector properties
+    """
+    values = flat.tolist() if isinstance(flat, array) else list(flat)
+    if property in _BOOL_PROPERTIES:
+        values = [bool(value) for value in values]
+    if size is None:
+        return values
+    return [
+        to_glam(subtype, values[start:start + size])
+        for start in range(0, len(values), size)
+    ]
+
+def flatten(property, data, size=None, subtype=None):
+    """a buffer for foreach_set, from the json value of each entry"""
+    if size is None:
+        values = list(data)
+    else:
+        values = [
+            component
+            for value in data
+            for component in from_glam(subtype, value)
+        ]
+    if property in _TYPECODES:
+        return array(_TYPECODES[property], values)
+    return [bool(value) for value in values]
+
+def to_map_key(value):
+    """the json object key for a Map entry's key"""
+    return str(value)
+
+def from_map_key(property, key):
+    """the value to set on a Map entry's key field for a json object key"""
+    if property == "IntProperty":
+        return int(key)
+    return key
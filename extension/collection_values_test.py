@@ -0,0 +1,40 @@
+from array import array
+
+from .collection_values import flat_buffer, flat_size, flatten, from_map_key, is_flat, to_map_key, unflatten
+
+class TestClass:
+    def test_flat_properties(self):
+        assert is_flat("FloatProperty")
+        assert is_flat("BoolVectorProperty")
+        assert not is_flat("StringProperty")
+        assert not is_flat("EnumProperty")
+        assert flat_size("FloatProperty", {}) is None
+        assert flat_size("FloatVectorProperty", {"size": 4}) == 4
+
+    def test_buffers(self):
+        floats = flat_buffer("FloatProperty", 3)
+        assert isinstance(floats, array) and floats.typecode == "f" and len(floats) == 3
+        assert flat_buffer("IntVectorProperty", 6).typecode == "i"
+        assert flat_buffer("BoolProperty", 2) == [False, False]
+
+    def test_scalars_round_trip(self):
+        flat = flatten("IntProperty", [1, 2, 3])
+        assert flat == array("i", [1, 2, 3])
+        assert unflatten("IntProperty", flat) == [1, 2, 3]
+        assert unflatten("BoolProperty", [1, 0]) == [True, False]
+
+    def test_vectors_round_trip(self):
+        data = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+        flat = flatten("FloatVectorProperty", data, 3, "XYZ")
+        assert flat.tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        assert unflatten("FloatVectorProperty", flat, 3, "XYZ") == data
+
+    def test_quaternions_use_blender_order(self):
+        flat = flatten("FloatVectorProperty", [[0.0, 0.0, 0.0, 1.0]], 4, "QUATERNION")
+        assert flat.tolist() == [1.0, 0.0, 0.0, 0.0]
+        assert unflatten("FloatVectorProperty", flat, 4, "QUATERNION") == [[0.0, 0.0, 0.0, 1.0]]
+
+    def test_map_keys(self):
+        assert to_map_key(12) == "12"
+        assert from_map_key("IntProperty", "12") == 12
+        assert from_map_key("StringProperty", "12") == "12"
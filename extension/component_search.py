@@ -0,0 +1,200 @@
+import re
+
+# --------------------------------- #
+#  A search index over Components,  #
+#  used by the component picker     #
+# --------------------------------- #
+#
+# The picker searches on every keystroke, and registries can have
+# tens of thousands of Components, so the index is built once per
+# processed registry. The index keeps the set of entries that
+# contain each character, so a set intersection rules out most
+# entries before any string comparison happens, and a query that
+# extends the previous one (the next keystroke) only searches the
+# previous query's matches.
+#
+# Nothing in this module touches bpy.
+
+# how many results a search returns
+MAX_RESULTS = 100
+# how many recently used Components are remembered
+MAX_RECENT = 20
+
+# scores for each way a query term can match an entry
+SCORE_EXACT = 1000
+SCORE_SHORT_PREFIX = 800
+SCORE_TOKEN_PREFIX = 600
+SCORE_SHORT_SUBSTRING = 400
+SCORE_PATH_SUBSTRING = 300
+SCORE_FUZZY = 100
+# added for the most recently used Component, and a little
+# less for each older one
+SCORE_RECENT = 500
+
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+_CAMEL_CASE = re.compile(r"[A-Z]+[a-z0-9]*|[a-z0-9]+")
+
+def crate_of(type_path):
+    return type_path.split("::")[0]
+
+def path_tokens(type_path, short_path):
+    """lowercase words in a type_path: path segments, and CamelCase words in the short path"""
+    tokens = {token for token in _TOKEN_SPLIT.split(type_path.lower()) if token}
+    tokens.update(word.lower() for word in _CAMEL_CASE.findall(short_path))
+    return tokens
+
+def fuzzy_score(term, text):
+    """score a subsequence match of term in text, or None if it doesn't match
+
+    Consecutive characters score higher than scattered ones.
+    """
+    position = -1
+    gaps = 0
+    for char in term:
+        next_position = text.find(char, position + 1)
+        if next_position == -1:
+            return None
+        if position != -1:
+            gaps += next_position - position - 1
+        position = next_position
+    return SCORE_FUZZY - min(gaps, SCORE_FUZZY - 1)
+
+class ComponentEntry:
+    __slots__ = ("type_path", "short_path", "crate", "short_lower", "path_lower", "tokens")
+
+    def __init__(self, type_path, short_path):
+        self.type_path = type_path
+        self.short_path = short_path
+        self.crate = crate_of(type_path)
+        self.short_lower = short_path.lower()
+        self.path_lower = type_path.lower()
+        # space separated, so that " " + term finds token prefixes
+        # with a single substring search
+        self.tokens = " " + " ".join(sorted(path_tokens(type_path, short_path)))
+
+    def score(self, term):
+        """how well a single lowercase query term matches, or None"""
+        if term == self.short_lower or term == self.path_lower:
+            return SCORE_EXACT
+        if self.short_lower.startswith(term):
+            return SCORE_SHORT_PREFIX
+        if " " + term in self.tokens:
+            return SCORE_TOKEN_PREFIX
+        if term in self.short_lower:
+            return SCORE_SHORT_SUBSTRING
+        if term in self.path_lower:
+            return SCORE_PATH_SUBSTRING
+        return fuzzy_score(term, self.short_lower) or fuzzy_score(term, self.path_lower)
+
+class ComponentSearchIndex:
+    """searches Components by short path, type_path tokens, and crate"""
+
+    def __init__(self, components=()):
+        """@param: components (type_path, short_path) pairs"""
+        self.entries = sorted(
+            (ComponentEntry(type_path, short_path) for type_path, short_path in components),
+            key=lambda entry: (entry.short_lower, entry.path_lower),
+        )
+        self.by_type_path = {entry.type_path: entry for entry in self.entries}
+        self.by_crate = {}
+        # entry positions per character that appears in an entry
+        self.by_char = {}
+        for position, entry in enumerate(self.entries):
+            self.by_crate.setdefault(entry.crate, set()).add(position)
+            for char in set(entry.path_lower):
+                self.by_char.setdefault(char, set()).add(position)
+        # the last query's terms, crate, and matching positions
+        self.last_search = None
+
+    def crates(self):
+        return sorted(self.by_crate)
+
+    def search(self, query, crate=None, recent=(), limit=MAX_RESULTS):
+        """the best matching entries for a query, best first
+
+        Every whitespace separated term in the query has to match.
+        An empty query lists recently used Components first.
+
+        @param: crate only search Components from this crate
+        @param: recent type_paths, most recently used first
+        """
+        terms = query.lower().split()
+
+        if crate is None:
+            candidates = None
+        else:
+            candidates = self.by_crate.get(crate, set())
+
+        # every match for a query is also a match for the query
+        # with a term cut short, like the previous keystroke
+        if self.last_search is not None:
+            last_terms, last_crate, last_matches = self.last_search
+            if last_crate == crate and extends(terms, last_terms):
+                candidates = last_matches
+
+        # an entry can only match if it has every character in the query
+        for char in set("".join(terms)):
+            with_char = self.by_char.get(char, set())
+            candidates = with_char if candidates is None else candidates & with_char
+        if candidates is None:
+            candidates = range(len(self.entries))
+
+        recent_bonus = {
+            type_path: SCORE_RECENT - index
+            for index, type_path in enumerate(recent)
+        }
+
+        entries = self.entries
+        scored = []
+        for position in candidates:
+            entry = entries[position]
+            total = 0
+            for term in terms:
+                score = entry.score(term)
+                if score is None:
+                    break
+                total += score
+            else:
+                total += recent_bonus.get(entry.type_path, 0)
+                # entries are sorted by name, so position
+                # breaks ties alphabetically
+                scored.append((-total, position))
+
+        self.last_search = (terms, crate, {position for _, position in scored})
+
+        scored.sort()
+        return [entries[position] for _, position in scored[:limit]]
+
+def extends(terms, last_terms):
+    """whether every term of a query contains the matching term of an earlier query"""
+    return len(terms) >= len(last_terms) and all(
+        last_term in term for term, last_term in zip(terms, last_terms)
+    )
+
+_index = ComponentSearchIndex()
+_recent = []
+
+def build_component_index(components):
+    """replace the index. Called when a registry is processed
+
+    @param: components (type_path, short_path) pairs
+    """
+    global _index
+    _index = ComponentSearchIndex(components)
+
+def get_component_index():
+    return _index
+
+def record_recent_component(type_path):
+    """move a type_path to the front of the recently used list"""
+    if type_path in _recent:
+        _recent.remove(type_path)
+    _recent.insert(0, type_path)
+    del _recent[MAX_RECENT:]
+
+def recent_components():
+    return list(_recent)
+
+def search_components(query, crate=None, limit=MAX_RESULTS):
+    """search the current index, ranking recently used Components higher"""
+    return _index.search(query, crate=crate, recent=_recent, limit=limit)
@@ -0,0 +1,58 @@
+import json
+
+from .component_search import ComponentSearchIndex
+
+class TestClass:
+    def index(self):
+        return ComponentSearchIndex([
+            ("test_components::Player", "Player"),
+            ("test_components::TeamMember", "TeamMember"),
+            ("avian3d::dynamics::rigid_body::RigidBody", "RigidBody"),
+            ("avian3d::collision::collider::Collider", "Collider"),
+            ("bevy_pbr::light::point_light::PointLight", "PointLight"),
+        ])
+
+    def short_paths(self, entries):
+        return [entry.short_path for entry in entries]
+
+    def test_ranking(self):
+        index = self.index()
+        # short path prefixes rank above other matches
+        assert self.short_paths(index.search("p")) == ["Player", "PointLight", "TeamMember"]
+        # CamelCase words and path segments match as prefixes
+        assert self.short_paths(index.search("light")) == ["PointLight"]
+        assert self.short_paths(index.search("member")) == ["TeamMember"]
+
+    def test_fuzzy(self):
+        index = self.index()
+        assert self.short_paths(index.search("plyr")) == ["Player"]
+        assert self.short_paths(index.search("rgdbdy")) == ["RigidBody"]
+        assert index.search("zzz") == []
+
+    def test_terms_and_crates(self):
+        index = self.index()
+        assert self.short_paths(index.search("avian body")) == ["RigidBody"]
+        assert self.short_paths(index.search("", crate="avian3d")) == ["Collider", "RigidBody"]
+        assert index.crates() == ["avian3d", "bevy_pbr", "test_components"]
+
+    def test_recent(self):
+        index = self.index()
+        assert self.short_paths(index.search("", recent=["bevy_pbr::light::point_light::PointLight"]))[0] == "PointLight"
+
+    def test_keystrokes(self):
+        # searching one keystroke at a time finds the
+        # same results as searching all at once
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+            components = [
+                (type_path, schema["shortPath"])
+                for type_path, schema in registry.items()
+                if "Component" in schema.get("reflectTypes", [])
+            ]
+            query = "test comp"
+            typed = ComponentSearchIndex(components)
+            for end in range(len(query) + 1):
+                results = typed.search(query[:end])
+            expected = ComponentSearchIndex(components).search(query)
+            assert [entry.type_path for entry in results] == [entry.type_path for entry in expected]
+            assert results
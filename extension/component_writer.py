@@ -0,0 +1,174 @@
+from .collection_values import ENTRIES_FIELD, KEY_FIELD, VALUE_FIELD, from_map_key
+from .glam_types import VECTOR_PROPERTIES, from_glam
+from .object_to_form import object_to_form
+from .serializers import serializer_specs
+
+# --------------------------------- #
+#  Writing component data as whole  #
+#  IDProperty subtrees              #
+# --------------------------------- #
+#
+# object_to_form sets one field at a time through RNA. When the data
+# for a whole component is known up front (presets, defaults, and
+# changing a component's type_path) it's converted to the layout
+# the component's PropertyGroups store in IDProperties instead,
+# using the compiled specs, and written in one pass.
+#
+# This is the inverse of snapshot_export.reshape:
+#
+# - Enum variants are stored as the index of the item
+# - Bools are stored as ints
+# - glam types are stored in Blender's layout
+#
+# Like object_to_form, only the fields the data mentions are written,
+# so applying a preset that leaves fields out keeps their values.
+# Every PointerProperty field gets a group, even if the data doesn't
+# mention it, the same way insert_component_data touches every field.
+#
+# Nothing in this module touches bpy.
+
+def write_component(container, field, type_path, data):
+    """write the data of a component into a ComponentContainer
+
+    Fields that data doesn't mention keep their current values,
+    like they do with object_to_form. Falls back to object_to_form
+    for types that have no spec.
+
+    @param: field the ComponentContainer field, see type_names.field_name
+    @param: data the component's data in Bevy's reflect format
+    """
+    specs = serializer_specs()
+    spec = specs.get(type_path)
+    if spec is None:
+        object_to_form(container, field, data)
+    elif spec["kind"] == "class":
+        if field in container and _is_group(container[field]):
+            merge_group(container[field], spec, data, specs)
+        else:
+            container[field] = raw_group(spec, data, specs)
+    else:
+        container[field] = raw_property(spec, data)
+
+# data for groups that the json doesn't have a value for
+_MISSING = object()
+
+def _is_group(raw):
+    """whether stored IDProperty data is a group (a dict or an IDPropertyGroup)"""
+    return hasattr(raw, "keys")
+
+def raw_value(spec, value, specs):
+    """the IDProperty data for a field, from its json value"""
+    if spec["kind"] == "group":
+        return raw_group(specs[spec["type_path"]], value, specs)
+    return raw_property(spec, value)
+
+def raw_group(spec, data, specs):
+    """the IDProperty data for a "class" spec, from its json value"""
+    raw = {
+        key: raw_group(specs[field["type_path"]], _MISSING, specs)
+        for key, field in spec["annotations"].items()
+        if field is not None and field["kind"] == "group"
+    }
+    if data is not _MISSING:
+        merge_group(raw, spec, data, specs)
+    return raw
+
+def merge_value(raw, key, spec, value, specs):
+    """write the json value of a field into the IDProperty data of its group"""
+    if spec["kind"] == "group" and key in raw and _is_group(raw[key]):
+        merge_group(raw[key], specs[spec["type_path"]], value, specs)
+    else:
+        raw[key] = raw_value(spec, value, specs)
+
+def merge_group(raw, spec, data, specs):
+    """write the json value of a "class" spec into its IDProperty data
+
+    Struct fields data doesn't mention, and the data of enum
+    variants that aren't selected, are left as they are.
+    Lists, Sets, and Maps are replaced.
+    """
+    annotations = spec["annotations"]
+    markers = spec["markers"]
+
+    if "skein_enum_index" in annotations:
+        index_spec = annotations["skein_enum_index"]
+        if markers.get("is_core_option"):
+            if data is None:
+                raw["skein_enum_index"] = raw_property(index_spec, "None")
+            else:
+                raw["skein_enum_index"] = raw_property(index_spec, "Some")
+                merge_value(raw, "Some", annotations["Some"], data, specs)
+            return
+        if isinstance(data, str):
+            # unit variant
+            raw["skein_enum_index"] = raw_property(index_spec, data)
+            return
+        (variant, value), *rest = data.items()
+        raw["skein_enum_index"] = raw_property(index_spec, variant)
+        merge_value(raw, variant, annotations[variant], value, specs)
+        return
+
+    if markers.get("force_default"):
+        return
+
+    collection = markers.get("collection")
+    if collection is not None:
+        entry_annotations = specs[annotations[ENTRIES_FIELD]["type_path"]]["annotations"]
+        value_spec = entry_annotations[VALUE_FIELD]
+        if collection == "map":
+            key_spec = entry_annotations[KEY_FIELD]
+            entries = [
+                {
+                    KEY_FIELD: raw_property(key_spec, from_map_key(key_spec["property"], key)),
+                    VALUE_FIELD: raw_value(value_spec, value, specs),
+                }
+                for key, value in data.items()
+            ]
+        else:
+            entries = [{VALUE_FIELD: raw_value(value_spec, value, specs)} for value in data]
+        # an empty list can't be stored as a collection, and
+        # a missing collection is empty anyway
+        if entries:
+            raw[ENTRIES_FIELD] = entries
+        elif ENTRIES_FIELD in raw:
+            del raw[ENTRIES_FIELD]
+        return
+
+    fields = [(key, field) for key, field in annotations.items() if field is not None]
+    if markers.get("positional"):
+        for (key, field), value in zip(fields, data):
+            merge_value(raw, key, field, value, specs)
+        return
+
+    for key, field in fields:
+        if key in data:
+            merge_value(raw, key, field, data[key], specs)
+
+def raw_property(spec, value):
+    """the IDProperty value for a property spec, from its json value"""
+    property = spec["property"]
+    options = spec["options"]
+    match property:
+        case "EnumProperty":
+            for index, item in enumerate(options.get("items", [])):
+                if item[0] == value:
+                    return index
+            raise ValueError(str(value) + " is not one of the enum's items")
+        case "FloatProperty":
+            return float(value)
+        case "IntProperty":
+            return int(value)
+        case "BoolProperty":
+            return int(bool(value))
+        case "StringProperty":
+            return str(value)
+    if property in VECTOR_PROPERTIES:
+        values = from_glam(options.get("subtype"), value)
+        match property:
+            case "FloatVectorProperty":
+                return [float(component) for component in values]
+            case "IntVectorProperty":
+                return [int(component) for component in values]
+            case "BoolVectorProperty":
+                return [int(bool(component)) for component in values]
+    return value
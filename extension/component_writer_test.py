@@ -0,0 +1,91 @@
+import pytest
+
+from .component_writer import raw_property, write_component
+from .serializers import set_serializer_specs
+from .snapshot_export import serialize_snapshot
+from .spec_fixtures import MAP_TYPE_PATH, component_tests_specs
+from .type_names import field_name
+
+TEAM = "test_components::Team"
+TEAM_MEMBER = "test_components::TeamMember"
+OPTIONAL_NAME = "test_components::AnOptionalName"
+RICH_ENUM = "test_components::RichAndUnitEnum"
+SOME_THINGS = "test_components::SomeThings"
+TRANSFORM = "bevy_transform::components::transform::Transform"
+FLOATS = "alloc::vec::Vec<f32>"
+MULTI_TUPLE = "test_components::MultiElementTupleStruct"
+
+def write(type_path, data, container=None):
+    """the container, after writing data for type_path into it"""
+    if container is None:
+        container = {}
+    write_component(container, field_name(type_path), type_path, data)
+    return container
+
+def written(type_path, data, container=None):
+    """the IDProperty data written for type_path"""
+    return write(type_path, data, container)[field_name(type_path)]
+
+class TestClass:
+    def setup_method(self):
+        set_serializer_specs(component_tests_specs())
+
+    def test_idproperty_layout(self):
+        assert written(TEAM_MEMBER, {"player": {"name": "Chris", "power": 1, "test": 3}, "team": "Blue"}) == {
+            "player": {"name": "Chris", "power": 1.0, "test": 3},
+            "team": 2,
+        }
+        # quaternions are stored in Blender's w, x, y, z order
+        assert written(TRANSFORM, {"rotation": [0, 0, 0, 1], "translation": [1, 2, 3], "scale": [1, 1, 1]}) == {
+            "rotation": [1.0, 0.0, 0.0, 0.0],
+            "translation": [1.0, 2.0, 3.0],
+            "scale": [1.0, 1.0, 1.0],
+        }
+
+    def test_every_group_field_exists(self):
+        # PointerProperty fields are created even without data,
+        # like touch_all_fields does
+        assert written(TEAM_MEMBER, {"team": "Red"}) == {"player": {}, "team": 1}
+        assert written(OPTIONAL_NAME, {"name": None}) == {"name": {"skein_enum_index": 0}}
+
+    def test_round_trips(self):
+        for type_path, data in [
+            (TEAM, "Blue"),
+            (TEAM_MEMBER, {"player": {"name": "Chris", "power": 1.5, "test": 3}, "team": "Blue"}),
+            (OPTIONAL_NAME, {"name": None}),
+            (OPTIONAL_NAME, {"name": "Chris"}),
+            (RICH_ENUM, "NotAPlayer"),
+            (RICH_ENUM, {"Player": {"name": "a", "power": 0.5, "test": 1}}),
+            (TRANSFORM, {"rotation": [0.0, 0.0, 0.0, 1.0], "translation": [1.0, 2.0, 3.0], "scale": [1.0, 1.0, 1.0]}),
+            (MULTI_TUPLE, [12, [1.0, 2.0, 3.0], 2, "testing"]),
+            (FLOATS, [0.5, 2.0]),
+            (FLOATS, []),
+            (MAP_TYPE_PATH, {"3": "Blue", "4": "Red"}),
+        ]:
+            assert serialize_snapshot(write(type_path, data), None, type_path) == data
+
+    def test_partial_presets_keep_other_fields(self):
+        container = write(TEAM_MEMBER, {"player": {"name": "Chris", "power": 1.5, "test": 3}, "team": "Blue"})
+        write(TEAM_MEMBER, {"player": {"power": 9.0}}, container)
+        assert serialize_snapshot(container, None, TEAM_MEMBER) == {
+            "player": {"name": "Chris", "power": 9.0, "test": 3},
+            "team": "Blue",
+        }
+
+    def test_other_enum_variants_keep_their_data(self):
+        container = write(SOME_THINGS, {"OneThing": {"name": "kept"}})
+        write(SOME_THINGS, {"Low": 4}, container)
+        assert serialize_snapshot(container, None, SOME_THINGS) == {"Low": 4}
+        write(SOME_THINGS, {"OneThing": {}}, container)
+        assert serialize_snapshot(container, None, SOME_THINGS) == {"OneThing": {"name": "kept"}}
+
+    def test_collections_are_replaced(self):
+        container = write(FLOATS, [0.5, 2.0])
+        write(FLOATS, [1.0], container)
+        assert serialize_snapshot(container, None, FLOATS) == [1.0]
+        write(FLOATS, [], container)
+        assert serialize_snapshot(container, None, FLOATS) == []
+
+    def test_unknown_enum_items(self):
+        with pytest.raises(ValueError):
+            raw_property(component_tests_specs()[TEAM], "Purple")
@@ -0,0 +1,124 @@
+# --------------------------------- #
+#  Exported component data cached   #
+#  across exports                   #
+# --------------------------------- #
+#
+# Serializing every component on every datablock is most of what an
+# export spends on Skein data, and between two exports usually only
+# a handful of datablocks changed. The exported data of each
+# datablock is kept here, keyed by as_pointer(), until the datablock
+# is marked dirty:
+#
+# - by the depsgraph_update_post handler, for every ID the depsgraph
+#   reports as updated. Editing a field in the UI, or setting it
+#   from Python, tags the ID that owns it.
+# - by Skein's own operators, which write IDProperties directly and
+#   don't always go through the depsgraph.
+#
+# Bones aren't IDs, so they're cached under their Armature
+# (`id_data`) and are dirtied along with it.
+#
+# Blender reuses the memory of removed IDs, so a pointer alone can
+# point at a different datablock by the next export. Every entry
+# keeps the identity of the datablock it was stored for (its
+# session_uid, or type and name_full where there's no session_uid)
+# and is only reused for the same identity. Entries of removed IDs
+# are pruned before each export.
+#
+# Only original IDs from bpy.data belong in the cache. Evaluated
+# copies, and the temporary meshes to_mesh() creates, are freed
+# during the export.
+#
+# Undo, redo, loading a .blend file, and processing a registry
+# throw the whole cache away.
+#
+# Nothing in this module touches bpy.
+
+# as_pointer() -> (owner as_pointer(), identity, exported data)
+_components = {}
+# owner as_pointer() -> (owner identity, as_pointer() of every cached
+# datablock it owns)
+_owned = {}
+
+def _owner(source):
+    """the ID that owns source. IDs own themselves"""
+    id_data = getattr(source, "id_data", None)
+    if id_data is None:
+        return source
+    return id_data
+
+def _id_identity(id):
+    """what tells an ID apart from a later one at the same address"""
+    session_uid = getattr(id, "session_uid", None)
+    if session_uid is None:
+        return (type(id).__name__, id.name_full)
+    return (type(id).__name__, session_uid)
+
+def _identity(source, owner):
+    if source.as_pointer() == owner.as_pointer():
+        return _id_identity(source)
+    # data owned by an ID, like a Bone, is told apart by its
+    # name in the ID
+    return (type(source).__name__, source.name, _id_identity(owner))
+
+def cached_components(source):
+    """the exported data cached for a datablock, or None if it is dirty"""
+    entry = _components.get(source.as_pointer())
+    if entry is None:
+        return None
+    owner_pointer, identity, objs = entry
+    owner = _owner(source)
+    if owner_pointer != owner.as_pointer() or identity != _identity(source, owner):
+        # the pointer was reused by a different datablock
+        return None
+    return objs
+
+def store_components(source, objs):
+    """cache the exported data of a datablock until it is marked dirty
+
+    @param: source an original ID from bpy.data, or data owned by one
+    """
+    key = source.as_pointer()
+    owner = _owner(source)
+    owner_pointer = owner.as_pointer()
+    owner_identity = _id_identity(owner)
+    _components[key] = (owner_pointer, _identity(source, owner), objs)
+    owned = _owned.get(owner_pointer)
+    if owned is None or owned[0] != owner_identity:
+        # anything cached under a removed ID at the same address is
+        # dropped along with it
+        if owned is not None:
+            for stale in owned[1]:
+                if stale != key:
+                    _components.pop(stale, None)
+        owned = (owner_identity, set())
+        _owned[owner_pointer] = owned
+    owned[1].add(key)
+
+def mark_dirty(source):
+    """throw away the cached data of source's ID and everything it owns
+
+    @param: source an ID, or data owned by one like a Bone
+    """
+    _forget(_owner(source).as_pointer())
+
+def _forget(owner_pointer):
+    _components.pop(owner_pointer, None)
+    _, keys = _owned.pop(owner_pointer, (None, ()))
+    for key in keys:
+        _components.pop(key, None)
+
+def prune_component_cache(ids):
+    """throw away the cached data of every ID that isn't in ids
+
+    @param: ids every ID that still exists, that data can be cached for
+    """
+    live = {(id.as_pointer(), _id_identity(id)) for id in ids}
+    for owner_pointer, (owner_identity, _) in list(_owned.items()):
+        if (owner_pointer, owner_identity) not in live:
+            _forget(owner_pointer)
+
+def clear_component_cache():
+    """throw away every datablock's cached data"""
+    _components.clear()
+    _owned.clear()
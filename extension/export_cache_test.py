@@ -0,0 +1,97 @@
+from .export_cache import cached_components, clear_component_cache, mark_dirty, prune_component_cache, store_components
+
+class Datablock:
+    """the parts of an ID or Bone the export cache uses"""
+    def __init__(self, pointer, id_data=None, session_uid=None, name="Datablock"):
+        self.pointer = pointer
+        self.id_data = self if id_data is None else id_data
+        self.session_uid = pointer if session_uid is None else session_uid
+        self.name = name
+        self.name_full = name
+
+    def as_pointer(self):
+        return self.pointer
+
+class TestClass:
+    def setup_method(self):
+        clear_component_cache()
+
+    def test_store_and_reuse(self):
+        mesh = Datablock(1)
+        objs = [{"test::Rotate": {"speed": 1.0}}]
+        assert cached_components(mesh) is None
+        store_components(mesh, objs)
+        assert cached_components(mesh) is objs
+
+    def test_empty_data_is_cached(self):
+        mesh = Datablock(1)
+        store_components(mesh, [])
+        assert cached_components(mesh) == []
+
+    def test_mark_dirty(self):
+        mesh = Datablock(1)
+        material = Datablock(2)
+        store_components(mesh, [])
+        store_components(material, [])
+        mark_dirty(mesh)
+        assert cached_components(mesh) is None
+        assert cached_components(material) == []
+
+    def test_bones_are_dirtied_with_their_armature(self):
+        armature = Datablock(1)
+        bone = Datablock(2, id_data=armature)
+        other = Datablock(3, id_data=Datablock(4))
+        store_components(bone, [])
+        store_components(other, [])
+        mark_dirty(armature)
+        assert cached_components(bone) is None
+        assert cached_components(other) == []
+
+    def test_marking_a_bone_dirties_its_armature(self):
+        armature = Datablock(1)
+        bone = Datablock(2, id_data=armature)
+        store_components(armature, [])
+        store_components(bone, [])
+        mark_dirty(bone)
+        assert cached_components(armature) is None
+        assert cached_components(bone) is None
+
+    def test_reused_pointer_with_a_new_owner(self):
+        store_components(Datablock(2, id_data=Datablock(1)), [])
+        assert cached_components(Datablock(2, id_data=Datablock(3))) is None
+
+    def test_reused_pointer_of_a_removed_id(self):
+        store_components(Datablock(1, session_uid=10), [])
+        assert cached_components(Datablock(1, session_uid=11)) is None
+
+    def test_reused_pointer_of_a_removed_armature(self):
+        armature = Datablock(1, session_uid=10)
+        store_components(Datablock(2, id_data=armature, name="Bone"), [])
+        # a new armature at the same address, with a bone at the same address
+        new_armature = Datablock(1, session_uid=11)
+        assert cached_components(Datablock(2, id_data=new_armature, name="Bone")) is None
+
+    def test_renamed_bone(self):
+        armature = Datablock(1)
+        store_components(Datablock(2, id_data=armature, name="Bone"), [])
+        assert cached_components(Datablock(2, id_data=armature, name="Other")) is None
+
+    def test_prune_removed_ids(self):
+        mesh = Datablock(1)
+        material = Datablock(2)
+        armature = Datablock(3)
+        bone = Datablock(4, id_data=armature)
+        for source in (mesh, material, armature, bone):
+            store_components(source, [])
+        # the armature's address now belongs to a new ID
+        prune_component_cache([mesh, Datablock(3, session_uid=30)])
+        assert cached_components(mesh) == []
+        assert cached_components(material) is None
+        assert cached_components(armature) is None
+        assert cached_components(bone) is None
+
+    def test_clear(self):
+        mesh = Datablock(1)
+        store_components(mesh, [])
+        clear_component_cache()
+        assert cached_components(mesh) is None
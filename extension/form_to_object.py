@@ -1,9 +1,19 @@
+from .collection_values import ENTRIES_FIELD, KEY_FIELD, VALUE_FIELD, flat_buffer, flat_size, is_flat, to_map_key, unflatten
+from .glam_types import VECTOR_PROPERTIES, to_glam
+
 # get json data from an active_editor
 def get_data_from_active_editor(context, context_key):
     """get the data from a ComponentContainer
     The initial context is typically the ComponentContainer and the 
     typical context_key is the type_path of the Component
     """
+    # Components that are a single value, like a TupleStruct
+    # wrapping an f32 or a glam::Vec3, have no PropertyGroup
+    # to recurse into
+    annotation = getattr(context, "__annotations__", {}).get(context_key)
+    if annotation is not None and annotation.function.__name__ != "PointerProperty":
+        return property_value(context, context_key, annotation)
+
     if context_key not in context:
         return {}
     
@@ -25,7 +35,7 @@ def get_data_from_active_editor(context, context_key):
                     if "PointerProperty" == annotations["Some"].function.__name__:
                         return get_data_from_active_editor(obj, "Some")
                     else:
-                        return getattr(obj, "Some")
+                        return property_value(obj, "Some", annotations["Some"])
     except AttributeError:
         # Not all PropertyGroups have the is_core_option attribute, so
         # this is a common failure case that doesn't actually mean failure
@@ -50,141 +60,9 @@ def get_data_from_active_editor(context, context_key):
                     }
                 else:
                     return { 
-                        value: getattr(obj, value)
+                        value: property_value(obj, value, annotations[value])
                     }
 
-    # attempt to handle any type overrides, like glam::Vec3
-    # These are mostly types where the serialization format differs from the
-    # type information we get back from the Bevy type_registry.
-    # For example, Vec3 is a struct and has struct reflection information
-    # properly indicating that a Vec3 has x,y,z fields. BUT the serialization
-    # is overridden and actually needs to be an array of 3 values
-    try:
-        match obj.type_override:
-            case "glam::Vec2" | "glam::DVec2" | "glam::I8Vec2" | "glam::U8Vec2" | "glam::I16Vec2" | "glam::U16Vec2" | "glam::IVec2" | "glam::UVec2" | "glam::I64Vec2" | "glam::U64Vec2" | "glam::BVec2":
-                return [
-                    getattr(obj, "x"),
-                    getattr(obj, "y"),
-                ]
-            case "glam::Vec3" | "glam::Vec3A" | "glam::DVec3" | "glam::I8Vec3" | "glam::U8Vec3" | "glam::I16Vec3" | "glam::U16Vec3" | "glam::IVec3" | "glam::UVec3" | "glam::I64Vec3" | "glam::U64Vec3" | "glam::BVec3":
-                return [
-                    getattr(obj, "x"),
-                    getattr(obj, "y"),
-                    getattr(obj, "z"),   
-                ]
-            case "glam::Vec4" | "glam::DVec4" | "glam::I8Vec4" | "glam::U8Vec4" | "glam::I16Vec4" | "glam::U16Vec4" | "glam::IVec4" | "glam::UVec4" | "glam::I64Vec4" | "glam::U64Vec4" | "glam::BVec4":
-                return [
-                    getattr(obj, "x"),
-                    getattr(obj, "y"),
-                    getattr(obj, "z"),
-                    getattr(obj, "w"),
-                ]
-            case "glam::Quat" | "glam::DQuat":
-                return [
-                    getattr(obj, "x"),
-                    getattr(obj, "y"),
-                    getattr(obj, "z"),
-                    getattr(obj, "w"),
-                ]
-            case "glam::Mat2" | "glam::DMat2":
-                x_axis = getattr(obj, "x_axis")
-                y_axis = getattr(obj, "y_axis")
-                
-                return [
-                    getattr(x_axis, "x"),
-                    getattr(x_axis, "y"),
-
-                    getattr(y_axis, "x"),
-                    getattr(y_axis, "y"),
-                ]
-
-            case "glam::Mat3" | "glam::Mat3A" | "glam::DMat3":
-                x_axis = getattr(obj, "x_axis")
-                y_axis = getattr(obj, "y_axis")
-                z_axis = getattr(obj, "z_axis")
-                
-                return [
-                    getattr(x_axis, "x"),
-                    getattr(x_axis, "y"),
-                    getattr(x_axis, "z"),
-
-                    getattr(y_axis, "x"),
-                    getattr(y_axis, "y"),
-                    getattr(y_axis, "z"),
-
-                    getattr(z_axis, "x"),
-                    getattr(z_axis, "y"),
-                    getattr(z_axis, "z"),
-                ]
-            case "glam::Mat4" | "glam::DMat4":
-                x_axis = getattr(obj, "x_axis")
-                y_axis = getattr(obj, "y_axis")
-                z_axis = getattr(obj, "z_axis")
-                w_axis = getattr(obj, "w_axis")
-                
-                return [
-                    getattr(x_axis, "x"),
-                    getattr(x_axis, "y"),
-                    getattr(x_axis, "z"),
-                    getattr(x_axis, "w"),
-
-                    getattr(y_axis, "x"),
-                    getattr(y_axis, "y"),
-                    getattr(y_axis, "z"),
-                    getattr(y_axis, "w"),
-
-                    getattr(z_axis, "x"),
-                    getattr(z_axis, "y"),
-                    getattr(z_axis, "z"),
-                    getattr(z_axis, "w"),
-
-                    getattr(w_axis, "x"),
-                    getattr(w_axis, "y"),
-                    getattr(w_axis, "z"),
-                    getattr(w_axis, "w"),
-                ]
-  
-            case "glam::Affine2" | "glam::DAffine2":
-                mat = getattr(obj, "matrix2")
-                x_axis = getattr(mat, "x_axis")
-                y_axis = getattr(mat, "y_axis")
-                translation = getattr(obj, "translation")
-                
-                return [
-                    getattr(x_axis, "x"),
-                    getattr(x_axis, "y"),
-                    getattr(y_axis, "x"),
-                    getattr(y_axis, "y"),
-                    getattr(translation, "x"),
-                    getattr(translation, "y"),
-                ]
-            case "glam::Affine3A" | "glam::DAffine3":
-                mat = getattr(obj, "matrix3")
-                x_axis = getattr(mat, "x_axis")
-                y_axis = getattr(mat, "y_axis")
-                z_axis = getattr(mat, "z_axis")
-                translation = getattr(obj, "translation")
-                
-                return [
-                    getattr(x_axis, "x"),
-                    getattr(x_axis, "y"),
-                    getattr(x_axis, "z"),
-                    getattr(y_axis, "x"),
-                    getattr(y_axis, "y"),
-                    getattr(y_axis, "z"),
-                    getattr(z_axis, "x"),
-                    getattr(z_axis, "y"),
-                    getattr(z_axis, "z"),
-                    getattr(translation, "x"),
-                    getattr(translation, "y"),
-                    getattr(translation, "z"),
-                ]
-            
-    except AttributeError:
-        # Not all PropertyGroups have the type_override attribute, so
-        # this is a common failure case that doesn't actually mean failure
-        pass
-
     # if the object has a "force_default", then we're 
     # forcing an empty value. This can happen if a TupleStruct
     # contains a `force_default` type
@@ -198,6 +76,28 @@ def get_data_from_active_editor(context, context_key):
     except AttributeError:
         pass
 
+    # Lists, Sets, and Maps hold their values in a CollectionProperty
+    try:
+        collection = obj.collection
+    except AttributeError:
+        collection = None
+    if collection is not None:
+        return collection_data(obj, annotations, collection)
+
+    # Tuples, TupleStructs, and Arrays are json arrays, with
+    # the fields in annotation order
+    try:
+        positional = obj.positional
+    except AttributeError:
+        positional = False
+    if positional:
+        return [
+            get_data_from_active_editor(obj, key)
+            if "PointerProperty" == value.function.__name__
+            else property_value(obj, key, value)
+            for key, value in annotations.items()
+        ]
+
     # No more special handling, just take the keys and values that are
     # in the annotations, and plug them into the object
     data = {}
@@ -205,5 +105,43 @@ def get_data_from_active_editor(context, context_key):
         if "PointerProperty" == value.function.__name__:
             data[key] = get_data_from_active_editor(obj, key)
         else:
-            data[key] = getattr(obj, key)
+            data[key] = property_value(obj, key, value)
     return data
+
+def property_value(obj, key, annotation):
+    """the json value of a field that isn't a PointerProperty"""
+    value = getattr(obj, key)
+    if annotation.function.__name__ in VECTOR_PROPERTIES:
+        # glam types, and arrays of numbers, are stored as vector properties
+        return to_glam(annotation.keywords.get("subtype"), value)
+    return value
+
+def collection_data(obj, annotations, collection):
+    """the json value of a List, Set, or Map PropertyGroup"""
+    entries = getattr(obj, ENTRIES_FIELD)
+    entry_annotations = annotations[ENTRIES_FIELD].keywords["type"].__annotations__
+    value_annotation = entry_annotations[VALUE_FIELD]
+
+    if collection == "map":
+        key_annotation = entry_annotations[KEY_FIELD]
+        return {
+            to_map_key(property_value(entry, KEY_FIELD, key_annotation)): entry_value(entry, value_annotation)
+            for entry in entries
+        }
+
+    property = value_annotation.function.__name__
+    if is_flat(property):
+        # read every entry's value in one call, instead of
+        # accessing each entry's value attribute
+        size = flat_size(property, value_annotation.keywords)
+        flat = flat_buffer(property, len(entries) * (size or 1))
+        entries.foreach_get(VALUE_FIELD, flat)
+        return unflatten(property, flat, size, value_annotation.keywords.get("subtype"))
+
+    return [entry_value(entry, value_annotation) for entry in entries]
+
+def entry_value(entry, annotation):
+    """the json value of a collection entry"""
+    if "PointerProperty" == annotation.function.__name__:
+        return get_data_from_active_editor(entry, VALUE_FIELD)
+    return property_value(entry, VALUE_FIELD, annotation)
@@ -0,0 +1,113 @@
+# --------------------------------- #
+#  glam vectors, quaternions, and   #
+#  matrices as bpy vector props     #
+# --------------------------------- #
+#
+# glam types have struct reflection data (a Vec3 has x, y, and z
+# fields) but serialize as flat arrays. Instead of building nested
+# PropertyGroups for them, they become a single
+# FloatVectorProperty/IntVectorProperty/BoolVectorProperty that
+# holds the serialized array, so reading and writing them is one
+# bulk array operation.
+#
+# The only difference between the Blender and glam layouts is
+# quaternions: Blender stores w, x, y, z and glam serializes
+# x, y, z, w. Matrices are column major in both.
+#
+# Nothing in this module touches bpy.
+
+VECTOR_PROPERTIES = ("FloatVectorProperty", "IntVectorProperty", "BoolVectorProperty")
+
+# the range of each glam integer vector's component type
+_INT_RANGES = {
+    "I8": {"min": -128, "max": 127},
+    "U8": {"min": 0, "max": 255},
+    "I16": {"min": -32_768, "max": 32_767},
+    "U16": {"min": 0, "max": 65535},
+    "I": {"min": -2_147_483_648, "max": 2_147_483_647},
+    "U": {"min": 0},
+    "I64": {},
+    "U64": {"min": 0},
+}
+
+def _glam_properties():
+    properties = {}
+    for size in (2, 3, 4):
+        for prefix in ("", "D"):
+            properties["glam::" + prefix + "Vec" + str(size)] = ("FloatVectorProperty", {"size": size, "subtype": "XYZ"})
+        for prefix, options in _INT_RANGES.items():
+            properties["glam::" + prefix + "Vec" + str(size)] = ("IntVectorProperty", {"size": size, "subtype": "XYZ", **options})
+        properties["glam::BVec" + str(size)] = ("BoolVectorProperty", {"size": size, "subtype": "XYZ"})
+    properties["glam::Vec3A"] = ("FloatVectorProperty", {"size": 3, "subtype": "XYZ"})
+
+    for type_path in ("glam::Quat", "glam::DQuat"):
+        properties[type_path] = ("FloatVectorProperty", {"size": 4, "subtype": "QUATERNION"})
+    for type_path in ("glam::Mat2", "glam::DMat2"):
+        properties[type_path] = ("FloatVectorProperty", {"size": 4, "subtype": "MATRIX"})
+    for type_path in ("glam::Mat3", "glam::Mat3A", "glam::DMat3"):
+        properties[type_path] = ("FloatVectorProperty", {"size": 9, "subtype": "MATRIX"})
+    for type_path in ("glam::Mat4", "glam::DMat4"):
+        properties[type_path] = ("FloatVectorProperty", {"size": 16, "subtype": "MATRIX"})
+    # Affines are a matrix followed by a translation
+    for type_path in ("glam::Affine2", "glam::DAffine2"):
+        properties[type_path] = ("FloatVectorProperty", {"size": 6})
+    for type_path in ("glam::Affine3A", "glam::DAffine3"):
+        properties[type_path] = ("FloatVectorProperty", {"size": 12})
+    return properties
+
+# type_path -> (bpy.props property name, options)
+GLAM_PROPERTIES = _glam_properties()
+
+def to_glam(subtype, value):
+    """the glam serialization of a vector property's value
+
+    @param: subtype the property's subtype
+    @param: value what getattr returned for the property: a bpy_prop_array
+            or, depending on the subtype, a mathutils Vector, Quaternion, or Matrix
+    """
+    if subtype == "QUATERNION":
+        w, x, y, z = value
+        return [x, y, z, w]
+    if hasattr(value, "col"):
+        # mathutils.Matrix, flattened back into column major order
+        return [component for column in value.col for component in column]
+    return list(value)
+
+def from_glam(subtype, data):
+    """the value to set on a vector property for glam serialized data"""
+    if subtype == "QUATERNION":
+        x, y, z, w = data
+        return [w, x, y, z]
+    return list(data)
+
+# the fields of a glam type's old nested PropertyGroup, in serialization order
+_LEGACY_FIELDS = {
+    2: ["x", "y"],
+    3: ["x", "y", "z"],
+    4: ["x", "y", "z", "w"],
+}
+
+def legacy_to_glam(type_path, group):
+    """the glam serialization of data stored by the nested PropertyGroups
+    older versions built for glam types
+
+    @param: group the stored IDProperty data as a dict, ex: {"x": 1.0, "y": 2.0}
+    """
+    def axes(matrix, names, size):
+        return [matrix.get(name, {}).get(field, 0) for name in names for field in _LEGACY_FIELDS[size]]
+
+    _, options = GLAM_PROPERTIES[type_path]
+    size = options["size"]
+    match type_path:
+        case "glam::Mat2" | "glam::DMat2":
+            return axes(group, ["x_axis", "y_axis"], 2)
+        case "glam::Mat3" | "glam::Mat3A" | "glam::DMat3":
+            return axes(group, ["x_axis", "y_axis", "z_axis"], 3)
+        case "glam::Mat4" | "glam::DMat4":
+            return axes(group, ["x_axis", "y_axis", "z_axis", "w_axis"], 4)
+        case "glam::Affine2" | "glam::DAffine2":
+            return axes(group.get("matrix2", {}), ["x_axis", "y_axis"], 2) + axes(group, ["translation"], 2)
+        case "glam::Affine3A" | "glam::DAffine3":
+            return axes(group.get("matrix3", {}), ["x_axis", "y_axis", "z_axis"], 3) + axes(group, ["translation"], 3)
+        case _:
+            return [group.get(field, 0) for field in _LEGACY_FIELDS[size]]
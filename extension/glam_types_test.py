@@ -0,0 +1,30 @@
+from .glam_types import GLAM_PROPERTIES, from_glam, legacy_to_glam, to_glam
+
+class TestClass:
+    def test_properties(self):
+        assert GLAM_PROPERTIES["glam::Vec3"] == ("FloatVectorProperty", {"size": 3, "subtype": "XYZ"})
+        assert GLAM_PROPERTIES["glam::U8Vec2"] == ("IntVectorProperty", {"size": 2, "subtype": "XYZ", "min": 0, "max": 255})
+        assert GLAM_PROPERTIES["glam::BVec4"][0] == "BoolVectorProperty"
+        assert GLAM_PROPERTIES["glam::Mat4"] == ("FloatVectorProperty", {"size": 16, "subtype": "MATRIX"})
+        assert GLAM_PROPERTIES["glam::DAffine3"][1]["size"] == 12
+
+    def test_quaternion_order(self):
+        # Blender stores w, x, y, z and glam serializes x, y, z, w
+        assert from_glam("QUATERNION", [0.1, 0.2, 0.3, 1.0]) == [1.0, 0.1, 0.2, 0.3]
+        assert to_glam("QUATERNION", [1.0, 0.1, 0.2, 0.3]) == [0.1, 0.2, 0.3, 1.0]
+        assert to_glam("XYZ", (1, 2, 3)) == [1, 2, 3]
+
+    def test_matrix_columns(self):
+        class Matrix:
+            # the shape of a mathutils.Matrix
+            col = [[1, 2], [3, 4]]
+        assert to_glam("MATRIX", Matrix()) == [1, 2, 3, 4]
+
+    def test_legacy_groups(self):
+        assert legacy_to_glam("glam::Vec3", {"x": 1.0, "z": 3.0}) == [1.0, 0, 3.0]
+        assert legacy_to_glam("glam::Quat", {"x": 0.1, "y": 0.2, "z": 0.3, "w": 1.0}) == [0.1, 0.2, 0.3, 1.0]
+        assert legacy_to_glam("glam::Mat2", {"x_axis": {"x": 1, "y": 2}, "y_axis": {"x": 3, "y": 4}}) == [1, 2, 3, 4]
+        assert legacy_to_glam("glam::Affine2", {
+            "matrix2": {"x_axis": {"x": 1, "y": 2}, "y_axis": {"x": 3, "y": 4}},
+            "translation": {"x": 5, "y": 6},
+        }) == [1, 2, 3, 4, 5, 6]
@@ -1,8 +1,10 @@
 import inspect
+import itertools
 import bpy
 
-from .property_groups import hash_over_64
-from .form_to_object import get_data_from_active_editor
+from .export_cache import cached_components, clear_component_cache, prune_component_cache, store_components
+from .snapshot_export import component_snapshots, serialize_snapshot
+from .op_registry_loading import component_type_paths_in_use, materialize_components
 
 # glTF extensions are named following a convention with known prefixes.
 # See: https://github.com/KhronosGroup/glTF/tree/main/extensions#about-gltf-extensions
@@ -259,33 +261,7 @@ class glTF2ExportUserExtension:
     #     print("debug: animation_action_hook")
     def gather_skein_two(self, source, sink):
         if "skein_two" in dir(source):
-            objs = []
-            skein_property_groups = bpy.context.window_manager.skein_property_groups
-            for component in source.skein_two:
-                obj = {}
-                type_path = component["selected_type_path"]
-
-                if inspect.isclass(skein_property_groups[type_path]):
-                    try:
-                        match skein_property_groups[type_path].force_default:
-                            case "object":
-                                obj[type_path] = {}
-                            case "list":
-                                obj[type_path] = []
-                        objs.append(obj)
-                    except AttributeError:
-                        value = get_data_from_active_editor(
-                            component,
-                            hash_over_64(type_path),
-                        )
-                        obj[type_path] = value
-                        objs.append(obj)
-                else:
-                    # if the component is a tuple struct, etc
-                    # retrieve the value directly instead of
-                    # recursing
-                    obj[type_path] = getattr(component, hash_over_64(type_path))
-                    objs.append(obj)
+            objs = gather_components(source)
 
             # storing data on glTF extras is the original way Skein worked
             # and for the time being is easy to keep supporting, so we will.
@@ -318,15 +294,110 @@ class glTF2ExportUserExtension:
                     required=extension_is_required
                 )
 
+def gather_components(source):
+    """the exported data of every component on a datablock
+
+    Meshes, materials, and other data are often shared by many
+    objects, and the exporter visits them once per object that uses
+    them, so the data is cached and only gathered again after the
+    datablock changes. See export_cache.py
+    """
+    cacheable = is_original(source)
+    if cacheable:
+        objs = cached_components(source)
+        if objs is not None:
+            return objs
+
+    objs = []
+    skein_property_groups = bpy.context.window_manager.skein_property_groups
+    snapshots = None
+    if snapshot_export_enabled():
+        # copy every component's IDProperties in one go,
+        # instead of reading each field through RNA
+        snapshots = component_snapshots(source)
+    for index, component in enumerate(source.skein_two):
+        obj = {}
+        type_path = component["selected_type_path"]
+
+        if type_path not in skein_property_groups:
+            print("skein: no PropertyGroup for", type_path, "skipping export")
+            continue
+
+        if inspect.isclass(skein_property_groups[type_path]):
+            try:
+                match skein_property_groups[type_path].force_default:
+                    case "object":
+                        obj[type_path] = {}
+                    case "list":
+                        obj[type_path] = []
+                objs.append(obj)
+            except AttributeError:
+                value = serialize_snapshot(
+                    snapshots[index] if snapshots else None,
+                    component,
+                    type_path,
+                )
+                obj[type_path] = value
+                objs.append(obj)
+        else:
+            # if the component is a tuple struct, etc
+            # there's a single value instead of a PropertyGroup
+            obj[type_path] = serialize_snapshot(snapshots[index] if snapshots else None, component, type_path)
+            objs.append(obj)
+
+    if cacheable:
+        store_components(source, objs)
+    return objs
+
+def is_original(source):
+    """whether source is, or belongs to, an original ID from bpy.data
+
+    The exporter also passes evaluated copies, and with Apply
+    Modifiers the temporary meshes to_mesh() creates. Both are freed
+    during the export and their addresses reused.
+    """
+    id_data = source.id_data
+    return not id_data.is_evaluated and id_data.original == id_data
+
+def cached_ids():
+    """every ID the exporter gathers components from"""
+    return itertools.chain(
+        bpy.data.objects,
+        bpy.data.meshes,
+        bpy.data.materials,
+        bpy.data.cameras,
+        bpy.data.lights,
+        bpy.data.armatures,
+        bpy.data.scenes,
+    )
+
 def glTF2_pre_export_callback(export_settings):
     print("skein::glTF2_pre_export_callback")
+    if not export_cache_enabled():
+        # data from a previous export may be out of date
+        clear_component_cache()
+    else:
+        # IDs removed since the last export
+        prune_component_cache(cached_ids())
+    # components skipped by lazy registry processing have
+    # to be built before their data can be read
+    materialize_components(bpy.context, component_type_paths_in_use())
 
 def glTF2_post_export_callback(export_settings):
     print("skein::glTF2_post_export_callback")
+    if not export_cache_enabled():
+        clear_component_cache()
 
 def pre_export_hook(export_settings):
     print("skein::pre_export_hook")
     pass
 
+def snapshot_export_enabled():
+    if __package__ in bpy.context.preferences.addons:
+        return bpy.context.preferences.addons[__package__].preferences.snapshot_export
+    return True
 
-
+def export_cache_enabled():
+    if __package__ in bpy.context.preferences.addons:
+        return bpy.context.preferences.addons[__package__].preferences.export_cache
+    return True
@@ -0,0 +1,80 @@
+import bpy # type: ignore
+
+from .glam_types import legacy_to_glam, from_glam
+from .type_names import field_name
+
+# --------------------------------- #
+#  Upgrade component data stored    #
+#  by older versions of skein       #
+# --------------------------------- #
+#
+# Migrations work on the raw IDProperties under each component,
+# because Blender drops IDProperties that don't match the type
+# of the property they're read through.
+
+def skein_data_owners():
+    """everything that can have components in the open .blend file"""
+    for collection in [
+        bpy.data.objects,
+        bpy.data.meshes,
+        bpy.data.materials,
+        bpy.data.scenes,
+        bpy.data.cameras,
+        bpy.data.lights,
+        bpy.data.collections,
+    ]:
+        yield from collection
+    for armature in bpy.data.armatures:
+        yield from armature.bones
+
+def migrate_component_data(skein_property_specs):
+    """upgrade the component data in the open .blend file. Returns how many values changed
+
+    Run after a registry is processed, so that the specs
+    for every component are available.
+    """
+    migrated = 0
+    for owner in skein_data_owners():
+        for component in getattr(owner, "skein_two", ()):
+            type_path = component.selected_type_path
+            spec = skein_property_specs.get(type_path)
+            if spec is not None and spec["kind"] == "class":
+                spec = {"kind": "group", "type_path": type_path}
+            migrated += migrate_glam_groups(component, field_name(type_path), spec, skein_property_specs)
+    return migrated
+
+def migrate_glam_groups(parent, key, spec, skein_property_specs):
+    """convert glam types stored as nested PropertyGroups to the
+    vector properties glam types are built as now
+
+    @param: parent the IDProperty group (or PropertyGroup) holding key
+    @param: spec the spec of the property stored at key
+    """
+    if spec is None:
+        return 0
+
+    try:
+        value = parent.get(key)
+    except (AttributeError, TypeError):
+        return 0
+    # only groups need to be migrated
+    if value is None or not hasattr(value, "to_dict"):
+        return 0
+
+    if spec["kind"] == "property":
+        if "glam" not in spec:
+            return 0
+        data = legacy_to_glam(spec["glam"], value.to_dict())
+        parent[key] = from_glam(spec["options"].get("subtype"), data)
+        return 1
+
+    if spec["kind"] == "group":
+        class_spec = skein_property_specs.get(spec["type_path"])
+        if class_spec is None or class_spec["kind"] != "class":
+            return 0
+        return sum(
+            migrate_glam_groups(value, field, field_spec, skein_property_specs)
+            for field, field_spec in class_spec["annotations"].items()
+        )
+
+    return 0
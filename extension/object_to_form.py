@@ -1,3 +1,6 @@
+from .collection_values import ENTRIES_FIELD, KEY_FIELD, VALUE_FIELD, flat_size, flatten, from_map_key, is_flat
+from .glam_types import VECTOR_PROPERTIES, from_glam
+
 # put json data into an active_editor
 # This is the inverse of `form_to_object`
 def object_to_form(context, context_key, data):
@@ -6,6 +9,13 @@ def object_to_form(context, context_key, data):
     context_key is the type_path
     data is the component data
     """
+    # glam types, and arrays of numbers, are stored as vector
+    # properties, which are set all at once
+    annotation = getattr(context, "__annotations__", {}).get(context_key)
+    if annotation is not None and annotation.function.__name__ in VECTOR_PROPERTIES:
+        setattr(context, context_key, from_glam(annotation.keywords.get("subtype"), data))
+        return
+
     if context_key not in context:
         return
     
@@ -61,138 +71,28 @@ def object_to_form(context, context_key, data):
         # no further processing to do.
         return
 
-    # attempt to handle any type overrides, like glam::Vec3
-    # These are mostly types where the serialization format differs from the
-    # type information we get back from the Bevy type_registry.
-    # For example, Vec3 is a struct and has struct reflection information
-    # properly indicating that a Vec3 has x,y,z fields. BUT the serialization
-    # is overridden and actually needs to be an array of 3 values
+    # Lists, Sets, and Maps hold their values in a CollectionProperty
     try:
-        print("obj.type_override", obj.type_override)
-        match obj.type_override:
-            case "glam::Vec2" | "glam::DVec2" | "glam::I8Vec2" | "glam::U8Vec2" | "glam::I16Vec2" | "glam::U16Vec2" | "glam::IVec2" | "glam::UVec2" | "glam::I64Vec2" | "glam::U64Vec2" | "glam::BVec2":
-                return [
-                    setattr(obj, "x", data[0]),
-                    setattr(obj, "y", data[1]),
-                ]
-            case "glam::Vec3" | "glam::Vec3A" | "glam::DVec3" | "glam::I8Vec3" | "glam::U8Vec3" | "glam::I16Vec3" | "glam::U16Vec3" | "glam::IVec3" | "glam::UVec3" | "glam::I64Vec3" | "glam::U64Vec3" | "glam::BVec3":
-                return [
-                    setattr(obj, "x", data[0]),
-                    setattr(obj, "y", data[1]),
-                    setattr(obj, "z", data[2]),
-                ]
-            case "glam::Vec4" | "glam::DVec4" | "glam::I8Vec4" | "glam::U8Vec4" | "glam::I16Vec4" | "glam::U16Vec4" | "glam::IVec4" | "glam::UVec4" | "glam::I64Vec4" | "glam::U64Vec4" | "glam::BVec4":
-                return [
-                    setattr(obj, "x", data[0]),
-                    setattr(obj, "y", data[1]),
-                    setattr(obj, "z", data[2]),
-                    setattr(obj, "w", data[3]),
-                ]
-            case "glam::Quat" | "glam::DQuat":
-                return [
-                    setattr(obj, "x", data[0]),
-                    setattr(obj, "y", data[1]),
-                    setattr(obj, "z", data[2]),
-                    setattr(obj, "w", data[3]),
-                ]
-            case "glam::Mat2" | "glam::DMat2":
-                x_axis = getattr(obj, "x_axis")
-                y_axis = getattr(obj, "y_axis")
-                
-                return [
-                    setattr(x_axis, "x", data[0]),
-                    setattr(x_axis, "y", data[1]),
-
-                    setattr(y_axis, "x", data[2]),
-                    setattr(y_axis, "y", data[3]),
-                ]
-
-            case "glam::Mat3" | "glam::Mat3A" | "glam::DMat3":
-                x_axis = getattr(obj, "x_axis")
-                y_axis = getattr(obj, "y_axis")
-                z_axis = getattr(obj, "z_axis")
-                
-                return [
-                    setattr(x_axis, "x", data[0]),
-                    setattr(x_axis, "y", data[1]),
-                    setattr(x_axis, "z", data[2]),
-
-                    setattr(y_axis, "x", data[3]),
-                    setattr(y_axis, "y", data[4]),
-                    setattr(y_axis, "z", data[5]),
-
-                    setattr(z_axis, "x", data[6]),
-                    setattr(z_axis, "y", data[7]),
-                    setattr(z_axis, "z", data[8]),
-                ]
-            case "glam::Mat4" | "glam::DMat4":
-                x_axis = getattr(obj, "x_axis")
-                y_axis = getattr(obj, "y_axis")
-                z_axis = getattr(obj, "z_axis")
-                w_axis = getattr(obj, "w_axis")
-                
-                return [
-                    setattr(x_axis, "x", data[0]),
-                    setattr(x_axis, "y", data[1]),
-                    setattr(x_axis, "z", data[2]),
-                    setattr(x_axis, "w", data[3]),
-
-                    setattr(y_axis, "x", data[4]),
-                    setattr(y_axis, "y", data[5]),
-                    setattr(y_axis, "z", data[6]),
-                    setattr(y_axis, "w", data[7]),
-
-                    setattr(z_axis, "x", data[8]),
-                    setattr(z_axis, "y", data[9]),
-                    setattr(z_axis, "z", data[10]),
-                    setattr(z_axis, "w", data[11]),
-
-                    setattr(w_axis, "x", data[12]),
-                    setattr(w_axis, "y", data[13]),
-                    setattr(w_axis, "z", data[14]),
-                    setattr(w_axis, "w", data[15]),
-                ]
-  
-            case "glam::Affine2" | "glam::DAffine2":
-                mat = getattr(obj, "matrix2")
-                x_axis = getattr(mat, "x_axis")
-                y_axis = getattr(mat, "y_axis")
-                translation = getattr(obj, "translation")
-                
-                return [
-                    setattr(x_axis, "x", data[0]),
-                    setattr(x_axis, "y", data[1]),
-                    setattr(y_axis, "x", data[2]),
-                    setattr(y_axis, "y", data[3]),
-                    setattr(translation, "x", data[4]),
-                    setattr(translation, "y", data[5]),
-                ]
-            case "glam::Affine3A" | "glam::DAffine3":
-                mat = getattr(obj, "matrix3")
-                x_axis = getattr(mat, "x_axis")
-                y_axis = getattr(mat, "y_axis")
-                z_axis = getattr(mat, "z_axis")
-                translation = getattr(obj, "translation")
-                
-                return [
-                    setattr(x_axis, "x", data[0]),
-                    setattr(x_axis, "y", data[1]),
-                    setattr(x_axis, "z", data[2]),
-                    setattr(y_axis, "x", data[3]),
-                    setattr(y_axis, "y", data[4]),
-                    setattr(y_axis, "z", data[5]),
-                    setattr(z_axis, "x", data[6]),
-                    setattr(z_axis, "y", data[7]),
-                    setattr(z_axis, "z", data[8]),
-                    setattr(translation, "x", data[9]),
-                    setattr(translation, "y", data[10]),
-                    setattr(translation, "z", data[11]),
-                ]
-            
+        collection = obj.collection
     except AttributeError:
-        # Not all PropertyGroups have the type_override attribute, so
-        # this is a common failure case that doesn't actually mean failure
-        pass
+        collection = None
+    if collection is not None:
+        collection_to_form(obj, annotations, collection, data)
+        return
+
+    # Tuples, TupleStructs, and Arrays are json arrays, with
+    # the fields in annotation order
+    try:
+        positional = obj.positional
+    except AttributeError:
+        positional = False
+    if positional:
+        for (key, value), item in zip(annotations.items(), data):
+            if isinstance(item, list) or isinstance(item, dict) or value.function.__name__ == "PointerProperty":
+                object_to_form(obj, key, item)
+            else:
+                setattr(obj, key, item)
+        return
 
     # No more special handling, just take the keys and values that are
     # in the annotations, and plug them into the object
@@ -204,3 +104,63 @@ def object_to_form(context, context_key, data):
         else:
             setattr(obj, key, data[key])
     return
+
+def collection_to_form(obj, annotations, collection, data):
+    """replace the entries of a List, Set, or Map PropertyGroup with data"""
+    entries = getattr(obj, ENTRIES_FIELD)
+    entry_annotations = annotations[ENTRIES_FIELD].keywords["type"].__annotations__
+    value_annotation = entry_annotations[VALUE_FIELD]
+    entries.clear()
+
+    if collection == "map":
+        key_property = entry_annotations[KEY_FIELD].function.__name__
+        for key, value in data.items():
+            entry = entries.add()
+            setattr(entry, KEY_FIELD, from_map_key(key_property, key))
+            entry_to_form(entry, value_annotation, value)
+        return
+
+    for _ in data:
+        entries.add()
+
+    property = value_annotation.function.__name__
+    if is_flat(property):
+        # write every entry's value in one call, instead of
+        # setting each entry's value attribute
+        size = flat_size(property, value_annotation.keywords)
+        entries.foreach_set(
+            VALUE_FIELD,
+            flatten(property, data, size, value_annotation.keywords.get("subtype"))
+        )
+        return
+
+    for entry, value in zip(entries, data):
+        entry_to_form(entry, value_annotation, value)
+
+def entry_to_form(entry, annotation, value):
+    """insert the json value of a collection entry"""
+    if "PointerProperty" == annotation.function.__name__:
+        # new entries don't have their PointerProperty
+        # fields initialized until they're accessed
+        touch_all_fields(entry, VALUE_FIELD)
+        object_to_form(entry, VALUE_FIELD, value)
+    elif annotation.function.__name__ in VECTOR_PROPERTIES:
+        setattr(entry, VALUE_FIELD, from_glam(annotation.keywords.get("subtype"), value))
+    else:
+        setattr(entry, VALUE_FIELD, value)
+
+def touch_all_fields(context, key):
+    """access every PointerProperty field under getattr(context, key)
+
+    Blender will not initialize PointerPropertys until they're
+    accessed, so new components and collection entries are touched
+    before they're drawn or written to.
+    """
+    try:
+        obj = getattr(context, key)
+        annotations = getattr(obj, "__annotations__")
+        for key, value in annotations.items():
+            if "PointerProperty" == value.function.__name__:
+                touch_all_fields(obj, key)
+    except:
+        pass
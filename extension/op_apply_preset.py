@@ -1,8 +1,9 @@
-import json
 import bpy
 
-from .object_to_form import object_to_form
-from .property_groups import hash_over_64
+from .component_writer import write_component
+from .export_cache import mark_dirty
+from .presets_cache import get_preset
+from .type_names import field_name
 
 class ApplyPresetToObject(bpy.types.Operator):
     """Apply a preset (like Default) to the selected object"""
@@ -138,30 +139,21 @@ def apply_preset_data(context, obj, preset_id):
 
     if presets:
         try:
-            if "skein-presets.json" in bpy.data.texts:
-                text = bpy.data.texts["skein-presets.json"].as_string()
-                embedded_presets = json.loads(text)
-                print("preset info: ", embedded_presets[component.selected_type_path][preset_id])
-                object_to_form(
+            preset = get_preset(component.selected_type_path, preset_id)
+            if preset is not None:
+                print("preset info: ", preset)
+                # exported data cached for obj is out of date
+                mark_dirty(obj)
+                write_component(
                     component,
-                    hash_over_64(component.selected_type_path),
-                    embedded_presets[component.selected_type_path][preset_id]
+                    field_name(component.selected_type_path),
+                    component.selected_type_path,
+                    preset
                 )
         except Exception as e:
             print("preset error: ", e)
             pass
 
-
-def touch_all_fields(context, key):
-    try:
-        obj = getattr(context, key)
-        annotations = getattr(obj, "__annotations__")
-        for key, value in annotations.items():
-            if "PointerProperty" == value.function.__name__:
-                touch_all_fields(obj, key)
-    except:
-        pass
-
 classes = (
     ApplyPresetToObject,
     ApplyPresetToMesh,
@@ -0,0 +1,55 @@
+import bpy
+
+from .collection_values import ENTRIES_FIELD, VALUE_FIELD
+from .export_cache import mark_dirty
+from .object_to_form import touch_all_fields
+
+# The panel sets `skein_collection` with context_pointer_set
+# to the List, Set, or Map PropertyGroup being drawn, so
+# these operators know which collection to change.
+
+class AddCollectionEntry(bpy.types.Operator):
+    """Add an entry to a List, Set, or Map"""
+    bl_idname = "wm.skein_add_collection_entry" # unique identifier. first word is required by extensions review team to be from a specific set of words
+    bl_label = "Add Entry" # Shows up in the UI
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return getattr(context, "skein_collection", None) is not None
+
+    def execute(self, context):
+        entries = getattr(context.skein_collection, ENTRIES_FIELD)
+        entry = entries.add()
+        mark_dirty(context.skein_collection)
+        # Blender will not initialize PointerPropertys if we don't
+        # access them, so touch the new entry's fields
+        touch_all_fields(entry, VALUE_FIELD)
+        return {'FINISHED'}
+
+class RemoveCollectionEntry(bpy.types.Operator):
+    """Remove an entry from a List, Set, or Map"""
+    bl_idname = "wm.skein_remove_collection_entry" # unique identifier. first word is required by extensions review team to be from a specific set of words
+    bl_label = "Remove Entry" # Shows up in the UI
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: bpy.props.IntProperty(name="Index", min=0) # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return getattr(context, "skein_collection", None) is not None
+
+    def execute(self, context):
+        entries = getattr(context.skein_collection, ENTRIES_FIELD)
+        if self.index >= len(entries):
+            return {'CANCELLED'}
+        entries.remove(self.index)
+        mark_dirty(context.skein_collection)
+        return {'FINISHED'}
+
+classes = (
+    AddCollectionEntry,
+    RemoveCollectionEntry,
+)
+
+register, unregister = bpy.utils.register_classes_factory(classes)
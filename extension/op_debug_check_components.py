@@ -1,8 +1,7 @@
-import inspect
 import bpy
 
-from .property_groups import hash_over_64 # type: ignore
-from .form_to_object import get_data_from_active_editor # type: ignore
+from .type_names import field_name # type: ignore
+from .serializers import serialize_component # type: ignore
 
 class DebugCheckComponents(bpy.types.Operator):
     """Iterate over all objects and print the skein component data to console
@@ -20,27 +19,21 @@ class DebugCheckComponents(bpy.types.Operator):
             print("## ", len(object.skein_two), " components:")
             for component in object.skein_two:
                 print("\n----------\n### ", component.selected_type_path, "")
-                skein_property_groups = context.window_manager.skein_property_groups
-                if inspect.isclass(skein_property_groups[component.selected_type_path]):
-                    print(get_data_from_active_editor(
-                        component,
-                        hash_over_64(component.selected_type_path),
-                    ))
-                else:
-                    print(getattr(component, component.selected_type_path))
+                print(serialize_component(
+                    component,
+                    field_name(component.selected_type_path),
+                    component.selected_type_path,
+                ))
         print("-------")
         for object in bpy.data.materials:
             print("\n# ", object.name)
             print("## ", len(object.skein_two), " components:")
             for component in object.skein_two:
                 print("### ", component.selected_type_path, "")
-                skein_property_groups = context.window_manager.skein_property_groups
-                if inspect.isclass(skein_property_groups[component.selected_type_path]):
-                    print(get_data_from_active_editor(
-                        component,
-                        hash_over_64(component.selected_type_path),
-                    ))
-                else:
-                    print(getattr(component, component.selected_type_path))
+                print(serialize_component(
+                    component,
+                    field_name(component.selected_type_path),
+                    component.selected_type_path,
+                ))
 
         return {'FINISHED'}
\ No newline at end of file
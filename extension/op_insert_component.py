@@ -1,8 +1,13 @@
-import json
 import bpy
 
-from .object_to_form import object_to_form
-from .property_groups import hash_over_64
+from .component_writer import write_component
+from .object_to_form import touch_all_fields
+from .component_search import record_recent_component
+from .export_cache import mark_dirty
+from .op_registry_loading import materialize_components
+from .presets_cache import get_preset
+from .registry_state import get_registry
+from .type_names import field_name
 
 class InsertComponentOnObject(bpy.types.Operator):
     """Insert a component on the selected object"""
@@ -117,25 +122,31 @@ def insert_component_data(context, obj):
     if debug:
         print("\ninsert_component_data:")
     
-    global_skein = context.window_manager.skein
     selected_component = context.window_manager.selected_component
 
-    if global_skein.registry:
-        registry = json.loads(global_skein.registry)
+    registry = get_registry()
+    if registry:
         if list(registry) and registry[selected_component]:
             data = registry[selected_component]
             if debug:
                 print(data)
 
+            # lazy registry processing may not have built this
+            # component's PropertyGroup yet
+            materialize_components(context, [selected_component])
+
             new_component = obj.skein_two.add()
+            # exported data cached for obj is out of date
+            mark_dirty(obj)
             new_component.name = data["shortPath"]
             new_component.selected_type_path = selected_component
+            record_recent_component(selected_component)
 
             # Blender will not initialize PointerPropertys if we don't
             # access them, leading to missing data issues when we render
             # the UI. This is why we touch all PointerProperty fields
             # to make sure they're initialized.
-            touch_all_fields(new_component, hash_over_64(new_component.selected_type_path))
+            touch_all_fields(new_component, field_name(new_component.selected_type_path))
 
             # If we inserted a new component, update the 
             # active_component_index to show the right editor
@@ -144,13 +155,13 @@ def insert_component_data(context, obj):
 
             if presets:
                 try:
-                    if "skein-presets.json" in bpy.data.texts:
-                        text = bpy.data.texts["skein-presets.json"].as_string()
-                        embedded_presets = json.loads(text)
-                        object_to_form(
+                    default = get_preset(selected_component, "default")
+                    if default is not None:
+                        write_component(
                             new_component,
-                            hash_over_64(new_component.selected_type_path),
-                            embedded_presets[selected_component]["default"]
+                            field_name(new_component.selected_type_path),
+                            new_component.selected_type_path,
+                            default
                         )
                 except Exception as e:
                     print(e)
@@ -160,16 +171,6 @@ def insert_component_data(context, obj):
     else:
         print("no global registry set")
 
-def touch_all_fields(context, key):
-    try:
-        obj = getattr(context, key)
-        annotations = getattr(obj, "__annotations__")
-        for key, value in annotations.items():
-            if "PointerProperty" == value.function.__name__:
-                touch_all_fields(obj, key)
-    except:
-        pass
-
 classes = (
     InsertComponentOnObject,
     InsertComponentOnMesh,
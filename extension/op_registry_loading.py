@@ -2,9 +2,22 @@ import inspect
 from pathlib import Path
 import bpy # type: ignore
 import json
-import requests # type: ignore
 import os
-from .property_groups import hash_over_64, make_property
+import threading
+from .property_groups import compile_property, compile_registry, materialize_entry
+from .registry_build_report import RegistryBuildReport, write_build_report
+from .brp_client import brp_batch, discovered_methods, forget_discovery, remember_discovery, schema_method
+from .presets_cache import PRESETS_TEXT_NAME, invalidate_presets
+from .registry_state import get_registry, set_registry
+from .registry_disk_cache import compiled_registry_key, load_compiled_registry, registry_text_hash, store_compiled_registry
+from .registry_store import reference_store, referenced_text, store_directory, store_text, update_head
+from .component_search import build_component_index
+from .migrations import migrate_component_data
+from .export_cache import clear_component_cache
+from .serializers import set_serializer_specs
+from .type_names import build_type_names, field_name
+from .registry_text import STORAGE_PRETTY, decode_json, encode_json
+from .registry_graph import build_dependency_graph, component_type_paths, parse_prefixes, reachable, type_fingerprints, type_path_included, whole_crates
 # --------------------------------- #
 #  Fetch and store the bevy type    #
 #  registry, for panel display      #
@@ -16,116 +29,360 @@ class FetchRemoteTypeRegistry(bpy.types.Operator):
     bl_label = "Fetch a Remote Type Registry" # Shows up in the UI
     bl_options = {'REGISTER', 'UNDO'} # enable undo (which we might not need)
 
-    # execute is called to run the operator
+    # invoke runs the requests on a worker thread, so that a slow
+    # or hung Bevy app doesn't freeze Blender. The modal timer
+    # checks in on the worker and, once it is done, processes the
+    # result on the main thread.
+    def invoke(self, context, event):
+        settings = fetch_settings(context)
+        if settings["debug"]:
+            print("\ninvoke: FetchRemoteTypeRegistry")
+
+        state = {
+            "progress": "connecting to " + settings["host"] + ":" + settings["port"],
+            "done": False,
+            "result": None,
+            "error": None,
+        }
+
+        def set_progress(message):
+            state["progress"] = message
+
+        def fetch():
+            try:
+                state["result"] = fetch_registry_data(
+                    settings["host"],
+                    settings["port"],
+                    settings["schema_params"],
+                    settings["presets"],
+                    settings["timeout"],
+                    set_progress,
+                    settings["known_hash"],
+                    settings["debug"]
+                )
+            except BrpFetchError as e:
+                state["error"] = str(e)
+            except Exception as e:
+                state["error"] = repr(e)
+            state["done"] = True
+
+        self._state = state
+        # daemon, so that a hung request never keeps Blender from quitting
+        self._thread = threading.Thread(target=fetch, daemon=True)
+        self._thread.start()
+
+        window_manager = context.window_manager
+        self._timer = window_manager.event_timer_add(0.1, window=context.window)
+        window_manager.modal_handler_add(self)
+        self.show_progress(context)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            # the request can't be interrupted, but its result is
+            # ignored and it will end when it times out
+            self.finish(context)
+            self.report({"INFO"}, "Cancelled fetching the Bevy type registry")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        if not self._state["done"]:
+            self.show_progress(context)
+            return {'PASS_THROUGH'}
+
+        self.finish(context)
+        if self._state["error"] is not None:
+            self.report({"ERROR"}, self._state["error"])
+            return {'CANCELLED'}
+
+        registry, presets, registry_hash = self._state["result"]
+        if registry is None:
+            self.report({"INFO"}, "The Bevy type registry is unchanged")
+        apply_fetched_registry(context, registry, presets, registry_hash)
+        return {'FINISHED'}
+
+    # execute is called to run the operator when it isn't invoked,
+    # for example from scripts. It blocks until the requests are done.
     def execute(self, context):
-        debug = False
-        presets = False
-        host = ""
-        port = ""
-        if __package__ in context.preferences.addons:
-            preferences = context.preferences.addons[__package__].preferences
-            debug = preferences.debug
-            presets = preferences.presets
-            host = preferences.host or "http://127.0.0.1"
-            port = preferences.port or "15702"
+        settings = fetch_settings(context)
+        if settings["debug"]:
+            print("\nexecute: FetchRemoteTypeRegistry")
+
+        try:
+            registry, presets, registry_hash = fetch_registry_data(
+                settings["host"],
+                settings["port"],
+                settings["schema_params"],
+                settings["presets"],
+                settings["timeout"],
+                known_hash=settings["known_hash"],
+                debug=settings["debug"]
+            )
+        except BrpFetchError as e:
+            self.report({"ERROR"}, str(e))
+            return {'CANCELLED'}
+
+        if registry is None:
+            self.report({"INFO"}, "The Bevy type registry is unchanged")
+        apply_fetched_registry(context, registry, presets, registry_hash)
+        return {'FINISHED'}
+
+    def show_progress(self, context):
+        if context.workspace is not None:
+            context.workspace.status_text_set("Skein: " + self._state["progress"] + "... (Esc to cancel)")
+
+    def finish(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        if context.workspace is not None:
+            # None restores the default status bar
+            context.workspace.status_text_set(None)
+
+class BrpFetchError(Exception):
+    """a BRP request failed. The message is meant for the user"""
+
+BRP_PRESETS_METHOD = "skein/presets"
+BRP_REGISTRY_HASH_METHOD = "skein/registry_hash"
+
+# custom properties on the skein-registry.json text block
+REGISTRY_HASH_PROPERTY = "skein_registry_hash"
+REGISTRY_TEXT_HASH_PROPERTY = "skein_registry_text_hash"
+
+BRP_ERROR_MESSAGE = "request for Bevy registry data returned an error, is the Bevy Remote Protocol Plugin added and is the Bevy app running? :: "
+
+def fetch_settings(context):
+    """the preferences FetchRemoteTypeRegistry needs, read on the main thread"""
+    settings = {
+        "debug": False,
+        "presets": False,
+        "host": "",
+        "port": "",
+        "timeout": None,
+        "schema_params": {},
+        "known_hash": embedded_registry_hash(),
+    }
+    if __package__ in context.preferences.addons:
+        preferences = context.preferences.addons[__package__].preferences
+        settings["debug"] = preferences.debug
+        settings["presets"] = preferences.presets
+        settings["host"] = preferences.host or "http://127.0.0.1"
+        settings["port"] = preferences.port or "15702"
+        settings["timeout"] = preferences.timeout
+        if preferences.filter_on_server:
+            settings["schema_params"] = registry_schema_params(
+                parse_prefixes(preferences.allow_prefixes),
+                parse_prefixes(preferences.deny_prefixes),
+            )
+    return settings
+
+def fetch_registry_data(host, port, schema_params, presets, timeout, progress=None, known_hash=None, debug=False):
+    """make the BRP requests for a registry (and its presets)
+
+    This doesn't touch bpy, so it is safe to run on a worker thread.
+    Returns (registry, presets, registry_hash). presets is None if
+    presets were not requested, or could not be fetched. registry_hash
+    is the app's skein/registry_hash (None for apps that don't have
+    it), and registry is None if that hash matched known_hash.
+    Raises BrpFetchError if the registry could not be fetched.
+
+    The first fetch from a host/port sends rpc.discover, the newest
+    schema method, and skein/presets as a single batch. Later fetches
+    use the discovered methods and skip rpc.discover.
+
+    @param: timeout seconds to wait for each request, None waits forever
+    @param: progress an optional function that is called with a description of each step
+    @param: known_hash the registry_hash of the registry Blender already has
+    @param: debug print diagnostic output, like the Bevy version (default False)
+    """
+    if progress is None:
+        progress = lambda message: None
+
+    def supports(discovery, method):
+        # without a discovery, the only way to find out is to try
+        return discovery is None or method in discovery["methods"]
+
+    def send(calls):
+        return dict(zip(
+            [method for method, _ in calls],
+            brp_batch(host, port, calls, timeout)
+        ))
+
+    responses = {}
+
+    try:
+        discovery = discovered_methods(host, port)
+
+        # If the registry didn't change since it was last fetched,
+        # there's no need to download or process it again.
+        if known_hash is not None and supports(discovery, BRP_REGISTRY_HASH_METHOD):
+            progress("checking whether the registry changed")
+            calls = [(BRP_REGISTRY_HASH_METHOD, schema_params)]
+            if presets and supports(discovery, BRP_PRESETS_METHOD):
+                calls.append((BRP_PRESETS_METHOD, None))
+            responses = send(calls)
+            if responses[BRP_REGISTRY_HASH_METHOD].get("result") == known_hash:
+                return None, presets_result(presets, responses, debug), known_hash
+
+        if discovery is None:
+            progress("discovering Bevy Remote Protocol methods")
+            calls = [
+                ("rpc.discover", None),
+                # optimistically ask for the newest schema method
+                ("registry.schema", schema_params),
+            ]
+            if BRP_REGISTRY_HASH_METHOD not in responses:
+                calls.append((BRP_REGISTRY_HASH_METHOD, schema_params))
+            if presets and BRP_PRESETS_METHOD not in responses:
+                calls.append((BRP_PRESETS_METHOD, None))
+            responses.update(send(calls))
+            discovery = remember_discovery(host, port, responses["rpc.discover"])
+            if discovery is not None and debug:
+                print("Bevy version:", discovery["version"])
+
+        method = schema_method(discovery)
+        if method not in responses:
+            progress("fetching the registry schema")
+            calls = [(method, schema_params)]
+            if BRP_REGISTRY_HASH_METHOD not in responses and supports(discovery, BRP_REGISTRY_HASH_METHOD):
+                calls.append((BRP_REGISTRY_HASH_METHOD, schema_params))
+            if presets and BRP_PRESETS_METHOD not in responses and supports(discovery, BRP_PRESETS_METHOD):
+                calls.append((BRP_PRESETS_METHOD, None))
+            responses.update(send(calls))
+    except (OSError, ValueError) as e:
+        # requests' exceptions are OSErrors, and a response that
+        # isn't json is a ValueError
+        forget_discovery(host, port)
+        raise BrpFetchError("Could not connect to bevy application to fetch registry data from the Bevy Remote Protocol using " + host + ":" + port + " :: " + str(e)) from e
+
+    # If the bevy remote protocol returns an error, report it to the user
+    schema_response = responses[method]
+    if "error" in schema_response:
+        # the app may have been swapped for one with different methods
+        forget_discovery(host, port)
+        raise BrpFetchError(BRP_ERROR_MESSAGE + schema_response["error"]["message"])
+
+    registry_hash = responses.get(BRP_REGISTRY_HASH_METHOD, {}).get("result")
+    return schema_response["result"], presets_result(presets, responses, debug), registry_hash
 
+def presets_result(presets, responses, debug=False):
+    """the presets from a set of BRP responses, or None"""
+    # even if presets is enabled, the request failing should be handled gracefully
+    # *any* error reporting makes users think skein is totally broken and doesn't work.
+    # which is not true; if this request fails, we've already done the critical work
+    # of fetching the registry above. The only downside to hiding this error is that its
+    # harder to debug if something is wrong (you have to turn on debug, launch Blender
+    # from the console, and view the output)
+    if not presets:
+        return None
+    if BRP_PRESETS_METHOD not in responses:
         if debug:
-            print("\nexecute: FetchRemoteTypeRegistry")
+            print("The Bevy application does not provide " + BRP_PRESETS_METHOD)
+        return None
+    if "error" in responses[BRP_PRESETS_METHOD]:
+        if debug:
+            print(BRP_ERROR_MESSAGE + responses[BRP_PRESETS_METHOD]["error"]["message"])
+        return None
+    return responses[BRP_PRESETS_METHOD]["result"]
+
+def embedded_registry_hash():
+    """the registry_hash stored with the embedded registry
+
+    None if there isn't one, if the text block was edited since
+    it was fetched, or if no registry was processed yet.
+    """
+    if not get_registry() or "skein-registry.json" not in bpy.data.texts:
+        return None
+    text = bpy.data.texts["skein-registry.json"]
+    if text.get(REGISTRY_TEXT_HASH_PROPERTY) != registry_text_hash(referenced_text(text, "registry")):
+        return None
+    return text.get(REGISTRY_HASH_PROPERTY)
+
+def write_text_block(name, text):
+    """write text to a text block in the .blend file, creating it if needed"""
+    if name in bpy.data.texts:
+        text_block = bpy.data.texts[name]
+        text_block.clear()
+    else:
+        text_block = bpy.data.texts.new(name)
+    text_block.write(text)
+    return text_block
 
-        brp_response = None
+def write_fetched_text(context, name, kind, data, storage):
+    """write fetched json to a text block, and to the shared registry store if there is one
 
+    Returns the text that was written.
+    """
+    text = encode_json(data, storage)
+
+    embed = True
+    directory = store_directory(context)
+    text_hash = None
+    if directory is not None:
+        embed = context.preferences.addons[__package__].preferences.embed_registry
         try:
-            rpc_response = brp_simple_request("rpc.discover", host, port)
-            print(rpc_response)
-            if rpc_response is not None and "error" in rpc_response:
-                if debug:
-                    print("bevy request errored out", rpc_response["error"])
-                self.report({"ERROR"}, "request for Bevy registry data returned an error, is the Bevy Remote Protocol Plugin added and is the Bevy app running? :: " + brp_response["error"]["message"])
-                return {'CANCELLED'}
-            bevy_version = rpc_response["result"]["info"]["version"]
-            print(bevy_version)
-            if bevy_version.startswith("0.16"):
-                brp_response = brp_simple_request("bevy/registry/schema", host, port)
-            elif bevy_version.startswith("0.17"):
-                brp_response = brp_simple_request("registry.schema", host, port)
-            else:
-                # assume anything else is a bevy version "from the future"
-                # and use the most recent version's endpoint
-                brp_response = brp_simple_request("registry.schema", host, port)
-        except:
-            # The 0.15 version of Bevy didn't have an `rpc.discover` endpoint, which 
-            # means failing the request could either be: a 0.15 application *or* being unable
-            # to connect. Try 0.15's endpoint first
-            try:
-                brp_response = brp_simple_request("bevy/registry/schema", host, port)
-            except:
-                self.report({"ERROR"}, "Could not connect to bevy application to fetch registry data from the Bevy Remote Protocol using " + host + ":" + port)
-                return {'CANCELLED'}
+            text_hash = store_text(directory, text)
+            update_head(directory, **{kind: text_hash})
+        except OSError as e:
+            print("skein: could not write to the registry store at " + directory, e)
+            directory = None
+            embed = True
 
-        # If the bevy remote protocol returns an error, report it to the user
-        if brp_response is not None and "error" in brp_response:
-            if debug:
-                print("bevy request errored out", brp_response["error"])
-            self.report({"ERROR"}, "request for Bevy registry data returned an error, is the Bevy Remote Protocol Plugin added and is the Bevy app running? :: " + brp_response["error"]["message"])
-            return {'CANCELLED'}
+    # without an embedded copy, the text block only holds a reference
+    # to the store (and an empty object if the store goes missing)
+    text_block = write_text_block(name, text if embed else encode_json({}, storage))
+    reference_store(text_block, directory, text_hash)
+    return text
 
+def apply_fetched_registry(context, registry, presets, registry_hash=None):
+    """store fetched registry (and presets) data in the .blend file and process it
+
+    A registry of None means the registry is unchanged, and only
+    presets are stored. This has to run on the main thread.
+    """
+    storage = STORAGE_PRETTY
+    if __package__ in context.preferences.addons:
+        storage = context.preferences.addons[__package__].preferences.registry_storage
+
+    if registry is not None:
         # write registry response to a file in .blend file
-        if "skein-registry.json" in bpy.data.texts:
-            embedded_registry = bpy.data.texts["skein-registry.json"]
-            embedded_registry.clear()
-            embedded_registry.write(json.dumps(brp_response["result"], indent=4))
-        else:
-            embedded_registry = bpy.data.texts.new("skein-registry.json")
-            embedded_registry.write(json.dumps(brp_response["result"], indent=4))
-
-        process_registry(context, brp_response["result"])
-        
-        # even if presets is enabled, the request failing should be handled gracefully
-        # *any* error reporting makes users think skein is totally broken and doesn't work.
-        # which is not true; if this request fails, we've already done the critical work
-        # of fetching the registry above. The only downside to hiding this error is that its
-        # harder to debug if something is wrong (you have to launch Blender from the console
-        # and view the output)
-        if presets:
-            try:
-                brp_response = brp_fetch_skein_presets(host, port)
-            except:
-                print("Could not connect to bevy application to fetch presets data from the Bevy Remote Protocol")
-                return {'FINISHED'}
-            
-            # If the bevy remote protocol returns an error, report it to the user
-            if brp_response is not None and "error" in brp_response:
-                print("request for Bevy registry data returned an error, is the Bevy Remote Protocol Plugin added and is the Bevy app running? :: " + brp_response["error"]["message"])
-                # self.report({"ERROR"}, "request for Bevy registry data returned an error, is the Bevy Remote Protocol Plugin added and is the Bevy app running? :: " + brp_response["error"]["message"])
-                return {'FINISHED'}
-
-            # write presets response to a file in .blend file
-            if "skein-presets.json" in bpy.data.texts:
-                embedded_presets = bpy.data.texts["skein-presets.json"]
-                embedded_presets.clear()
-                embedded_presets.write(json.dumps(brp_response["result"], indent=4))
-            else:
-                embedded_presets = bpy.data.texts.new("skein-presets.json")
-                embedded_presets.write(json.dumps(brp_response["result"], indent=4))
+        text = write_fetched_text(context, "skein-registry.json", "registry", registry, storage)
+        embedded_registry = bpy.data.texts["skein-registry.json"]
 
-        return {'FINISHED'}
+        # hash the text, which is what will be hashed
+        # when the registry is reloaded from the .blend file
+        text_hash = registry_text_hash(text)
+
+        # remember which remote registry this is, so the next fetch
+        # can skip downloading it if it didn't change
+        if registry_hash is not None:
+            embedded_registry[REGISTRY_HASH_PROPERTY] = registry_hash
+            embedded_registry[REGISTRY_TEXT_HASH_PROPERTY] = text_hash
+        elif REGISTRY_HASH_PROPERTY in embedded_registry:
+            del embedded_registry[REGISTRY_HASH_PROPERTY]
 
-def brp_simple_request(rpc_endpoint, host, port):
-    """Fetch the registry schema from a running Bevy application"""
+        process_registry(context, registry, text_hash)
 
-    # 0.16+ payload
-    data = {"jsonrpc": "2.0", "method": rpc_endpoint, "params": {}}
-    r = requests.post(host + ":" + str(port), json=data)
-    brp_response = r.json()
-    return brp_response
+    if presets is not None:
+        # write presets response to a file in .blend file
+        write_fetched_text(context, PRESETS_TEXT_NAME, "presets", presets, storage)
+        invalidate_presets()
 
-def brp_fetch_skein_presets(host, port):
-    """Fetch the presets (and Default values) from a running Bevy application"""
-    
-    data = {"jsonrpc": "2.0", "method": "skein/presets", "params": {}}
-    r = requests.post(host + ":" + str(port), json=data)
-    brp_response = r.json()
-    return brp_response
+def registry_schema_params(allow, deny):
+    """the `registry.schema` params that filter by crate
+
+    BRP filters by crate name, so module prefixes in the allow
+    list are widened to their crate (and filtered again when the
+    registry is processed). Module prefixes in the deny list
+    can't be sent at all.
+    """
+    params = {}
+    if allow:
+        params["with_crates"] = sorted({prefix.split("::")[0] for prefix in allow})
+    without_crates = whole_crates(deny)
+    if without_crates:
+        params["without_crates"] = without_crates
+    return params
 
 class ReloadSkeinRegistryJson(bpy.types.Operator):
     """Reload the registry information from skein-registry.json and re-process it"""
@@ -137,8 +394,11 @@ class ReloadSkeinRegistryJson(bpy.types.Operator):
     def execute(self, context):
         # if a skein-registry.json was already created, use it as the source of truth
         if "skein-registry.json" in bpy.data.texts:
-            embedded_registry = json.loads(bpy.data.texts["skein-registry.json"].as_string())
-            process_registry(context, embedded_registry)
+            # the text can come from the shared registry store, and
+            # can be readable, compact, or compressed json
+            text = referenced_text(bpy.data.texts["skein-registry.json"], "registry")
+            embedded_registry = decode_json(text)
+            process_registry(context, embedded_registry, registry_text_hash(text))
         else:
             # if we're trying to reload the registry file, and we haven't created one yet
             # insert an empty object, which in turn means that the file will be created and
@@ -153,81 +413,286 @@ class ReloadSkeinRegistryJson(bpy.types.Operator):
 
         return {'FINISHED'}
 
-def process_registry(context, registry):
+class ExpandSkeinRegistryJson(bpy.types.Operator):
+    """Rewrite compact or compressed skein-registry.json and skein-presets.json text blocks as readable json"""
+    bl_idname = "wm.expand_skein_registry" # unique identifier. not specially named
+    bl_label = "Expand Skein Registry Json" # Shows up in the UI
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return "skein-registry.json" in bpy.data.texts or PRESETS_TEXT_NAME in bpy.data.texts
+
+    # execute is called to run the operator
+    def execute(self, context):
+        for name, kind in [("skein-registry.json", "registry"), (PRESETS_TEXT_NAME, "presets")]:
+            if name not in bpy.data.texts:
+                continue
+            try:
+                data = decode_json(referenced_text(bpy.data.texts[name], kind))
+            except ValueError as e:
+                self.report({"ERROR"}, "could not read " + name + ": " + str(e))
+                return {'CANCELLED'}
+            # the registry is unchanged, so there's no need to re-process it.
+            # The next fetch writes it using the "Registry Storage" preference again.
+            write_text_block(name, encode_json(data, STORAGE_PRETTY))
+        invalidate_presets()
+
+        return {'FINISHED'}
+
+class MaterializeSkeinComponents(bpy.types.Operator):
+    """Build the PropertyGroups for components used in this file that have not been built yet"""
+    bl_idname = "wm.skein_materialize_components" # unique identifier. not specially named
+    bl_label = "Build Component Editors" # Shows up in the UI
+    bl_options = {'REGISTER'}
+
+    # execute is called to run the operator
+    def execute(self, context):
+        failed = materialize_components(context, component_type_paths_in_use())
+        if failed:
+            self.report({'WARNING'}, "Could not build: " + ", ".join(sorted(failed)))
+        return {'FINISHED'}
+
+def process_registry(context, registry, registry_hash=None):
     """
     registry is a dict
+    registry_hash is a hash of the skein-registry.json text the
+    registry was parsed from. If it is provided, compiled specs
+    are read from (and written to) the on-disk registry cache.
+
+    When the `incremental` preference is enabled and a registry has
+    already been processed in this session, only the PropertyGroups
+    whose schema (or the schema of anything they reference) changed
+    are unregistered and rebuilt. The ComponentContainer is only
+    rebuilt if the component fields it would hold changed.
     """
 
     debug = False
+    incremental = True
+    registry_cache = True
+    lazy = False
+    build_report = False
+    allow = []
+    deny = []
     if __package__ in context.preferences.addons:
-        debug = context.preferences.addons[__package__].preferences.debug
+        preferences = context.preferences.addons[__package__].preferences
+        debug = preferences.debug
+        incremental = preferences.incremental
+        registry_cache = preferences.registry_cache
+        lazy = preferences.lazy
+        build_report = preferences.build_report
+        allow = parse_prefixes(preferences.allow_prefixes)
+        deny = parse_prefixes(preferences.deny_prefixes)
 
     global_skein = context.window_manager.skein
     skein_property_groups = context.window_manager.skein_property_groups
+    skein_property_specs = context.window_manager.skein_property_specs
+    previous_fingerprints = context.window_manager.skein_type_fingerprints
 
-    global_skein.registry = json.dumps(registry)
+    report = RegistryBuildReport(registry_hash)
+    report.phase("load")
 
-    component_list = []
+    set_registry(registry)
+    build_type_names(registry.keys())
 
-    # Here's where we build up the PropertyGroup that
-    # represents the hypothetical variants that account
-    # for every possible component. These annotations
-    # gain a field for every component type_path
-    #
-    # this approach is required because Blender's implementation
-    # of Python and Properties *does not* include modern language
-    # features like ADTs (aka: enums that can carry data).
-    fake_component_enum_annotations = {
-        "name": bpy.props.StringProperty(name="Name", default="Unknown"),
-        "selected_type_path": bpy.props.StringProperty(name="Selected Type Path", default="Unknown"),
+    # A registry we've seen before was already compiled into specs,
+    # so we only need to replay the class registration.
+    # The allow and deny lists decide which types are compiled,
+    # so they're part of the key.
+    compiled = None
+    cache_key = None
+    if registry_cache and registry_hash is not None:
+        cache_key = compiled_registry_key(registry_hash, allow, deny)
+        compiled = load_compiled_registry(cache_key)
+        if debug:
+            print("compiled registry cache", "hit" if compiled else "miss", cache_key)
+
+    report.phase("analyze")
+    graph = build_dependency_graph(registry)
+
+    # fingerprints change whenever a type's schema, or the schema
+    # of anything it transitively references, changes.
+    if compiled is not None:
+        fingerprints = compiled["fingerprints"]
+    else:
+        fingerprints = type_fingerprints(registry, graph)
+
+    # Only Components end up as ComponentContainer fields, so
+    # the only types worth processing are the (allowed) Components
+    # and everything they reference. Resources, events, and
+    # unreferenced plain types are skipped.
+    used_type_paths = reachable(graph, [
+        type_path
+        for type_path in component_type_paths(registry)
+        if type_path_included(type_path, allow, deny)
+    ])
+    if debug:
+        print("processing", len(used_type_paths), "of", len(registry), "registry types")
+
+    previous_container = skein_property_groups.get("skein_internal_container")
+    incremental = incremental and previous_container is not None
+
+    # In lazy mode, only the components that are used in the open
+    # file (and the one currently selected for insertion) get
+    # PropertyGroups. Everything else is materialized when it is
+    # first inserted.
+    lazy_type_paths = None
+    if lazy:
+        if previous_container is None:
+            # skein_two has to exist to read which components are in use
+            previous_container = register_component_container({}, {})
+        lazy_type_paths = component_type_paths_in_use()
+        lazy_type_paths.add(context.window_manager.selected_component)
+        if debug:
+            print("lazy registry processing,", len(lazy_type_paths), "components in use")
+
+    # The fields of the ComponentContainer are a function of which
+    # types are Components, and what those types look like.
+    container_signature = {
+        type_path: fingerprints[type_path]
+        for type_path, value in registry.items()
+        if "reflectTypes" in value and "Component" in value["reflectTypes"]
+        and (lazy_type_paths is None or type_path in lazy_type_paths)
+        and type_path_included(type_path, allow, deny)
     }
 
-    # clear the list we use as a component type selector for the UI
-    # because we are about to re-fill it.
-    global_skein.components.clear()
-    # unregister all of the PropertyGroups that were created the
-    # last time we processed a registry schema
-    for type_path, property_group in skein_property_groups.items():
+    report.phase("unregister")
+    rebuild_container = not incremental or getattr(
+        previous_container,
+        "container_signature",
+        None
+    ) != container_signature
+
+    if rebuild_container and previous_container is not None:
+        # the container points at component PropertyGroups, so it
+        # has to go before any of them do
         try:
-            bpy.utils.unregister_class(property_group)
+            bpy.utils.unregister_class(previous_container)
         except:
-            # unregister_class is recursive and we re-use classes
-            # in many cases. So unregistering one class that uses 
-            # another causes that class to *already* be unregistered
-            # when we go to unregister it directly.
             pass
+        del skein_property_groups["skein_internal_container"]
+
+    if incremental:
+        # unregister only the PropertyGroups that are stale. Because
+        # fingerprints include transitive dependencies, anything that
+        # references a stale PropertyGroup is also stale.
+        stale = [
+            type_path
+            for type_path in skein_property_groups
+            if previous_fingerprints.get(type_path) != fingerprints.get(type_path)
+        ]
+        if debug:
+            print("incremental registry processing, rebuilding", len(stale), "of", len(skein_property_groups), "types")
+        for type_path in stale:
+            try:
+                bpy.utils.unregister_class(skein_property_groups[type_path])
+            except:
+                # scalar properties are stored here too, and those
+                # are not classes that can be unregistered
+                pass
+            del skein_property_groups[type_path]
+        for type_path in [
+            type_path
+            for type_path in skein_property_specs
+            if previous_fingerprints.get(type_path) != fingerprints.get(type_path)
+        ]:
+            del skein_property_specs[type_path]
+    else:
+        # unregister all of the PropertyGroups that were created the
+        # last time we processed a registry schema
+        for type_path, property_group in skein_property_groups.items():
+            try:
+                bpy.utils.unregister_class(property_group)
+            except:
+                # unregister_class is recursive and we re-use classes
+                # in many cases. So unregistering one class that uses 
+                # another causes that class to *already* be unregistered
+                # when we go to unregister it directly.
+                pass
+
+        # Clear the list that held the PropertyGroups because we are about
+        # to re-fill it.
+        skein_property_groups.clear()
+        skein_property_specs.clear()
+
+    previous_fingerprints.clear()
+    previous_fingerprints.update(fingerprints)
+
+    # results holds the spec compile_property returned for each
+    # type_path that compiled (None for unsupported types), and
+    # failures holds the reason every other type_path failed.
+    if compiled is not None:
+        skein_property_specs.clear()
+        skein_property_specs.update(compiled["specs"])
+        results = compiled["results"]
+        failures = compiled["failures"]
+    else:
+        results = {}
+        failures = {}
+
+    # Specs that survived an incremental update (or came from the
+    # on-disk cache) are not compiled again.
+    report.phase("compile")
+    compile_times = {}
+    compile_registry(
+        skein_property_specs,
+        registry,
+        [type_path for type_path in registry if type_path in used_type_paths],
+        results,
+        failures,
+        compile_times
+    )
+    if debug:
+        for type_path, reason in failures.items():
+            print("failed to compile", type_path, "::", reason)
+
+    # exports serialize components with functions built from
+    # these specs, see serializers.py
+    set_serializer_specs(skein_property_specs)
+    # exported data cached with the old PropertyGroups is out of date
+    clear_component_cache()
+
+    report.phase("register")
+    classes_before = sum(inspect.isclass(value) for value in skein_property_groups.values())
+    component_list = []
 
-    # Clear the list that held the PropertyGroups because we are about
-    # to re-fill it.
-    skein_property_groups.clear()
+    # the ComponentContainer fields for each component, keyed
+    # by field_name(type_path). See register_component_container
+    component_fields = {}
 
     # for each user-defined type, make a PropertyGroup that represents
     # that type. These will be used to build out user-accessible forms
-    # allowing users to edit their structured data
+    # allowing users to edit their structured data.
+    #
+    # PropertyGroups that survived an incremental update are not
+    # registered again.
     for type_path, value in registry.items():
-        # TODO: for debugging purposes, it can be useful to filter
-        # the schema being processed without modifying the schema 
-        # file. Only types that pass this test will be processed.
-        # This should become an addon preference to allow users
-        # to gain information should they want to
-        #
-        # if "avian3d" not in type_path:
-        #     continue
+        # the allow and deny lists only decide which Components
+        # are processed. Types that those Components reference
+        # are still compiled and materialized.
+        if type_path not in used_type_paths:
+            continue
+        if type_path not in results:
+            # failed to compile, see failures
+            continue
+        is_component = "reflectTypes" in value and "Component" in value["reflectTypes"]
         try:
-            property_group_or_property = make_property(
-                skein_property_groups,
-                registry,
-                type_path
-            )
-            if "reflectTypes" in value and "Component" in value["reflectTypes"]:
-                component = global_skein.components.add()
-                component.name = type_path
-                component.value = type_path
-                component.type_path = type_path
-                component.short_path = value["shortPath"]
-
+            if is_component:
                 component_list.append((type_path, value["shortPath"], type_path))
 
+            if lazy_type_paths is not None and type_path not in container_signature:
+                # lazy mode: components are materialized on first use,
+                # and other types are materialized as components
+                # that reference them are.
+                continue
+
+            property_group_or_property = materialize_entry(
+                skein_property_groups,
+                skein_property_specs,
+                type_path,
+                results[type_path]
+            )
+            if is_component:
                 # hash type_paths that are longer than 63 characters because they
                 # will make the type class registration fail:
                 # TypeError: 'bevy_render::camera::manual_texture_view::ManualTextureViewHandle' too long, max length is 63
@@ -235,24 +700,112 @@ def process_registry(context, registry):
                 # We try to only do it for type_paths that exceed
                 # the limit, because the hash shows up in error messages, reducing readability
                 # and debuggability... or blender's python implementation could allows key lengths...
-                maybe_hashed_type_path = hash_over_64(type_path)
-                if inspect.get_annotations(property_group_or_property):
-                    fake_component_enum_annotations[maybe_hashed_type_path] = bpy.props.PointerProperty(
-                        type=property_group_or_property,
-                        override={"LIBRARY_OVERRIDABLE"},
-                    )
-                else:
-                    fake_component_enum_annotations[maybe_hashed_type_path] = property_group_or_property
-
+                maybe_hashed_type_path = field_name(type_path)
+                component_fields[maybe_hashed_type_path] = component_field(property_group_or_property)
 
         except Exception as e:
             if debug:
-                print("failed to make_property for: ", type_path)
+                print("failed to materialize: ", type_path)
                 print(repr(e))
-    
+
+    classes_registered = sum(inspect.isclass(value) for value in skein_property_groups.values()) - classes_before
+
+    report.phase("cache")
+    if compiled is None and cache_key is not None:
+        store_compiled_registry(
+            cache_key,
+            skein_property_specs,
+            results,
+            failures,
+            fingerprints
+        )
+
+    # the list we use as a component type selector for the UI
+    # only needs to be re-filled if the set of components changed,
+    # or if it was emptied (for example, by a new WindowManager)
+    report.phase("container")
+    build_component_index((type_path, short_path) for type_path, short_path, _ in component_list)
+    if rebuild_container or len(global_skein.components) != len(component_list):
+        global_skein.components.clear()
+        for type_path, short_path, _ in component_list:
+            component = global_skein.components.add()
+            component.name = type_path
+            component.value = type_path
+            component.type_path = type_path
+            component.short_path = short_path
+
+    if rebuild_container:
+        register_component_container(component_fields, container_signature)
+        classes_registered += 1
+    elif debug:
+        print("component fields are unchanged, keeping the existing ComponentContainer")
+
+    # upgrade component data stored by older versions of skein
+    # before anything reads it through the new PropertyGroups
+    report.phase("migrate")
+    migrated = migrate_component_data(skein_property_specs)
+    if migrated and debug:
+        print("migrated", migrated, "component values")
+
+    report.finish(
+        registry,
+        compile_times,
+        failures,
+        registry_types=len(registry),
+        processed_types=len(used_type_paths),
+        components=len(component_list),
+        component_fields=len(component_fields),
+        classes_registered=classes_registered,
+        cache_hit=compiled is not None,
+        incremental=incremental,
+        lazy=lazy,
+    )
+    if build_report:
+        write_build_report(report)
+    if debug:
+        print(report.to_text())
+
+def component_field(property_group_or_property):
+    """the ComponentContainer field for a component's PropertyGroup or property"""
+    if inspect.get_annotations(property_group_or_property):
+        return bpy.props.PointerProperty(
+            type=property_group_or_property,
+            override={"LIBRARY_OVERRIDABLE"},
+        )
+    else:
+        return property_group_or_property
+
+def register_component_container(component_fields, container_signature):
+    """build, register, and attach the ComponentContainer
+
+    @param: component_fields ComponentContainer fields keyed by field_name(type_path)
+    @param: container_signature the fingerprint of each component type_path that has a field
+    """
+    skein_property_groups = bpy.context.window_manager.skein_property_groups
+
+    # Here's where we build up the PropertyGroup that
+    # represents the hypothetical variants that account
+    # for every possible component. These annotations
+    # gain a field for every component type_path
+    #
+    # this approach is required because Blender's implementation
+    # of Python and Properties *does not* include modern language
+    # features like ADTs (aka: enums that can carry data).
+    fake_component_enum_annotations = {
+        "name": bpy.props.StringProperty(name="Name", default="Unknown"),
+        "selected_type_path": bpy.props.StringProperty(name="Selected Type Path", default="Unknown"),
+        **component_fields,
+    }
+
     # Create the type we'll use as every component
     component_container = type("ComponentContainer", (bpy.types.PropertyGroup,), {
         '__annotations__': fake_component_enum_annotations,
+        # kept so that lazily materialized components can be
+        # added to a rebuilt container later
+        'component_fields': component_fields,
+        # used to decide whether the container has to be rebuilt
+        # the next time a registry is processed
+        'container_signature': container_signature,
     })
 
     # adding the container to the `skein_property_groups` list
@@ -295,3 +848,91 @@ def process_registry(context, registry):
         type=component_container,
         override={"LIBRARY_OVERRIDABLE"},
     )
+
+    return component_container
+
+def component_type_paths_in_use():
+    """every component type_path stored on any skein_two collection in the open file"""
+    in_use = set()
+    try:
+        for collection in (
+            bpy.data.objects,
+            bpy.data.meshes,
+            bpy.data.materials,
+            bpy.data.scenes,
+            bpy.data.cameras,
+            bpy.data.lights,
+            bpy.data.collections,
+        ):
+            for id in collection:
+                for component in id.skein_two:
+                    in_use.add(component.selected_type_path)
+        for armature in bpy.data.armatures:
+            for bone in armature.bones:
+                for component in bone.skein_two:
+                    in_use.add(component.selected_type_path)
+    except AttributeError:
+        # skein_two doesn't exist until a ComponentContainer
+        # has been registered
+        pass
+    return in_use
+
+def materialize_components(context, type_paths):
+    """build PropertyGroups for components that lazy processing skipped
+
+    The ComponentContainer is rebuilt (once) if any of the
+    type_paths did not have a field yet. Returns the set of
+    type_paths that could not be materialized.
+    """
+    debug = False
+    if __package__ in context.preferences.addons:
+        debug = context.preferences.addons[__package__].preferences.debug
+
+    skein_property_groups = context.window_manager.skein_property_groups
+    skein_property_specs = context.window_manager.skein_property_specs
+    fingerprints = context.window_manager.skein_type_fingerprints
+    container = skein_property_groups.get("skein_internal_container")
+    if container is None:
+        return set(type_paths)
+
+    missing = [
+        type_path
+        for type_path in type_paths
+        if type_path not in container.container_signature
+    ]
+    if not missing:
+        return set()
+
+    registry = get_registry()
+
+    component_fields = dict(container.component_fields)
+    container_signature = dict(container.container_signature)
+    failed = set()
+    for type_path in missing:
+        if type_path not in registry:
+            failed.add(type_path)
+            continue
+        try:
+            spec = compile_property(skein_property_specs, registry, type_path)
+            property_group_or_property = materialize_entry(
+                skein_property_groups,
+                skein_property_specs,
+                type_path,
+                spec
+            )
+            component_fields[field_name(type_path)] = component_field(property_group_or_property)
+            container_signature[type_path] = fingerprints.get(type_path)
+        except Exception as e:
+            if debug:
+                print("skein: failed to materialize component", type_path, repr(e))
+            failed.add(type_path)
+
+    if len(container_signature) != len(container.container_signature):
+        try:
+            bpy.utils.unregister_class(container)
+        except:
+            pass
+        register_component_container(component_fields, container_signature)
+
+    return failed
+
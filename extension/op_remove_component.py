@@ -1,5 +1,7 @@
 import bpy
 
+from .export_cache import mark_dirty
+
 class RemoveComponentOnObject(bpy.types.Operator):
     """Remove a component on the selected object"""
     bl_idname = "object.remove_component" # unique identifier. first word is required by extensions review team to be from a specific set of words
@@ -106,6 +108,8 @@ def remove_component_data(context, obj):
     """
 
     obj.skein_two.remove(obj.active_component_index)
+    # exported data cached for obj is out of date
+    mark_dirty(obj)
 
     # because bpy.types.Object.active_component_index has a min=0
     # this will never be negative
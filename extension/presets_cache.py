@@ -0,0 +1,81 @@
+import hashlib
+import time
+import bpy # type: ignore
+
+from .registry_store import referenced_text
+from .registry_text import decode_json
+
+# --------------------------------- #
+#  The parsed skein-presets.json    #
+#  text block, with an index of     #
+#  preset names per type_path       #
+# --------------------------------- #
+#
+# The presets popover draws constantly, so the text block is only
+# re-parsed when its content hash changes. The hash itself is only
+# re-checked every REVALIDATE_SECONDS (or right away if the text
+# block was replaced), since users can edit the text block by hand.
+
+PRESETS_TEXT_NAME = "skein-presets.json"
+REVALIDATE_SECONDS = 1.0
+
+_presets = {}
+_preset_names = {}
+_content_hash = None
+_text_pointer = None
+_checked_at = 0.0
+
+def invalidate_presets():
+    """force the next lookup to check the text block. Call after writing to it"""
+    global _checked_at
+    _checked_at = 0.0
+
+def _revalidate():
+    global _presets, _preset_names, _content_hash, _text_pointer, _checked_at
+
+    text = bpy.data.texts.get(PRESETS_TEXT_NAME)
+    if text is None:
+        _presets = {}
+        _preset_names = {}
+        _content_hash = None
+        _text_pointer = None
+        return
+
+    now = time.monotonic()
+    pointer = text.as_pointer()
+    if pointer == _text_pointer and now - _checked_at < REVALIDATE_SECONDS:
+        return
+    _text_pointer = pointer
+    _checked_at = now
+
+    # presets can come from the shared registry store
+    content = referenced_text(text, "presets")
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    if content_hash == _content_hash:
+        return
+    _content_hash = content_hash
+
+    try:
+        _presets = decode_json(content)
+    except ValueError as e:
+        print("skein: could not parse " + PRESETS_TEXT_NAME, e)
+        _presets = {}
+    _preset_names = {
+        type_path: tuple(presets.keys())
+        for type_path, presets in _presets.items()
+        if isinstance(presets, dict)
+    }
+
+def get_presets():
+    """all presets, keyed by type_path and then by preset name. Do not mutate"""
+    _revalidate()
+    return _presets
+
+def get_preset(type_path, preset_id):
+    """the value of a single preset, or None"""
+    return get_presets().get(type_path, {}).get(preset_id)
+
+def preset_names(type_path):
+    """the names of the presets for a type_path (empty if it has none)"""
+    _revalidate()
+    return _preset_names.get(type_path, ())
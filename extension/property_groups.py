@@ -1,56 +1,204 @@
-import base64
-import hashlib
 import bpy # type: ignore
-import re
 import inspect
+import time
+
+from .collection_values import ENTRIES_FIELD, KEY_FIELD, KEY_PROPERTIES, VALUE_FIELD
+from .glam_types import GLAM_PROPERTIES
+from .registry_graph import REF_PREFIX, array_length, compile_refs, item_type_path, strongly_connected_components
+# re-exported, these used to be defined here
+from .type_names import capitalize_path, class_name, hash_over_64, hash_type_path
 
 # the class we use to create PropertyGroups dynamically
 class ComponentData(bpy.types.PropertyGroup):
     type_path: bpy.props.StringProperty(name="type_path", default="Unknown") # type: ignore
     name: bpy.props.StringProperty(name="Name", default="Unknown") # type: ignore
 
-# capitalize a word without lowercasing the result
-# of the word. This means TeamMember stays and doesn't
-# turn into Teammember
-def cap(val):
-  return val[0].upper() + val[1:]
-
-def capitalize_path(s):
-    return "".join(map(cap, re.split('[:_]+', s)))
-
-# PropertyGroup classes can't be more than 64 characters,
-# so try to squeeze under the limit by hashing the capitalized
-# paths.
-def hash_type_path(data):
-    m = hashlib.md5(data.encode('ascii'))
-    base64_bytes = base64.b16encode(m.digest())
-    output = base64_bytes.decode("ascii")
-    return "SKEIN_" + output
-
-# hash a type_path if its length is over 63, which can 
-# cause classes to fail to register
-# TODO: could this be a getter on ComponentContainer?
-def hash_over_64(type_path):
-    maybe_hashed_type_path = type_path
-    if len(type_path) > 63:
-        maybe_hashed_type_path = hash_type_path(type_path)
-    
-    return maybe_hashed_type_path
+# Bump this whenever the output of compile_property changes shape
+# so that compiled registries cached on disk are not re-used.
+SPEC_VERSION = 5
+
+class CompileError(Exception):
+    """a type_path that failed to compile was referenced by another type"""
 
 def make_property(
         skein_property_groups,
         registry,
         original_type_path,
-        override_component=None
+        override_component=None,
+        specs=None,
 ):
     """build a subclass of ComponentData or return a "scalar" property
     The subclass is a PropertyGroup that we can build up when we fetch the registry,
     The UI to editor a type is built from these PropertyGroup classes
 
+    This is compile_property followed by materialize_property.
+
     @param: skein_property_groups All of the property groups constructed so far. Will mutate this to add more property groups.
     @param: registry dict representation of the Bevy registry information
     @param: original_type_path Either a full type_path (`component_tests::SomeThings::OneThing`) or a type_path with `#/#defs/alloc` on the front
     @param: override_component An optional value that is used when you have access to the registry type information but that registry type information is not directly accessible by registry[type_path]. This happens in complex enums. (default None)
+    @param: specs All of the specs compiled so far. Will mutate this to add more specs. (default None, which uses a fresh dict)
+    """
+    if specs is None:
+        specs = {}
+
+    spec = compile_property(
+        specs,
+        registry,
+        original_type_path,
+        override_component
+    )
+    return materialize_entry(
+        skein_property_groups,
+        specs,
+        original_type_path.removeprefix("#/$defs/"),
+        spec
+    )
+
+# --------------------------------- #
+#  Specs                            #
+# --------------------------------- #
+#
+# compile_property turns the registry schema for a type into a
+# "spec": plain dicts/lists/strings that describe the property or
+# PropertyGroup to build, without touching bpy. This means specs
+# can be cached on disk and replayed by materialize_property.
+#
+# There are three kinds of spec:
+#
+# - {"kind": "property", "property": "IntProperty", "options": {"min": 0}}
+#   a "scalar" bpy.props property. glam types are vector properties
+#   and also have a "glam" key holding their type_path.
+# - {"kind": "group", "type_path": "bevy_transform::components::transform::Transform"}
+#   a reference to the PropertyGroup stored in specs[type_path]
+# - {"kind": "class", "class_name": "SKEIN_...", "annotations": {...}, "markers": {...}}
+#   a PropertyGroup. annotations values are specs (or None if the field
+#   could not be built), markers are class attributes like `type_override`.
+# - {"kind": "collection", "type_path": "alloc::vec::Vec<f32>::SkeinItem"}
+#   a CollectionProperty of the PropertyGroup stored in specs[type_path]
+#
+# specs is keyed by type_path and holds "class" specs, as well as the
+# specs of types that are aliases of other types (like single element
+# TupleStructs), string Enums, and Arrays/tuples that are vectors.
+#
+# Tuples, TupleStructs, and Arrays serialize as json arrays. Their
+# "class" specs have a `positional` marker and fields named "0", "1", ...
+#
+# Lists, Sets, and Maps have a `collection` marker and an `entries`
+# collection field. The PropertyGroup for each entry is stored in
+# specs under item_type_path(type_path), see collection_values.py
+
+def property_spec(property, **options):
+    """a scalar bpy.props property"""
+    return {
+        "kind": "property",
+        "property": property,
+        "options": options,
+    }
+
+def class_spec(class_name, annotations, **markers):
+    """a PropertyGroup, which will subclass ComponentData"""
+    return {
+        "kind": "class",
+        "class_name": class_name,
+        "annotations": annotations,
+        "markers": markers,
+    }
+
+def spec_reference(specs, type_path):
+    """what a field referencing a type_path that is in specs should hold"""
+    spec = specs[type_path]
+    if spec is not None and spec["kind"] == "class":
+        return {"kind": "group", "type_path": type_path}
+    return spec
+
+def compile_registry(specs, registry, type_paths, results, failures, compile_times=None):
+    """compile type_paths, and everything they reference, in dependency order
+
+    Every type is compiled after the types it references, so
+    compile_property never has to recurse more than one level
+    into a `$ref`. Types that take part in a reference cycle
+    can't be built as PropertyGroups and fail explicitly, unless
+    the cycle goes through the entries of a List, Set, or Map.
+
+    @param: specs All of the specs compiled so far. Will mutate this to add more specs.
+    @param: registry dict representation of the Bevy registry information
+    @param: type_paths the type_paths to compile
+    @param: results the spec compile_property returned for each type_path. Will mutate this to add more results.
+    @param: failures why each type_path that could not be compiled failed. Will mutate this to add more failures.
+    @param: compile_times if provided, the seconds spent compiling each type_path are stored here (default None)
+    """
+    graph = {}
+    stack = list(type_paths)
+    while stack:
+        type_path = stack.pop()
+        if type_path in graph or type_path in failures:
+            continue
+        if type_path not in registry:
+            failures[type_path] = "not in the registry"
+            continue
+        graph[type_path] = compile_refs(registry[type_path])
+        stack.extend(graph[type_path])
+
+    for component in strongly_connected_components(graph):
+        ordered = component
+        if len(component) > 1 or component[0] in graph[component[0]]:
+            # A cycle that goes through a collection's entries can be
+            # compiled, leaving the collection that closes the cycle
+            # uneditable. Any other cycle can't be built.
+            members = set(component)
+            without_collections = {
+                type_path: compile_refs(registry[type_path], collections=False) & members
+                for type_path in component
+            }
+            inner = strongly_connected_components(without_collections)
+            if any(len(group) > 1 or group[0] in without_collections[group[0]] for group in inner):
+                reason = "reference cycle between " + ", ".join(sorted(component))
+                for type_path in component:
+                    failures[type_path] = reason
+                continue
+            ordered = [group[0] for group in inner]
+
+        for type_path in ordered:
+            if type_path in results or type_path in failures:
+                continue
+            started = time.perf_counter()
+            try:
+                results[type_path] = compile_property(
+                    specs,
+                    registry,
+                    type_path,
+                    results=results,
+                    failures=failures,
+                )
+            except Exception as e:
+                failures[type_path] = repr(e)
+            if compile_times is not None:
+                compile_times[type_path] = time.perf_counter() - started
+
+def unsupported(failures, type_path, reason, debug):
+    """record why compile_property could not build a type_path"""
+    if debug:
+        print(reason + ": ", type_path)
+    if failures is not None:
+        failures[type_path] = reason
+
+def compile_property(
+        specs,
+        registry,
+        original_type_path,
+        override_component=None,
+        results=None,
+        failures=None,
+):
+    """build the spec for a type_path
+
+    @param: specs All of the specs compiled so far. Will mutate this to add more specs.
+    @param: registry dict representation of the Bevy registry information
+    @param: original_type_path Either a full type_path (`component_tests::SomeThings::OneThing`) or a type_path with `#/#defs/alloc` on the front
+    @param: override_component An optional value that is used when you have access to the registry type information but that registry type information is not directly accessible by registry[type_path]. This happens in complex enums. (default None)
+    @param: results The results of compiling other type_paths, see compile_registry (default None)
+    @param: failures The failures of compiling other type_paths, see compile_registry (default None)
     """
 
     debug = False
@@ -58,19 +206,35 @@ def make_property(
         debug = bpy.context.preferences.addons[__package__].preferences.debug
 
     type_path = original_type_path.removeprefix("#/$defs/")
-    component = override_component if override_component != None else registry[type_path]
-
-    if debug:
-        print(type_path)
 
-    if type_path in skein_property_groups:
-        # The type was already constructed and can be 
+    if type_path in specs:
+        # The type was already compiled and can be 
         # returned from the "cache" instead of being
-        # created again
-        return skein_property_groups[type_path]
+        # compiled again
+        return spec_reference(specs, type_path)
+
+    if override_component is None:
+        if results is not None and type_path in results:
+            # scalar properties (and unsupported types) are
+            # not in specs, but are cached in results
+            return results[type_path]
+        if failures is not None and type_path in failures:
+            # failing to compile a referenced type fails
+            # the type that references it
+            raise CompileError(type_path + ": " + failures[type_path])
+
+    if type_path in GLAM_PROPERTIES:
+        # glam types serialize as flat arrays, so they are built
+        # as vector properties instead of nested PropertyGroups
+        property, options = GLAM_PROPERTIES[type_path]
+        spec = property_spec(property, **options)
+        spec["glam"] = type_path
+        return spec
+
+    component = override_component if override_component != None else registry[type_path]
 
     if debug:
-        print("\nmake_property::", type_path)
+        print("\ncompile_property::", type_path)
 
     if debug:
         print(component)
@@ -81,9 +245,18 @@ def make_property(
     match component["kind"]:
         # Array is fixed-size arrays
         case "Array":
-            if debug:
-                print("Array is unimplemented in make_property: ", type_path)
-            return
+            length = array_length(component)
+            if length is None:
+                return unsupported(failures, type_path, "Array without a known length", debug)
+            return compile_items(
+                specs,
+                registry,
+                type_path,
+                [component["items"]["type"]["$ref"]] * length,
+                results,
+                failures,
+                debug,
+            )
         case "Enum":
             if debug:
                 print("Enum: ", component["type"])
@@ -91,34 +264,34 @@ def make_property(
                 case "string":
                     items = []
                     for item in component["oneOf"]:
-                        items.append((item, item, ""))
+                        items.append([item, item, ""])
 
                     if debug:
                         print(items)
 
                     # TODO: make an enum default value
-                    skein_property_groups[type_path] = bpy.props.EnumProperty(
+                    specs[type_path] = property_spec(
+                        "EnumProperty",
                         items=items,
-                        override={"LIBRARY_OVERRIDABLE"},
                     )
 
-                    return skein_property_groups[type_path]
+                    return specs[type_path]
                 case "object":
                     annotations = {}
                     items = []
 
                     # Take the shortPath as the dropdown ui option
                     for item in component["oneOf"]:
-                        items.append((item["shortPath"], item["shortPath"], ""))
+                        items.append([item["shortPath"], item["shortPath"], ""])
 
                     if debug:
                         print(items)
 
                     # TODO: set default for skein_enum_index?
-                    annotations["skein_enum_index"] = bpy.props.EnumProperty(
+                    annotations["skein_enum_index"] = property_spec(
+                        "EnumProperty",
                         name="variant",
                         items=items,
-                        override={"LIBRARY_OVERRIDABLE"},
                     )
 
                     for option in component["oneOf"]:
@@ -133,83 +306,72 @@ def make_property(
                             # select it, but there's no value to edit
                             pass
                         else:
-                            property = make_property(
-                                skein_property_groups,
+                            annotations[key] = compile_property(
+                                specs,
                                 registry,
                                 option["typePath"],
-                                option
+                                option,
+                                results,
+                                failures,
                             )
-                            if inspect.isclass(property):
-                                annotations[key] = bpy.props.PointerProperty(
-                                    type=property,
-                                    override={"LIBRARY_OVERRIDABLE"},
-                                )
-                            else:
-                                annotations[key] = property
 
                     if "core::option::Option<" in type_path and component["modulePath"] == "core::option" and "Option<" in component["shortPath"]:
-                        # add this struct type to the skein_property_groups so it 
+                        # add this struct type to the specs so it 
                         # can be accessed elsewhere by type_path
-                        skein_property_groups[type_path] = type(hash_type_path(capitalize_path(type_path)), (ComponentData,), {
-                            '__annotations__': annotations,
-                            "is_core_option": True
-                        })
+                        specs[type_path] = class_spec(
+                            class_name(type_path),
+                            annotations,
+                            is_core_option=True,
+                        )
                     else:
-                        # add this struct type to the skein_property_groups so it 
+                        # add this struct type to the specs so it 
                         # can be accessed elsewhere by type_path
-                        skein_property_groups[type_path] = type(hash_type_path(capitalize_path(type_path)), (ComponentData,), {
-                            '__annotations__': annotations,
-                        })
-
-                    # registering the class is required for certain Blender
-                    # functionality to work.
-                    if debug:
-                        print("REGISTERING: " + type_path)
-                    bpy.utils.register_class(
-                        skein_property_groups[type_path]
-                    )
+                        specs[type_path] = class_spec(
+                            class_name(type_path),
+                            annotations,
+                        )
 
-                    # return the type we just constructed
-                    return skein_property_groups[type_path]
+                    # return a reference to the type we just compiled
+                    return spec_reference(specs, type_path)
                 case _:
-                    if debug:
-                        print("unknown Enum type: ", component["type"], "\n  ", type_path)
-                    return
+                    return unsupported(failures, type_path, "unknown Enum type " + component["type"], debug)
         case "List":
-            # Vecs/Lists are not well handled yet
-            skein_property_groups[type_path] = type(hash_type_path(capitalize_path(type_path)), (ComponentData,), {
-                '__annotations__': {},
-                # force_default bypasses recursion and forces
-                # an empty data structure in the output
-                "force_default": "list"
-            })
-            bpy.utils.register_class(
-                skein_property_groups[type_path]
+            return compile_collection(
+                specs,
+                registry,
+                type_path,
+                "list",
+                {VALUE_FIELD: component["items"]["type"]["$ref"]},
+                results,
+                failures,
+                debug,
             )
-            return skein_property_groups[type_path]
         case "Map":
-            skein_property_groups[type_path] = type(hash_type_path(capitalize_path(type_path)), (ComponentData,), {
-                '__annotations__': {},
-                # force_default bypasses recursion and forces
-                # an empty data structure in the output
-                "force_default": "object"
-            })
-            bpy.utils.register_class(
-                skein_property_groups[type_path]
+            return compile_collection(
+                specs,
+                registry,
+                type_path,
+                "map",
+                {
+                    KEY_FIELD: component["keyType"]["type"]["$ref"],
+                    VALUE_FIELD: component["valueType"]["type"]["$ref"],
+                },
+                results,
+                failures,
+                debug,
             )
-            return skein_property_groups[type_path]
         case "Set":
-            # Handle Sets in the same way as Vecs/Lists
-            skein_property_groups[type_path] = type(hash_type_path(capitalize_path(type_path)), (ComponentData,), {
-                '__annotations__': {},
-                # force_default bypasses recursion and forces
-                # an empty data structure in the output
-                "force_default": "list"
-            })
-            bpy.utils.register_class(
-                skein_property_groups[type_path]
+            # Sets serialize as json arrays, same as Vecs/Lists
+            return compile_collection(
+                specs,
+                registry,
+                type_path,
+                "set",
+                {VALUE_FIELD: component["items"]["type"]["$ref"]},
+                results,
+                failures,
+                debug,
             )
-            return skein_property_groups[type_path]
         case "Struct":
             annotations = {}
             # only recurse if we have properties to set, otherwise
@@ -218,49 +380,44 @@ def make_property(
                 for key in component["properties"]:
                     if debug:
                         print("- key: ", key)
-                    property = make_property(
-                        skein_property_groups,
+                    annotations[key] = compile_property(
+                        specs,
                         registry,
-                        component["properties"][key]["type"]["$ref"]
+                        component["properties"][key]["type"]["$ref"],
+                        results=results,
+                        failures=failures,
                     )
-                    if inspect.isclass(property):
-                        annotations[key] = bpy.props.PointerProperty(
-                            type=property,
-                            override={"LIBRARY_OVERRIDABLE"},
-                        )
-                    else:
-                        annotations[key] = property
 
-            # add this struct type to the skein_property_groups so it 
+            # add this struct type to the specs so it 
             # can be accessed elsewhere by type_path
-            t = hash_type_path(capitalize_path(type_path))
-            skein_property_groups[type_path] = type(t, (ComponentData,), {
-                '__annotations__': annotations,
-                'type_override': type_path
-            })
-
-            # registering the class is required for certain Blender
-            # functionality to work.
-            if debug:
-                print("REGISTERING: " + type_path)
-            bpy.utils.register_class(
-                skein_property_groups[type_path]
+            specs[type_path] = class_spec(
+                class_name(type_path),
+                annotations,
+                type_override=type_path,
             )
 
-            # return the type we just constructed
-            return skein_property_groups[type_path]
+            # return a reference to the type we just compiled
+            return spec_reference(specs, type_path)
         case "Tuple":
             if len(component["prefixItems"]) == 1:
-                skein_property_groups[type_path] = make_property(
-                    skein_property_groups,
+                specs[type_path] = compile_property(
+                    specs,
                     registry,
-                    component["prefixItems"][0]["type"]["$ref"]
+                    component["prefixItems"][0]["type"]["$ref"],
+                    results=results,
+                    failures=failures,
                 )
-                return skein_property_groups[type_path]
+                return specs[type_path]
             else:
-                if debug:
-                    print("Tuple is unimplemented in make_property for lengths longer than 1 element: ", type_path)
-                return
+                return compile_items(
+                    specs,
+                    registry,
+                    type_path,
+                    [item["type"]["$ref"] for item in component["prefixItems"]],
+                    results,
+                    failures,
+                    debug,
+                )
         case "TupleStruct":
             # single element tuple struct is a special case
             # because the reflection format treats it as a
@@ -269,250 +426,345 @@ def make_property(
             # { "skein::tests::TupleStruct": 12 }
             # ```
             if len(component["prefixItems"]) == 1:
-                skein_property_groups[type_path] = make_property(
-                    skein_property_groups,
+                specs[type_path] = compile_property(
+                    specs,
                     registry,
-                    component["prefixItems"][0]["type"]["$ref"]
+                    component["prefixItems"][0]["type"]["$ref"],
+                    results=results,
+                    failures=failures,
                 )
-                return skein_property_groups[type_path]
+                return specs[type_path]
             else:
-                if debug:
-                    print("TupleStruct is unimplemented in make_property for lengths longer than 1 element: ", type_path)
-                return
+                return compile_items(
+                    specs,
+                    registry,
+                    type_path,
+                    [item["type"]["$ref"] for item in component["prefixItems"]],
+                    results,
+                    failures,
+                    debug,
+                )
         case "Value":
             # print("- component[type]:  ", component["type"])
             match component["type"]:
                 case "boolean":
-                    return bpy.props.BoolProperty(
-                        override={"LIBRARY_OVERRIDABLE"}
-                    )
+                    return property_spec("BoolProperty")
                 case "uint":
                     match type_path:
                         case "u8":
-                            return bpy.props.IntProperty(
-                                min=0,
-                                max=255,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=0, max=255)
                         case "u16":
-                            return bpy.props.IntProperty(
-                                min=0,
-                                max=65535,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
-                        case "u32":
-                            return bpy.props.IntProperty(
-                                min=0,
-                                # blender actually sets the default hard maximum to
-                                # 2^31, not 2^32, so not sure if we can even set
-                                # those numbers from inside blender
-                                # max=4294967295,
-                                override={"LIBRARY_OVERRIDABLE"},
-                        )
-                        case "u64":
-                            return bpy.props.IntProperty(
-                                min=0,
-                                # blender actually sets the default hard maximum to
-                                # 2^31, not 2^32, so not sure if we can even set
-                                # those numbers from inside blender
-                                # max=4294967295,
-                                override={"LIBRARY_OVERRIDABLE"},
-                        )
+                            return property_spec("IntProperty", min=0, max=65535)
+                        case "u32" | "u64" | "usize":
+                            # blender actually sets the default hard maximum to
+                            # 2^31, not 2^32, so not sure if we can even set
+                            # those numbers from inside blender
+                            # max=4294967295,
+                            return property_spec("IntProperty", min=0)
                         case "u128":
-                            return bpy.props.IntProperty(
-                                min=0,
-                                # blender actually sets the default hard maximum to
-                                # 2^31, not 2^32, so not sure if we can even set
-                                # numbers bigger than this for u128 in Blender
-                                override={"LIBRARY_OVERRIDABLE"},
-                        )
-                        case "usize":
-                            return bpy.props.IntProperty(
-                                min=0,
-                                # blender actually sets the default hard maximum to
-                                # 2^31, not 2^32, so not sure if we can even set
-                                # those numbers from inside blender
-                                # max=4294967295,
-                                override={"LIBRARY_OVERRIDABLE"},
-                        )
+                            # blender actually sets the default hard maximum to
+                            # 2^31, not 2^32, so not sure if we can even set
+                            # numbers bigger than this for u128 in Blender
+                            return property_spec("IntProperty", min=0)
                         case _:
                             if debug:
                                 print("unknown uint type: ", type_path)
-                            return bpy.props.IntProperty(
-                                min=0,
-                                override={"LIBRARY_OVERRIDABLE"}
-                            )
+                            return property_spec("IntProperty", min=0)
                 case "int":
                     match type_path:
                         case "i8":
-                            return bpy.props.IntProperty(
-                                min=-128,
-                                max=127,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=-128, max=127)
                         case "i16":
-                            return bpy.props.IntProperty(
-                                min=-32_768,
-                                max=32_767,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=-32_768, max=32_767)
                         case "i32":
-                            return bpy.props.IntProperty(
-                                min=-2_147_483_648,
-                                max=2_147_483_647,
-                                override={"LIBRARY_OVERRIDABLE"},
-                        )
-                        case "i64":
-                            return bpy.props.IntProperty(
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
-                        case "isize":
-                            return bpy.props.IntProperty(
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=-2_147_483_648, max=2_147_483_647)
+                        case "i64" | "isize":
+                            return property_spec("IntProperty")
                         case _:
                             if debug:
                                 print("unknown iint type: ", type_path)
-                            return bpy.props.IntProperty(
-                                min=0,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=0)
                 case "float":
-                    return bpy.props.FloatProperty(
-                        override={"LIBRARY_OVERRIDABLE"},
-                    )
+                    return property_spec("FloatProperty")
                 case "string":
-                    return bpy.props.StringProperty(
-                        override={"LIBRARY_OVERRIDABLE"},
-                    )
+                    return property_spec("StringProperty")
                 case "object":
                     if debug:
                         print("component: ", component)
                     match component["typePath"]:
                         case "core::num::NonZeroU8":
-                            return bpy.props.IntProperty(
-                                min=0,
-                                max=255,
-                                default=1,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=0, max=255, default=1)
                         case "core::num::NonZeroU16":
-                            return bpy.props.IntProperty(
-                                min=1,
-                                max=65535,
-                                 default=1,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
-                        case "core::num::NonZeroU32":
-                            return bpy.props.IntProperty(
-                                min=1,
-                                default=1,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
-                        case "core::num::NonZeroU64":
-                            return bpy.props.IntProperty(
-                                min=1,
-                                default=1,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=1, max=65535, default=1)
+                        case "core::num::NonZeroU32" | "core::num::NonZeroU64":
+                            return property_spec("IntProperty", min=1, default=1)
                         # TODO: prevent 0 from being valid for NonZeroI* values, but how?
                         case "core::num::NonZeroI8":
-                            return bpy.props.IntProperty(
-                                min=-128,
-                                max=127,
-                                default=1,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=-128, max=127, default=1)
                         case "core::num::NonZeroI16":
-                            return bpy.props.IntProperty(
-                                min=-32_768,
-                                max=32_767,
-                                default=1,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=-32_768, max=32_767, default=1)
                         case "core::num::NonZeroI32":
-                            return bpy.props.IntProperty(
-                                min=-2_147_483_648,
-                                max=2_147_483_647,
-                                default=1,
-                                override={"LIBRARY_OVERRIDABLE"},
-                        )
+                            return property_spec("IntProperty", min=-2_147_483_648, max=2_147_483_647, default=1)
                         case "core::num::NonZeroI64":
-                            return bpy.props.IntProperty(
-                                default=1,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
-                        case "smol_str::SmolStr":
-                            return bpy.props.StringProperty(
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
-                        case "alloc::borrow::Cow<str>":
-                            return bpy.props.StringProperty(
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", default=1)
+                        case "smol_str::SmolStr" | "alloc::borrow::Cow<str>":
+                            return property_spec("StringProperty")
                         case "avian3d::collision::collider::parry::TrimeshFlags":
                             # TODO: What do we do about this. hard coding third-party crate
                             # primitive Value handling is... not great. Can we figure out
                             # how to insert this data into the reflection information?
                             # its opaque intentionally, so really this is a set of checkboxes
                             # represented as a bitfield and the UI should reflect that.
-                            return bpy.props.IntProperty(
-                                min=0,
-                                max=255,
-                                override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            return property_spec("IntProperty", min=0, max=255)
                         case "core::time::Duration" | "bevy_utils::Duration":
                             # Duration {
                             #     secs: u64,
                             #     nanos: Nanoseconds, // Always 0 <= nanos < NANOS_PER_SEC
                             # }
                             annotations = {}
-                            annotations["secs"] = bpy.props.IntProperty(
-                                    name="secs",
-                                    min=0,
-                                    # blender actually sets the default hard maximum to
-                                    # 2^31, not 2^32, so not sure if we can even set
-                                    # those numbers from inside blender
-                                    # max=4294967295,
-                                    override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            # blender actually sets the default hard maximum to
+                            # 2^31, not 2^32, so not sure if we can even set
+                            # those numbers from inside blender
+                            # max=4294967295,
+                            annotations["secs"] = property_spec("IntProperty", name="secs", min=0)
 
                             # NANOS_PER_SEC == 1_000_000_000
                             # so nanos must be: 0..=999_999_999
-                            annotations["nanos"] = bpy.props.IntProperty(
-                                    name="nanos",
-                                    min=0,
-                                    max=999999999,
-                                    override={"LIBRARY_OVERRIDABLE"},
-                            )
+                            annotations["nanos"] = property_spec("IntProperty", name="nanos", min=0, max=999999999)
                                         
-                            # add this struct type to the skein_property_groups so it 
+                            # add this struct type to the specs so it 
                             # can be accessed elsewhere by type_path
-                            t = capitalize_path(type_path)
-                            skein_property_groups[type_path] = type(t, (ComponentData,), {
-                                '__annotations__': annotations,
-                            })
-
-                            # registering the class is required for certain Blender
-                            # functionality to work.
-                            if debug:
-                                print("REGISTERING: " + type_path)
-                            bpy.utils.register_class(
-                                skein_property_groups[type_path]
+                            specs[type_path] = class_spec(
+                                capitalize_path(type_path),
+                                annotations,
                             )
 
-                            # return the type we just constructed
-                            return skein_property_groups[type_path]
+                            # return a reference to the type we just compiled
+                            return spec_reference(specs, type_path)
                         case _:
-                            if debug:
-                                print("unhandled `Value` of `object` type: ", component["typePath"], "\n  ", type_path)
-                            return
+                            return unsupported(failures, type_path, "unhandled `Value` of `object` type", debug)
                 case _:
-                    if debug:
-                        print("unhandled type: ", component["type"])
-                    return
+                    return unsupported(failures, type_path, "unhandled Value type " + str(component["type"]), debug)
         # If an exact match is not confirmed, this last case will be used if provided
         case _:
-            if debug:
-                print("unhandled kind:", component["kind"], "\n  ", type_path)
-            return "Something's wrong with the world"
+            return unsupported(failures, type_path, "unhandled kind " + str(component["kind"]), debug)
+
+# scalar properties that have a sized vector equivalent
+VECTOR_EQUIVALENTS = {
+    "FloatProperty": "FloatVectorProperty",
+    "IntProperty": "IntVectorProperty",
+    "BoolProperty": "BoolVectorProperty",
+}
+# the largest size Blender allows for vector properties
+MAX_VECTOR_SIZE = 32
+
+def vector_spec(item_specs):
+    """a sized vector property spec for items that are all the same
+    scalar number or bool, or None if the items can't be a vector"""
+    if not item_specs or len(item_specs) > MAX_VECTOR_SIZE:
+        return None
+    first = item_specs[0]
+    if first is None or first["kind"] != "property" or "glam" in first:
+        return None
+    if first["property"] not in VECTOR_EQUIVALENTS:
+        return None
+    if any(item_spec != first for item_spec in item_specs[1:]):
+        return None
+
+    options = dict(first["options"])
+    if "default" in options:
+        options["default"] = [options["default"]] * len(item_specs)
+    return property_spec(
+        VECTOR_EQUIVALENTS[first["property"]],
+        size=len(item_specs),
+        **options,
+    )
+
+def compile_items(specs, registry, type_path, refs, results, failures, debug):
+    """compile a Tuple, TupleStruct, or Array that serializes as a json array
+
+    Arrays and tuples of a single kind of number (or bool) are built as
+    sized vector properties. Everything else is built as a "positional"
+    PropertyGroup whose fields are named by index, "0", "1", etc.
+
+    @param: refs the `$ref` of each item, in order
+    """
+    item_specs = [
+        compile_property(
+            specs,
+            registry,
+            ref,
+            results=results,
+            failures=failures,
+        )
+        for ref in refs
+    ]
+
+    spec = vector_spec(item_specs)
+    if spec is not None:
+        specs[type_path] = spec
+        return spec
+
+    if any(item_spec is None for item_spec in item_specs):
+        # a missing field would shift every field after it
+        return unsupported(failures, type_path, "an item could not be built", debug)
+
+    # add this type to the specs so it
+    # can be accessed elsewhere by type_path
+    specs[type_path] = class_spec(
+        class_name(type_path),
+        {str(index): item_spec for index, item_spec in enumerate(item_specs)},
+        positional=True,
+    )
+
+    # return a reference to the type we just compiled
+    return spec_reference(specs, type_path)
+
+def compile_collection(specs, registry, type_path, collection, refs, results, failures, debug):
+    """compile a List, Set, or Map as a PropertyGroup with an `entries` CollectionProperty
+
+    Collections whose entries can't be built are still exported,
+    but always as an empty array or object.
+
+    @param: collection "list", "set", or "map"
+    @param: refs the `$ref` of each entry field, `value` (and `key` for Maps)
+    """
+    entry_annotations = {}
+    for field, ref in refs.items():
+        entry_type_path = ref.removeprefix(REF_PREFIX)
+        if failures is not None and entry_type_path in failures:
+            entry_annotations[field] = None
+        elif results is not None and entry_type_path not in specs and entry_type_path not in results:
+            # compile_registry compiles entries before the collections
+            # that hold them, unless the entry references the
+            # collection (like a tree node with a Vec of children)
+            entry_annotations[field] = None
+        else:
+            entry_annotations[field] = compile_property(
+                specs,
+                registry,
+                ref,
+                results=results,
+                failures=failures,
+            )
+
+    key = entry_annotations.get(KEY_FIELD)
+    if any(spec is None for spec in entry_annotations.values()) or (
+        KEY_FIELD in entry_annotations
+        and (key["kind"] != "property" or key["property"] not in KEY_PROPERTIES)
+    ):
+        if debug:
+            print("collection entries can't be edited, exporting an empty collection: ", type_path)
+        specs[type_path] = class_spec(
+            class_name(type_path),
+            {},
+            # force_default bypasses recursion and forces
+            # an empty data structure in the output
+            force_default="object" if collection == "map" else "list",
+        )
+        return spec_reference(specs, type_path)
+
+    entry_type_path = item_type_path(type_path)
+    specs[entry_type_path] = class_spec(
+        class_name(entry_type_path),
+        entry_annotations,
+    )
+
+    # add this type to the specs so it
+    # can be accessed elsewhere by type_path
+    specs[type_path] = class_spec(
+        class_name(type_path),
+        {ENTRIES_FIELD: {"kind": "collection", "type_path": entry_type_path}},
+        collection=collection,
+    )
+
+    # return a reference to the type we just compiled
+    return spec_reference(specs, type_path)
+
+# --------------------------------- #
+#  Materialization                  #
+# --------------------------------- #
+
+def materialize_property(skein_property_groups, specs, spec):
+    """build the bpy.props property or PropertyGroup class described by a spec
+
+    PropertyGroup classes are registered as they are built and
+    stored in skein_property_groups by type_path. Classes that
+    already exist in skein_property_groups are re-used.
+    """
+    if spec is None:
+        return
+
+    match spec["kind"]:
+        case "property":
+            options = dict(spec["options"])
+            if "items" in options:
+                # bpy.props wants a sequence of tuples, json gives us lists
+                options["items"] = [tuple(item) for item in options["items"]]
+            return getattr(bpy.props, spec["property"])(
+                **options,
+                override={"LIBRARY_OVERRIDABLE"},
+            )
+        case "group":
+            return materialize_type(skein_property_groups, specs, spec["type_path"])
+        case "collection":
+            return bpy.props.CollectionProperty(
+                type=materialize_type(skein_property_groups, specs, spec["type_path"]),
+                override={"LIBRARY_OVERRIDABLE", "USE_INSERTION"},
+            )
+
+def materialize_entry(skein_property_groups, specs, type_path, spec):
+    """materialize the spec that compile_property returned for type_path
+
+    Types that have an entry in specs (PropertyGroups, aliases, string
+    Enums) are stored in skein_property_groups by type_path, so that they
+    can be looked up later using a component's type_path.
+    """
+    if type_path in specs:
+        return materialize_type(skein_property_groups, specs, type_path)
+    return materialize_property(skein_property_groups, specs, spec)
+
+def materialize_type(skein_property_groups, specs, type_path):
+    """build (or re-use) the value stored in skein_property_groups for a type_path"""
+    if type_path in skein_property_groups:
+        return skein_property_groups[type_path]
+
+    spec = specs[type_path]
+    if spec is None or spec["kind"] != "class":
+        skein_property_groups[type_path] = materialize_property(
+            skein_property_groups,
+            specs,
+            spec
+        )
+        return skein_property_groups[type_path]
+
+    annotations = {}
+    for key, field in spec["annotations"].items():
+        property = materialize_property(skein_property_groups, specs, field)
+        if inspect.isclass(property):
+            annotations[key] = bpy.props.PointerProperty(
+                type=property,
+                override={"LIBRARY_OVERRIDABLE"},
+            )
+        else:
+            annotations[key] = property
+
+    # add this type to the skein_property_groups so it 
+    # can be accessed elsewhere by type_path
+    skein_property_groups[type_path] = type(spec["class_name"], (ComponentData,), {
+        '__annotations__': annotations,
+        **spec["markers"],
+    })
+
+    # registering the class is required for certain Blender
+    # functionality to work.
+    debug = False
+    if __package__ in bpy.context.preferences.addons:
+        debug = bpy.context.preferences.addons[__package__].preferences.debug
+    if debug:
+        print("REGISTERING: " + type_path)
+    bpy.utils.register_class(
+        skein_property_groups[type_path]
+    )
+
+    return skein_property_groups[type_path]
@@ -1,7 +1,7 @@
 import pytest
 import bpy
 
-from .property_groups import capitalize_path, hash_type_path, make_property
+from .property_groups import capitalize_path, compile_registry, hash_type_path, make_property
 import json
 import inspect
 
@@ -47,6 +47,25 @@ class TestClass:
             # test_data should be empty, and therefore falsey
             assert not test_data
 
+    def test_reference_cycles_fail(self):
+        registry = {
+            "my_game::A": {"kind": "Struct", "properties": {"b": {"type": {"$ref": "#/$defs/my_game::B"}}}},
+            "my_game::B": {"kind": "Struct", "properties": {"a": {"type": {"$ref": "#/$defs/my_game::A"}}}},
+            "my_game::UsesA": {"kind": "Struct", "properties": {"a": {"type": {"$ref": "#/$defs/my_game::A"}}}},
+            # a List doesn't compile its items, so this is not a cycle
+            "my_game::Node": {"kind": "Struct", "properties": {"children": {"type": {"$ref": "#/$defs/my_game::Nodes"}}}},
+            "my_game::Nodes": {"kind": "List", "items": {"type": {"$ref": "#/$defs/my_game::Node"}}},
+        }
+        specs = {}
+        results = {}
+        failures = {}
+        compile_registry(specs, registry, list(registry), results, failures)
+        assert "my_game::Node" in results
+        assert "reference cycle" in failures["my_game::A"]
+        assert "reference cycle" in failures["my_game::B"]
+        # referencing a type that failed fails too
+        assert "my_game::UsesA" in failures
+
 # make a PropertyGroup and check to make sure the fields are constructed
 def check_fields(type_path, fields):
 
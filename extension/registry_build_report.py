@@ -0,0 +1,138 @@
+import datetime
+import json
+import os
+import time
+import bpy # type: ignore
+
+# --------------------------------- #
+#  A report of where the time went  #
+#  the last time a registry was     #
+#  processed                        #
+# --------------------------------- #
+
+REPORT_TEXT_NAME = "skein-registry-report.txt"
+REPORT_FILE_NAME = "registry-build-report.json"
+
+# how many of the slowest types to list in the text report
+SLOWEST_TYPES = 20
+
+class RegistryBuildReport:
+    """wall time per phase of process_registry, plus what was built
+
+    Phases are sequential: starting a phase ends the previous one.
+    """
+
+    def __init__(self, registry_hash):
+        self.registry_hash = registry_hash
+        self.created = datetime.datetime.now().isoformat(timespec="seconds")
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.current_phase = None
+        self.current_phase_started = None
+        self.total = None
+        self.counts = {}
+        self.compile_times = {}
+        self.failures = {}
+
+    def phase(self, name):
+        """end the running phase (if any) and start timing a new one"""
+        now = time.perf_counter()
+        if self.current_phase is not None:
+            self.phases[self.current_phase] = self.phases.get(self.current_phase, 0) + now - self.current_phase_started
+        self.current_phase = name
+        self.current_phase_started = now
+
+    def finish(self, registry, compile_times, failures, **counts):
+        """stop timing and record what was built
+
+        @param: registry the registry that was processed
+        @param: compile_times seconds spent compiling each type_path
+        @param: failures why each type_path that failed to compile failed
+        @param: counts any other numbers worth reporting, like classes_registered
+        """
+        self.phase(None)
+        self.total = time.perf_counter() - self.started
+        self.counts = counts
+        self.compile_times = compile_times
+
+        # group failures by the kind of type that failed, which
+        # points at what compile_property doesn't support yet
+        self.failures = {}
+        for type_path, reason in failures.items():
+            if type_path in registry:
+                kind = registry[type_path].get("kind", "Unknown")
+            else:
+                # inline enum variants and types missing from the registry
+                kind = "Not in registry"
+            self.failures.setdefault(kind, {})[type_path] = reason
+
+    def to_dict(self):
+        return {
+            "registry_hash": self.registry_hash,
+            "created": self.created,
+            "total": self.total,
+            "phases": self.phases,
+            "counts": self.counts,
+            "compile_times": self.compile_times,
+            "failures": self.failures,
+        }
+
+    def to_text(self):
+        lines = [
+            "Skein Registry Build Report",
+            "",
+            "created: " + self.created,
+            "registry hash: " + str(self.registry_hash),
+            "total: {:.3f}s".format(self.total or 0),
+            "",
+            "phases:",
+        ]
+        for name, seconds in self.phases.items():
+            lines.append("  {:<12} {:.3f}s".format(name, seconds))
+
+        lines.append("")
+        lines.append("counts:")
+        for name, count in self.counts.items():
+            lines.append("  {:<20} {}".format(name, count))
+
+        lines.append("")
+        lines.append("slowest types to compile:")
+        slowest = sorted(self.compile_times.items(), key=lambda item: item[1], reverse=True)
+        for type_path, seconds in slowest[:SLOWEST_TYPES]:
+            lines.append("  {:.2f}ms {}".format(seconds * 1000, type_path))
+
+        lines.append("")
+        lines.append("failed or unsupported types:")
+        for kind, failures in sorted(self.failures.items()):
+            lines.append("  " + kind + " (" + str(len(failures)) + ")")
+            for type_path, reason in sorted(failures.items()):
+                lines.append("    " + type_path + " :: " + reason)
+
+        return "\n".join(lines) + "\n"
+
+def report_directory():
+    """the directory build reports are written to, or None if unavailable"""
+    try:
+        return bpy.utils.extension_path_user(__package__, path="reports", create=True)
+    except Exception:
+        # extension_path_user only works when skein is installed
+        # as an extension
+        return None
+
+def write_build_report(report):
+    """write the report to a text block and to a json file in the extension's user directory"""
+    if REPORT_TEXT_NAME in bpy.data.texts:
+        text = bpy.data.texts[REPORT_TEXT_NAME]
+        text.clear()
+    else:
+        text = bpy.data.texts.new(REPORT_TEXT_NAME)
+    text.write(report.to_text())
+
+    directory = report_directory()
+    if directory is None:
+        return
+    try:
+        with open(os.path.join(directory, REPORT_FILE_NAME), "w") as report_file:
+            json.dump(report.to_dict(), report_file, indent=4)
+    except OSError as e:
+        print("skein: could not write registry build report", e)
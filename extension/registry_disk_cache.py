@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import bpy # type: ignore
+
+from .property_groups import SPEC_VERSION
+
+# --------------------------------- #
+#  On-disk cache of compiled        #
+#  registries, keyed by a hash of   #
+#  the skein-registry.json content  #
+#  and the allow/deny lists         #
+# --------------------------------- #
+
+# how many compiled registries to keep around. Each project
+# (and each version of a project's registry) gets its own file.
+MAX_CACHED_REGISTRIES = 8
+
+def registry_text_hash(text):
+    """hash the contents of a skein-registry.json text block"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def compiled_registry_key(registry_hash, allow, deny):
+    """the cache key for a registry compiled with allow and deny lists
+
+    Only the allowed Components, and the types they reference, are
+    compiled, so the same registry compiled with different lists
+    is stored separately.
+    """
+    if not allow and not deny:
+        return registry_hash
+    prefixes = json.dumps([sorted(allow), sorted(deny)], separators=(",", ":"))
+    return hashlib.sha256((registry_hash + prefixes).encode("utf-8")).hexdigest()
+
+def cache_directory():
+    """the directory compiled registries are stored in, or None if unavailable"""
+    try:
+        return bpy.utils.extension_path_user(__package__, path="registry_cache", create=True)
+    except Exception:
+        # extension_path_user only works when skein is installed
+        # as an extension, which isn't true when running tests
+        # against the source directory
+        return None
+
+def load_compiled_registry(registry_hash):
+    """return the compiled registry stored for a hash, or None
+
+    @param: registry_hash the compiled_registry_key of the registry
+
+    The returned dict has `specs`, `results`, `failures`, and `fingerprints` keys,
+    matching the arguments to `store_compiled_registry`.
+    """
+    directory = cache_directory()
+    if directory is None:
+        return None
+
+    path = os.path.join(directory, registry_hash + ".json")
+    try:
+        with open(path) as cache_file:
+            compiled = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+    if compiled.get("version") != SPEC_VERSION:
+        return None
+
+    # mark this entry as recently used so that it survives pruning
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    return compiled
+
+def store_compiled_registry(registry_hash, specs, results, failures, fingerprints):
+    """write a compiled registry to the cache
+
+    @param: registry_hash the compiled_registry_key of the registry
+    @param: specs the specs built by compile_property, keyed by type_path
+    @param: results the spec compile_property returned for each type_path that compiled
+    @param: failures the reason each type_path that failed to compile failed
+    @param: fingerprints the registry_graph.type_fingerprints for the registry
+    """
+    directory = cache_directory()
+    if directory is None:
+        return
+
+    path = os.path.join(directory, registry_hash + ".json")
+    temporary_path = path + ".tmp"
+    try:
+        with open(temporary_path, "w") as cache_file:
+            json.dump({
+                "version": SPEC_VERSION,
+                "specs": specs,
+                "results": results,
+                "failures": failures,
+                "fingerprints": fingerprints,
+            }, cache_file, separators=(",", ":"))
+        # replace is atomic, so a second Blender instance never
+        # reads a half-written file
+        os.replace(temporary_path, path)
+    except OSError as e:
+        print("skein: could not write compiled registry cache", e)
+        return
+
+    prune_cache(directory)
+
+def prune_cache(directory):
+    """remove all but the most recently used compiled registries"""
+    try:
+        entries = [
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.endswith(".json")
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[MAX_CACHED_REGISTRIES:]:
+            os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,15 @@
+from .registry_disk_cache import compiled_registry_key
+
+class TestClass:
+    def test_no_lists(self):
+        assert compiled_registry_key("abc", [], []) == "abc"
+
+    def test_lists_change_the_key(self):
+        allowed = compiled_registry_key("abc", ["test_components"], [])
+        denied = compiled_registry_key("abc", [], ["test_components"])
+        assert allowed != "abc"
+        assert denied != "abc"
+        assert allowed != denied
+
+    def test_list_order_does_not_matter(self):
+        assert compiled_registry_key("abc", ["a", "b"], ["c"]) == compiled_registry_key("abc", ["b", "a"], ["c"])
@@ -0,0 +1,296 @@
+import hashlib
+import json
+import re
+
+# --------------------------------- #
+#  Pure-data helpers for working    #
+#  with the Bevy registry schema as #
+#  a graph of type_paths            #
+# --------------------------------- #
+#
+# Nothing in this module touches bpy, which means it can
+# be used from anywhere (including worker threads) and
+# tested without a running Blender instance.
+
+REF_PREFIX = "#/$defs/"
+
+def type_refs(schema):
+    """collect every type_path referenced by `$ref` anywhere in a schema
+
+    This includes refs that live in the inline variants of
+    complex enums, the `prefixItems` of tuples, and the
+    `items`/`keyType`/`valueType` of collections.
+    """
+    refs = set()
+    stack = [schema]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key, inner in value.items():
+                if key == "$ref" and isinstance(inner, str):
+                    refs.add(inner.removeprefix(REF_PREFIX))
+                else:
+                    stack.append(inner)
+        elif isinstance(value, list):
+            stack.extend(value)
+    return refs
+
+def inline_type_paths(schema):
+    """type_paths of the inline variants of a complex enum
+
+    make_property creates PropertyGroups for these variants,
+    keyed by the variant's typePath, even though they are not
+    keys in the registry itself.
+    """
+    if schema.get("kind") != "Enum" or schema.get("type") != "object":
+        return []
+    return [
+        option["typePath"]
+        for option in schema.get("oneOf", [])
+        if "typePath" in option
+    ]
+
+# the kinds compile_property builds as CollectionProperty entries
+COLLECTION_KINDS = ("List", "Set", "Map")
+
+def item_type_path(type_path):
+    """the key of the PropertyGroup that holds each entry of a List, Set, or Map
+
+    Like the inline variants of complex enums, these are not keys
+    in the registry itself.
+    """
+    return type_path + "::SkeinItem"
+
+def collection_item_type_paths(schema):
+    """item_type_path for a List, Set, or Map, and nothing for other kinds"""
+    if schema.get("kind") not in COLLECTION_KINDS or "typePath" not in schema:
+        return []
+    return [item_type_path(schema["typePath"])]
+
+def compile_refs(schema, collections=True):
+    """the type_paths compile_property compiles while compiling a schema
+
+    This is a subset of type_refs.
+
+    @param: collections include the items (and Map keys) of Lists,
+            Maps, and Sets. A reference cycle that only goes through
+            collections can still be compiled (see compile_registry),
+            so these refs are left out when looking for cycles.
+    """
+    refs = set()
+    match schema.get("kind"):
+        case "List" | "Set" | "Map" if collections:
+            for key in ["items", "keyType", "valueType"]:
+                ref = schema.get(key, {}).get("type", {}).get("$ref")
+                if ref is not None:
+                    refs.add(ref.removeprefix(REF_PREFIX))
+        case "Struct":
+            for field in schema.get("properties", {}).values():
+                ref = field.get("type", {}).get("$ref")
+                if ref is not None:
+                    refs.add(ref.removeprefix(REF_PREFIX))
+        case "Tuple" | "TupleStruct":
+            for item in schema.get("prefixItems", []):
+                ref = item.get("type", {}).get("$ref")
+                if ref is not None:
+                    refs.add(ref.removeprefix(REF_PREFIX))
+        case "Array":
+            # fixed-size arrays are compiled, unlike Lists
+            ref = schema.get("items", {}).get("type", {}).get("$ref")
+            if ref is not None:
+                refs.add(ref.removeprefix(REF_PREFIX))
+        case "Enum":
+            if schema.get("type") == "object":
+                for option in schema.get("oneOf", []):
+                    if "kind" in option:
+                        refs |= compile_refs(option)
+    return refs
+
+_ARRAY_LENGTH = re.compile(r";\s*(\d+)\]$")
+
+def array_length(schema):
+    """the number of items in a fixed-size Array, or None if it isn't known
+
+    The schema only has minItems/maxItems for some Arrays, but the
+    length is always at the end of the typePath, ex: `[f32; 3]`
+    """
+    if "minItems" in schema and schema.get("maxItems") == schema["minItems"]:
+        return schema["minItems"]
+    match = _ARRAY_LENGTH.search(schema.get("typePath", ""))
+    if match is None:
+        return None
+    return int(match.group(1))
+
+def build_dependency_graph(registry):
+    """map each type_path to the set of type_paths it references"""
+    return {
+        type_path: type_refs(schema)
+        for type_path, schema in registry.items()
+    }
+
+def component_type_paths(registry):
+    """the type_paths of every type that reflects Component"""
+    return [
+        type_path
+        for type_path, schema in registry.items()
+        if "Component" in schema.get("reflectTypes", [])
+    ]
+
+def reachable(graph, roots):
+    """every type_path reachable from the roots, including the roots"""
+    seen = set()
+    stack = list(roots)
+    while stack:
+        type_path = stack.pop()
+        if type_path in seen:
+            continue
+        seen.add(type_path)
+        stack.extend(graph.get(type_path, ()))
+    return seen
+
+def strongly_connected_components(graph):
+    """Tarjan's algorithm, without recursion
+
+    Returns a list of components (lists of type_paths) in
+    dependency order: every component comes *after* all of the
+    components it references. Nodes referenced in the graph but
+    not present as keys are ignored.
+    """
+    index_of = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    next_index = 0
+
+    for root in graph:
+        if root in index_of:
+            continue
+        # each work item is (node, iterator over its successors)
+        work = [(root, iter(graph[root]))]
+        index_of[root] = lowlink[root] = next_index
+        next_index += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for successor in successors:
+                if successor not in graph:
+                    continue
+                if successor not in index_of:
+                    index_of[successor] = lowlink[successor] = next_index
+                    next_index += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph[successor])))
+                    advanced = True
+                    break
+                elif successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[successor])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+def schema_hash(schema):
+    """a stable hash of a single type's schema, ignoring key order"""
+    encoded = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.md5(encoded.encode("utf-8")).hexdigest()
+
+def type_fingerprints(registry, graph=None):
+    """hash each type together with everything it transitively references
+
+    Two registries produce the same fingerprint for a type_path
+    only if the type's schema *and* the schemas of all of its
+    transitive dependencies are identical. Types that take part in
+    a reference cycle share the hash of the whole cycle.
+
+    The inline variants of complex enums, and the entries of
+    collections, get the fingerprint of the type that owns them.
+    """
+    if graph is None:
+        graph = build_dependency_graph(registry)
+
+    own = {
+        type_path: schema_hash(schema)
+        for type_path, schema in registry.items()
+    }
+
+    fingerprints = {}
+    # components come out of Tarjan in dependency order, so
+    # every referenced component is fingerprinted already
+    for component in strongly_connected_components(graph):
+        members = set(component)
+        parts = sorted(own[type_path] for type_path in component)
+        external = set()
+        for type_path in component:
+            for dependency in graph[type_path]:
+                if dependency in members:
+                    continue
+                if dependency in fingerprints:
+                    external.add(fingerprints[dependency])
+                else:
+                    # referenced but not in the registry. If it shows
+                    # up later, dependents have to be rebuilt.
+                    external.add("missing:" + dependency)
+        m = hashlib.md5()
+        for part in parts:
+            m.update(part.encode("utf-8"))
+        m.update(b"|")
+        for part in sorted(external):
+            m.update(part.encode("utf-8"))
+        fingerprint = m.hexdigest()
+        for type_path in component:
+            fingerprints[type_path] = fingerprint
+
+    for type_path, schema in registry.items():
+        for variant_type_path in inline_type_paths(schema):
+            fingerprints[variant_type_path] = fingerprints[type_path]
+        for entry_type_path in collection_item_type_paths(schema):
+            fingerprints[entry_type_path] = fingerprints[type_path]
+
+    return fingerprints
+
+def parse_prefixes(text):
+    """split a comma (or whitespace) separated list of type_path prefixes"""
+    return [
+        prefix
+        for prefix in text.replace(",", " ").split()
+        if prefix
+    ]
+
+def type_path_included(type_path, allow, deny):
+    """whether a type_path passes crate/module prefix allow and deny lists
+
+    An empty allow list allows everything. The deny list
+    wins over the allow list, so that a module of an allowed
+    crate can still be denied.
+    """
+    if allow and not any(type_path.startswith(prefix) for prefix in allow):
+        return False
+    return not any(type_path.startswith(prefix) for prefix in deny)
+
+def whole_crates(prefixes):
+    """the prefixes that name an entire crate, rather than a module of one"""
+    return [
+        prefix.removesuffix("::")
+        for prefix in prefixes
+        if "::" not in prefix.removesuffix("::")
+    ]
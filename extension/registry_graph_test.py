@@ -0,0 +1,108 @@
+import copy
+import json
+
+from .registry_graph import array_length, build_dependency_graph, collection_item_type_paths, compile_refs, component_type_paths, parse_prefixes, reachable, strongly_connected_components, type_fingerprints, type_path_included, type_refs, whole_crates
+
+class TestClass:
+    def test_type_refs(self):
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+            assert type_refs(registry["test_components::Player"]) == {
+                "alloc::string::String",
+                "f32",
+                "i32",
+            }
+
+    def test_reachable_from_components(self):
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+            graph = build_dependency_graph(registry)
+            closure = reachable(graph, component_type_paths(registry))
+            assert "test_components::Player" in closure
+            assert "alloc::string::String" in closure
+            # every type the closure references is in the closure
+            for type_path in closure:
+                assert graph.get(type_path, set()) <= closure
+
+    def test_compile_refs_collection_items(self):
+        node = {
+            "kind": "Struct",
+            "properties": {
+                "children": {"type": {"$ref": "#/$defs/alloc::vec::Vec<my_game::Node>"}},
+                "weight": {"type": {"$ref": "#/$defs/f32"}},
+            },
+        }
+        nodes = {
+            "kind": "List",
+            "items": {"type": {"$ref": "#/$defs/my_game::Node"}},
+        }
+        assert compile_refs(node) == {"alloc::vec::Vec<my_game::Node>", "f32"}
+        assert compile_refs(nodes) == {"my_game::Node"}
+        # a Node referencing itself through a Vec is not a cycle
+        # as far as finding cycles is concerned
+        assert compile_refs(nodes, collections=False) == set()
+
+    def test_collection_item_type_paths(self):
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+            fingerprints = type_fingerprints(registry)
+            for type_path, schema in registry.items():
+                for entry_type_path in collection_item_type_paths(schema):
+                    assert fingerprints[entry_type_path] == fingerprints[type_path]
+            assert collection_item_type_paths(registry["test_components::Player"]) == []
+
+    def test_compile_refs_arrays_and_tuples(self):
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+            assert compile_refs(registry["test_components::MultiElementTupleStruct"]) == {
+                "u32",
+                "glam::Vec3",
+                "i32",
+                "alloc::string::String",
+            }
+            assert compile_refs(registry["[glam::Vec3; 4]"]) == {"glam::Vec3"}
+
+    def test_array_length(self):
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+            assert array_length(registry["[glam::Vec2; 3]"]) == 3
+            assert array_length(registry["[glam::Vec3; 4]"]) == 4
+        assert array_length({"kind": "Array", "typePath": "[f32; 16]", "minItems": 16, "maxItems": 16}) == 16
+        assert array_length({"kind": "Array", "typePath": "[[u8; 2]; 5]"}) == 5
+        assert array_length({"kind": "List", "typePath": "smallvec::SmallVec<[u64; 1]>"}) is None
+
+    def test_cycles_are_grouped(self):
+        graph = {
+            "a": {"b"},
+            "b": {"a", "c"},
+            "c": set(),
+        }
+        components = strongly_connected_components(graph)
+        # dependencies come before the types that reference them
+        assert components[0] == ["c"]
+        assert sorted(components[1]) == ["a", "b"]
+
+    def test_fingerprints_follow_dependencies(self):
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+            before = type_fingerprints(registry)
+
+            changed = copy.deepcopy(registry)
+            changed["f32"]["description"] = "changed"
+            after = type_fingerprints(changed)
+
+            # Player has an f32 field, Marker does not
+            assert before["test_components::Player"] != after["test_components::Player"]
+            assert before["test_components::Marker"] == after["test_components::Marker"]
+
+    def test_prefix_lists(self):
+        allow = parse_prefixes("test_components, my_game::player")
+        deny = parse_prefixes("test_components::Marker")
+        assert allow == ["test_components", "my_game::player"]
+        assert type_path_included("test_components::Player", allow, deny)
+        assert type_path_included("my_game::player::Health", allow, deny)
+        assert not type_path_included("test_components::Marker", allow, deny)
+        assert not type_path_included("bevy_transform::components::Transform", allow, deny)
+        # an empty allow list allows everything that isn't denied
+        assert type_path_included("bevy_transform::components::Transform", [], deny)
+        assert whole_crates(allow) == ["test_components"]
@@ -0,0 +1,22 @@
+from types import MappingProxyType
+
+# --------------------------------- #
+#  The parsed registry that was     #
+#  processed most recently          #
+# --------------------------------- #
+#
+# Panels draw on every mouse move, so they can't afford to parse
+# the registry json each time. process_registry is the only
+# thing that should call set_registry. Everything else reads
+# the same parsed dict through get_registry, and must not mutate it.
+
+_registry = MappingProxyType({})
+
+def set_registry(registry):
+    """replace the current registry. Only process_registry should call this"""
+    global _registry
+    _registry = MappingProxyType(registry)
+
+def get_registry():
+    """the current registry, as a read-only mapping of type_path to schema"""
+    return _registry
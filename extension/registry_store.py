@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import bpy # type: ignore
+
+# --------------------------------- #
+#  A registry store shared by many  #
+#  .blend files in a project        #
+# --------------------------------- #
+#
+# The store is a directory of text, keyed by the sha256 of the text:
+#
+#   objects/<sha256>   the text, exactly as it would be embedded
+#   HEAD               {"registry": <sha256>, "presets": <sha256>}
+#
+# HEAD points at the most recently fetched registry and presets,
+# which is what every .blend file that references the store uses.
+# A .blend file also remembers the hash it last fetched, which is
+# used if HEAD is missing or points at an object that is missing,
+# and keeps its embedded text block as a fallback for when the
+# store isn't there at all.
+
+HEAD_FILE_NAME = "HEAD"
+OBJECTS_DIRECTORY = "objects"
+
+# custom properties on text blocks that reference a store
+STORE_PATH_PROPERTY = "skein_store"
+STORE_HASH_PROPERTY = "skein_store_hash"
+
+def store_text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _write(path, text):
+    # write to a temporary file first, so that other Blender
+    # instances never read a partially written file
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8", newline="") as store_file:
+        store_file.write(text)
+    os.replace(temporary_path, path)
+
+def store_text(directory, text):
+    """add text to the store (if it isn't already there) and return its hash"""
+    text_hash = store_text_hash(text)
+    objects = os.path.join(directory, OBJECTS_DIRECTORY)
+    os.makedirs(objects, exist_ok=True)
+    path = os.path.join(objects, text_hash)
+    if not os.path.exists(path):
+        _write(path, text)
+    return text_hash
+
+def load_text(directory, text_hash):
+    """the text stored under a hash, or None if it is missing or corrupt"""
+    try:
+        with open(os.path.join(directory, OBJECTS_DIRECTORY, text_hash), encoding="utf-8", newline="") as store_file:
+            text = store_file.read()
+    except (OSError, ValueError):
+        return None
+    if store_text_hash(text) != text_hash:
+        return None
+    return text
+
+def read_head(directory):
+    """the store's HEAD, or an empty dict if it doesn't have one"""
+    try:
+        with open(os.path.join(directory, HEAD_FILE_NAME), encoding="utf-8") as head_file:
+            head = json.load(head_file)
+    except (OSError, ValueError):
+        return {}
+    return head if isinstance(head, dict) else {}
+
+def update_head(directory, **hashes):
+    """point HEAD at new hashes, ex: update_head(directory, registry=text_hash)"""
+    head = read_head(directory)
+    head.update(hashes)
+    _write(os.path.join(directory, HEAD_FILE_NAME), json.dumps(head, indent=4))
+
+def resolve_text(directory, kind, pinned_hash=None):
+    """the (hash, text) of the newest text of a kind in the store
+
+    Uses HEAD, then pinned_hash. Returns (None, None) if neither is
+    in the store.
+    """
+    for text_hash in [read_head(directory).get(kind), pinned_hash]:
+        if not text_hash:
+            continue
+        text = load_text(directory, text_hash)
+        if text is not None:
+            return text_hash, text
+    return None, None
+
+# --------------------------------- #
+#  Text blocks that reference the   #
+#  store                            #
+# --------------------------------- #
+
+def store_directory(context):
+    """the absolute store directory from the preferences, or None if there isn't one"""
+    if __package__ not in context.preferences.addons:
+        return None
+    path = context.preferences.addons[__package__].preferences.registry_store
+    if not path:
+        return None
+    if path.startswith("//") and not bpy.data.filepath:
+        # relative to a .blend file that hasn't been saved yet
+        return None
+    return bpy.path.abspath(path)
+
+def reference_store(text_block, directory, text_hash):
+    """make a text block reference text in a store, or stop referencing one if directory is None"""
+    if directory is None:
+        for key in [STORE_PATH_PROPERTY, STORE_HASH_PROPERTY]:
+            if key in text_block:
+                del text_block[key]
+        return
+
+    # relative to the .blend file, so that the project can be moved
+    # or checked out somewhere else
+    try:
+        path = bpy.path.relpath(directory)
+    except ValueError:
+        # on Windows, a store on another drive can't be relative
+        path = directory
+    text_block[STORE_PATH_PROPERTY] = path
+    text_block[STORE_HASH_PROPERTY] = text_hash
+
+def referenced_text(text_block, kind):
+    """the text a text block stands for
+
+    That's the store's text, if the text block references a store
+    that has one, and otherwise the text block's own (embedded) text.
+
+    @param: kind "registry" or "presets"
+    """
+    path = text_block.get(STORE_PATH_PROPERTY)
+    if path:
+        _, text = resolve_text(bpy.path.abspath(path), kind, text_block.get(STORE_HASH_PROPERTY))
+        if text is not None:
+            return text
+    return text_block.as_string()
@@ -0,0 +1,30 @@
+import os
+
+from .registry_store import load_text, read_head, resolve_text, store_text, update_head
+
+class TestClass:
+    def test_store_and_load(self, tmp_path):
+        directory = str(tmp_path)
+        text_hash = store_text(directory, '{"a":{}}\n')
+        assert load_text(directory, text_hash) == '{"a":{}}\n'
+        # storing the same text again is a no-op
+        assert store_text(directory, '{"a":{}}\n') == text_hash
+        assert load_text(directory, "missing") is None
+
+    def test_corrupt_object(self, tmp_path):
+        directory = str(tmp_path)
+        text_hash = store_text(directory, "{}")
+        with open(os.path.join(directory, "objects", text_hash), "w") as store_file:
+            store_file.write("{ not the same }")
+        assert load_text(directory, text_hash) is None
+
+    def test_resolve_prefers_head(self, tmp_path):
+        directory = str(tmp_path)
+        old_hash = store_text(directory, "old")
+        new_hash = store_text(directory, "new")
+        assert resolve_text(directory, "registry", old_hash) == (old_hash, "old")
+        update_head(directory, registry=new_hash)
+        update_head(directory, presets=old_hash)
+        assert read_head(directory) == {"registry": new_hash, "presets": old_hash}
+        assert resolve_text(directory, "registry", old_hash) == (new_hash, "new")
+        assert resolve_text(str(tmp_path / "missing"), "registry", old_hash) == (None, None)
@@ -0,0 +1,91 @@
+import base64
+import binascii
+import hashlib
+import json
+import zlib
+
+# --------------------------------- #
+#  How registry and presets json    #
+#  is stored in .blend text blocks  #
+# --------------------------------- #
+#
+# Registries can be several megabytes of json, which every .blend
+# file that uses skein carries around. Besides the readable,
+# indented form, they can be stored compactly, or compressed with
+# zlib and base64 encoded so that they still fit in a text block.
+#
+# Compact and compressed text starts with a header line:
+#
+#   #skein {"format": "zlib+base64", "sha256": "..."}
+#
+# where sha256 is the hash of the compact json. Text without a
+# header is plain json, which is what older versions wrote.
+#
+# Nothing in this module touches bpy.
+
+STORAGE_PRETTY = "PRETTY"
+STORAGE_COMPACT = "COMPACT"
+STORAGE_COMPRESSED = "COMPRESSED"
+
+HEADER_PREFIX = "#skein "
+
+FORMAT_JSON = "json"
+FORMAT_ZLIB_BASE64 = "zlib+base64"
+
+def encode_json(data, storage=STORAGE_PRETTY):
+    """serialize data for a text block using one of the STORAGE_ modes"""
+    if storage == STORAGE_PRETTY:
+        return json.dumps(data, indent=4)
+
+    compact = json.dumps(data, separators=(",", ":"))
+    header = {
+        "format": FORMAT_JSON,
+        "sha256": hashlib.sha256(compact.encode("utf-8")).hexdigest(),
+    }
+    if storage == STORAGE_COMPACT:
+        payload = compact
+    elif storage == STORAGE_COMPRESSED:
+        header["format"] = FORMAT_ZLIB_BASE64
+        # encodebytes wraps lines, which keeps Blender's text
+        # editor responsive if someone opens the text block
+        payload = base64.encodebytes(
+            zlib.compress(compact.encode("utf-8"), 9)
+        ).decode("ascii")
+    else:
+        raise ValueError("unknown registry storage: " + str(storage))
+
+    return HEADER_PREFIX + json.dumps(header) + "\n" + payload
+
+def text_header(text):
+    """the header of compact or compressed text, or None for plain json"""
+    if not text.startswith(HEADER_PREFIX):
+        return None
+    header_line, _, _ = text.partition("\n")
+    return json.loads(header_line[len(HEADER_PREFIX):])
+
+def decode_json(text):
+    """parse text written by encode_json, in any storage mode
+
+    Raises ValueError if the text is not valid, including when the
+    payload doesn't match the hash in its header.
+    """
+    header = text_header(text)
+    if header is None:
+        return json.loads(text)
+
+    _, _, payload = text.partition("\n")
+    if header.get("format") == FORMAT_JSON:
+        compact = payload
+    elif header.get("format") == FORMAT_ZLIB_BASE64:
+        try:
+            compact = zlib.decompress(base64.b64decode(payload)).decode("utf-8")
+        except (zlib.error, binascii.Error) as e:
+            raise ValueError("could not decompress skein text: " + str(e))
+    else:
+        raise ValueError("unknown skein text format: " + str(header.get("format")))
+
+    expected = header.get("sha256")
+    if expected is not None and hashlib.sha256(compact.encode("utf-8")).hexdigest() != expected:
+        raise ValueError("skein text does not match the sha256 in its header")
+
+    return json.loads(compact)
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from .registry_text import STORAGE_COMPACT, STORAGE_COMPRESSED, STORAGE_PRETTY, decode_json, encode_json, text_header
+
+class TestClass:
+    def test_round_trip(self):
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+            for storage in [STORAGE_PRETTY, STORAGE_COMPACT, STORAGE_COMPRESSED]:
+                assert decode_json(encode_json(registry, storage)) == registry
+
+    def test_compressed_is_smaller(self):
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+            pretty = encode_json(registry, STORAGE_PRETTY)
+            compact = encode_json(registry, STORAGE_COMPACT)
+            compressed = encode_json(registry, STORAGE_COMPRESSED)
+            assert len(compressed) < len(compact) < len(pretty)
+            assert text_header(pretty) is None
+            assert text_header(compressed)["format"] == "zlib+base64"
+
+    def test_plain_json(self):
+        # registries written by older versions have no header
+        assert decode_json('{\n    "a": {}\n}') == {"a": {}}
+
+    def test_hash_mismatch(self):
+        text = encode_json({"a": 1}, STORAGE_COMPACT)
+        with pytest.raises(ValueError):
+            decode_json(text.replace('"a":1', '"a":2'))
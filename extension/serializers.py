@@ -0,0 +1,169 @@
+from .collection_values import ENTRIES_FIELD, KEY_FIELD, VALUE_FIELD, flat_buffer, flat_size, is_flat, to_map_key, unflatten
+from .form_to_object import get_data_from_active_editor
+from .glam_types import VECTOR_PROPERTIES, to_glam
+
+# --------------------------------- #
+#  Serializers compiled from specs  #
+# --------------------------------- #
+#
+# get_data_from_active_editor works out what kind of PropertyGroup
+# it's looking at every time it visits one: reading __annotations__,
+# probing for markers, and comparing property function names.
+#
+# Everything it works out is already in the specs compile_property
+# produced, so each type gets a serializer function built from its
+# spec instead. The serializer knows its fields, which of them are
+# PropertyGroups, and how vector properties are laid out, and does
+# nothing at export time but read values.
+#
+# Serializers are built the first time a type is exported, and
+# thrown away whenever a registry is processed. The output is the
+# same as get_data_from_active_editor's.
+#
+# Nothing in this module touches bpy.
+
+_specs = {}
+_serializers = {}
+
+def set_serializer_specs(specs):
+    """serialize using a new set of specs. Called when a registry is processed"""
+    global _specs
+    _specs = specs
+    _serializers.clear()
+
+def serializer_specs():
+    """the specs serializers are built from"""
+    return _specs
+
+def serialize_component(container, field, type_path):
+    """the json data of a component in a ComponentContainer
+
+    Same as get_data_from_active_editor(container, field)
+
+    @param: field the ComponentContainer field, see type_names.field_name
+    """
+    spec = _specs.get(type_path)
+    if spec is None:
+        # types that were compiled before serializers existed,
+        # or that compile_property didn't put in specs
+        return get_data_from_active_editor(container, field)
+    if spec["kind"] == "class":
+        if field not in container:
+            return {}
+        return serializer(type_path)(getattr(container, field))
+    return _field_reader(spec)(container, field)
+
+def serializer(type_path):
+    """the serializer for the PropertyGroup built for a type_path
+
+    A serializer takes an instance of the PropertyGroup and
+    returns its json data.
+    """
+    try:
+        return _serializers[type_path]
+    except KeyError:
+        function = _serializers[type_path] = compile_serializer(_specs[type_path])
+        return function
+
+def compile_serializer(spec):
+    """build the serializer for a "class" spec"""
+    annotations = spec["annotations"]
+    markers = spec["markers"]
+
+    # These follow the order get_data_from_active_editor checks in
+    if markers.get("is_core_option"):
+        read_some = _field_reader(annotations["Some"])
+        def serialize_option(obj):
+            match obj.skein_enum_index:
+                case "None":
+                    return None
+                case "Some":
+                    return read_some(obj, "Some")
+        return serialize_option
+
+    if "skein_enum_index" in annotations:
+        variants = {
+            key: _field_reader(field)
+            for key, field in annotations.items()
+            if key != "skein_enum_index" and field is not None
+        }
+        def serialize_enum(obj):
+            variant = obj.skein_enum_index
+            read = variants.get(variant)
+            if read is None:
+                # unit variants are just their name
+                return variant
+            return {variant: read(obj, variant)}
+        return serialize_enum
+
+    force_default = markers.get("force_default")
+    if force_default == "object":
+        return lambda obj: {}
+    if force_default == "list":
+        return lambda obj: []
+
+    if markers.get("collection") is not None:
+        return _compile_collection(markers["collection"], _specs[annotations[ENTRIES_FIELD]["type_path"]])
+
+    fields = [
+        (key, _field_reader(field))
+        for key, field in annotations.items()
+        if field is not None
+    ]
+
+    if markers.get("positional"):
+        def serialize_positional(obj):
+            return [read(obj, key) for key, read in fields]
+        return serialize_positional
+
+    def serialize_struct(obj):
+        return {key: read(obj, key) for key, read in fields}
+    return serialize_struct
+
+def _field_reader(spec):
+    """a function that reads a field described by a spec: (obj, key) -> json"""
+    if spec["kind"] == "group":
+        type_path = spec["type_path"]
+        def read_group(obj, key):
+            if key not in obj:
+                # PointerProperty fields that were never accessed
+                return {}
+            return serializer(type_path)(getattr(obj, key))
+        return read_group
+
+    if spec["kind"] == "property" and spec["property"] in VECTOR_PROPERTIES:
+        subtype = spec["options"].get("subtype")
+        def read_vector(obj, key):
+            return to_glam(subtype, getattr(obj, key))
+        return read_vector
+
+    return getattr
+
+def _compile_collection(collection, entry_spec):
+    entry_annotations = entry_spec["annotations"]
+    value_spec = entry_annotations[VALUE_FIELD]
+    read_value = _field_reader(value_spec)
+
+    if collection == "map":
+        read_key = _field_reader(entry_annotations[KEY_FIELD])
+        def serialize_map(obj):
+            return {
+                to_map_key(read_key(entry, KEY_FIELD)): read_value(entry, VALUE_FIELD)
+                for entry in getattr(obj, ENTRIES_FIELD)
+            }
+        return serialize_map
+
+    property = value_spec.get("property")
+    if value_spec["kind"] == "property" and is_flat(property):
+        size = flat_size(property, value_spec["options"])
+        subtype = value_spec["options"].get("subtype")
+        def serialize_flat(obj):
+            entries = getattr(obj, ENTRIES_FIELD)
+            flat = flat_buffer(property, len(entries) * (size or 1))
+            entries.foreach_get(VALUE_FIELD, flat)
+            return unflatten(property, flat, size, subtype)
+        return serialize_flat
+
+    def serialize_list(obj):
+        return [read_value(entry, VALUE_FIELD) for entry in getattr(obj, ENTRIES_FIELD)]
+    return serialize_list
@@ -0,0 +1,87 @@
+from array import array
+
+from .serializers import serialize_component, set_serializer_specs
+from .spec_fixtures import MAP_TYPE_PATH, component_tests_specs
+
+class Group:
+    """the parts of a PropertyGroup serializers use: attributes,
+    and `in` for which IDProperties exist"""
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    def __contains__(self, key):
+        return key in self.__dict__
+
+class Entries(list):
+    def foreach_get(self, key, flat):
+        values = []
+        for entry in self:
+            value = getattr(entry, key)
+            values.extend(value if isinstance(value, list) else [value])
+        flat[:] = array(flat.typecode, values) if isinstance(flat, array) else values
+
+TEAM = "test_components::Team"
+TEAM_MEMBER = "test_components::TeamMember"
+OPTION = "core::option::Option<alloc::string::String>"
+RICH_ENUM = "test_components::RichAndUnitEnum"
+MULTI_TUPLE = "test_components::MultiElementTupleStruct"
+FLOATS = "alloc::vec::Vec<f32>"
+ENTITIES = "alloc::vec::Vec<bevy_ecs::entity::Entity>"
+TRANSFORM = "bevy_transform::components::transform::Transform"
+
+class TestClass:
+    def setup_method(self):
+        set_serializer_specs(component_tests_specs())
+
+    def test_struct_with_group(self):
+        container = Group(t=Group(
+            player=Group(name="Chris", power=1.5, test=3),
+            team="Blue",
+        ))
+        assert serialize_component(container, "t", TEAM_MEMBER) == {
+            "player": {"name": "Chris", "power": 1.5, "test": 3},
+            "team": "Blue",
+        }
+
+    def test_untouched_groups(self):
+        assert serialize_component(Group(), "t", TEAM_MEMBER) == {}
+        container = Group(t=Group(team="Red"))
+        assert serialize_component(container, "t", TEAM_MEMBER) == {"player": {}, "team": "Red"}
+
+    def test_scalar_component(self):
+        assert serialize_component(Group(t="Red"), "t", TEAM) == "Red"
+
+    def test_option(self):
+        none = Group(skein_enum_index="None", Some="")
+        some = Group(skein_enum_index="Some", Some="name")
+        assert serialize_component(Group(o=none), "o", OPTION) is None
+        assert serialize_component(Group(o=some), "o", OPTION) == "name"
+
+    def test_enum(self):
+        unit = Group(skein_enum_index="NotAPlayer")
+        player = Group(skein_enum_index="Player", Player=Group(name="r", power=2.0, test=1))
+        assert serialize_component(Group(e=unit), "e", RICH_ENUM) == "NotAPlayer"
+        assert serialize_component(Group(e=player), "e", RICH_ENUM) == {"Player": {"name": "r", "power": 2.0, "test": 1}}
+
+    def test_positional(self):
+        value = Group(**{"0": 12, "1": [1.0, 2.0, 3.0], "2": 2, "3": "testing"})
+        assert serialize_component(Group(p=value), "p", MULTI_TUPLE) == [12, [1.0, 2.0, 3.0], 2, "testing"]
+
+    def test_glam_layout(self):
+        transform = Group(rotation=[1.0, 0.0, 0.0, 0.0], scale=[1.0, 1.0, 1.0], translation=[1.0, 2.0, 3.0])
+        # quaternions are exported in glam's x, y, z, w order
+        assert serialize_component(Group(t=transform), "t", TRANSFORM) == {
+            "rotation": [0.0, 0.0, 0.0, 1.0],
+            "scale": [1.0, 1.0, 1.0],
+            "translation": [1.0, 2.0, 3.0],
+        }
+
+    def test_collections(self):
+        floats = Group(entries=Entries([Group(value=0.5), Group(value=2.0)]))
+        assert serialize_component(Group(v=floats), "v", FLOATS) == [0.5, 2.0]
+
+        teams = Group(entries=Entries([Group(key=7, value="Blue")]))
+        assert serialize_component(Group(m=teams), "m", MAP_TYPE_PATH) == {"7": "Blue"}
+
+    def test_force_default(self):
+        assert serialize_component(Group(e=Group()), "e", ENTITIES) == []
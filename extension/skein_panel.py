@@ -1,8 +1,9 @@
 import bpy # type: ignore
-import json
 import inspect
 
-from .property_groups import hash_over_64
+from .collection_values import ENTRIES_FIELD, KEY_FIELD, VALUE_FIELD
+from .type_names import field_name
+from .registry_state import get_registry
 
 # ---------------------------------- #
 #  Skein Panel for adding components #
@@ -126,10 +127,7 @@ class SkeinPanelBone(bpy.types.Panel):
 
 def draw_generic_panel(context, obj, layout, execute_mode, skein_preset_panel_id):
         
-        global_skein = context.window_manager.skein
-        # TODO: the registry can likely be loaded into a dict in a less
-        # common place. This function runs every draw
-        registry = json.loads(global_skein.registry)
+        registry = get_registry()
         skein_property_groups = context.window_manager.skein_property_groups
 
         if not registry:
@@ -157,14 +155,13 @@ def draw_generic_panel(context, obj, layout, execute_mode, skein_preset_panel_id
 
             layout.label(text="Insert a new Component")
             box = layout.box()
-            box.prop_search(
+            box.prop(
                 context.window_manager,
                 'selected_component',
-                global_skein,
-                "components",
                 text="type",
                 icon="BOIDS"
             )
+            box.prop(context.window_manager, "selected_component_crate", text="crate")
 
             row = box.row()
             row.operator(execute_mode + ".insert_component")
@@ -204,13 +201,19 @@ def draw_generic_panel(context, obj, layout, execute_mode, skein_preset_panel_id
             row = layout.row()
             row.separator()
 
-            if inspect.isclass(skein_property_groups[type_path]):
-                if hash_over_64(type_path) not in active_component_data:
+            if type_path not in skein_property_groups:
+                # lazy registry processing skipped this component,
+                # or the component isn't in the registry
+                layout.label(text=active_component_data.name + " has no editor yet")
+                layout.operator("wm.skein_materialize_components")
+            elif inspect.isclass(skein_property_groups[type_path]):
+                name = field_name(type_path)
+                if name not in active_component_data:
                     layout.label(text=active_component_data.name + " has no data to edit")
                 else:
-                    render_two(layout, active_component_data, hash_over_64(type_path))
+                    render_two(layout, active_component_data, name)
             else:
-                layout.prop(active_component_data, hash_over_64(type_path))
+                layout.prop(active_component_data, field_name(type_path))
 
 def render_two(layout, context, context_key):
     if context_key not in context:
@@ -235,6 +238,15 @@ def render_two(layout, context, context_key):
     # and their value types for this PropertyGroup
     annotations = getattr(obj, "__annotations__")
 
+    # Lists, Sets, and Maps hold their values in a CollectionProperty
+    try:
+        collection = obj.collection
+    except AttributeError:
+        collection = None
+    if collection is not None:
+        render_collection(layout, obj, annotations, collection)
+        return
+
     # Handle core::option::Option specially, before other enums
     # because "None" and "Some" have special meaning: null and "just the value"
     try:
@@ -276,167 +288,36 @@ def render_two(layout, context, context_key):
                     layout.prop(obj, value)
         return
 
-    # attempt to handle any type overrides, like glam::Vec3
-    # Currently all of the types here are *also* hardcoded 
-    # because their serialization format differs from their
-    # reflection data. That means this handling is unlikely 
-    # to change. If it does, we need to ship a new version 
-    # of the addon anyway.
-    try:
-        match obj.type_override:
-            case "glam::Vec2" | "glam::DVec2" | "glam::I8Vec2" | "glam::U8Vec2" | "glam::I16Vec2" | "glam::U16Vec2" | "glam::IVec2" | "glam::UVec2" | "glam::I64Vec2" | "glam::U64Vec2" | "glam::BVec2":
-                col = layout.column(align=True)
-                col.label(text=context_key + ":")
-                col.prop(obj, "x")
-                col.prop(obj, "y")
-                return
-            case "glam::Vec3" | "glam::Vec3A" | "glam::DVec3" | "glam::I8Vec3" | "glam::U8Vec3" | "glam::I16Vec3" | "glam::U16Vec3" | "glam::IVec3" | "glam::UVec3" | "glam::I64Vec3" | "glam::U64Vec3" | "glam::BVec3":
-                col = layout.column(align=True)
-                col.label(text=context_key + ":")
-                col.prop(obj, "x")
-                col.prop(obj, "y")
-                col.prop(obj, "z")
-                return
-            case "glam::Vec4" | "glam::DVec4" | "glam::I8Vec4" | "glam::U8Vec4" | "glam::I16Vec4" | "glam::U16Vec4" | "glam::IVec4" | "glam::UVec4" | "glam::I64Vec4" | "glam::U64Vec4" | "glam::BVec4":
-                col = layout.column(align=True)
-                col.label(text=context_key + ":")
-                col.prop(obj, "x")
-                col.prop(obj, "y")
-                col.prop(obj, "z")
-                col.prop(obj, "w")
-                return
-            case "glam::Quat" | "glam::DQuat":
-                col = layout.column(align=True)
-                col.label(text=context_key + ":")
-                col.prop(obj, "x")
-                col.prop(obj, "y")
-                col.prop(obj, "z")
-                col.prop(obj, "w")
-                return
-    #         case "glam::Mat2" | "glam::DMat2":
-    #             x_axis = getattr(obj, "x_axis")
-    #             y_axis = getattr(obj, "y_axis")
-                
-    #             return [
-    #                 getattr(x_axis, "x"),
-    #                 getattr(x_axis, "y"),
-
-    #                 getattr(y_axis, "x"),
-    #                 getattr(y_axis, "y"),
-    #             ]
-
-    #         case "glam::Mat3" | "glam::Mat3A" | "glam::DMat3":
-    #             x_axis = getattr(obj, "x_axis")
-    #             y_axis = getattr(obj, "y_axis")
-    #             z_axis = getattr(obj, "z_axis")
-                
-    #             return [
-    #                 getattr(x_axis, "x"),
-    #                 getattr(x_axis, "y"),
-    #                 getattr(x_axis, "z"),
-
-    #                 getattr(y_axis, "x"),
-    #                 getattr(y_axis, "y"),
-    #                 getattr(y_axis, "z"),
-
-    #                 getattr(z_axis, "x"),
-    #                 getattr(z_axis, "y"),
-    #                 getattr(z_axis, "z"),
-    #             ]
-    #         case "glam::Mat4" | "glam::DMat4":
-    #             x_axis = getattr(obj, "x_axis")
-    #             y_axis = getattr(obj, "y_axis")
-    #             z_axis = getattr(obj, "z_axis")
-    #             w_axis = getattr(obj, "w_axis")
-                
-    #             return [
-    #                 getattr(x_axis, "x"),
-    #                 getattr(x_axis, "y"),
-    #                 getattr(x_axis, "z"),
-    #                 getattr(x_axis, "w"),
-
-    #                 getattr(y_axis, "x"),
-    #                 getattr(y_axis, "y"),
-    #                 getattr(y_axis, "z"),
-    #                 getattr(y_axis, "w"),
-
-    #                 getattr(z_axis, "x"),
-    #                 getattr(z_axis, "y"),
-    #                 getattr(z_axis, "z"),
-    #                 getattr(z_axis, "w"),
-
-    #                 getattr(w_axis, "x"),
-    #                 getattr(w_axis, "y"),
-    #                 getattr(w_axis, "z"),
-    #                 getattr(w_axis, "w"),
-    #             ]
-  
-    #         case "glam::Affine2" | "glam::DAffine2":
-    #             mat = getattr(obj, "matrix2")
-    #             x_axis = getattr(mat, "x_axis")
-    #             y_axis = getattr(mat, "y_axis")
-    #             translation = getattr(obj, "translation")
-                
-    #             return [
-    #                 getattr(x_axis, "x"),
-    #                 getattr(x_axis, "y"),
-    #                 getattr(y_axis, "x"),
-    #                 getattr(y_axis, "y"),
-    #                 getattr(translation, "x"),
-    #                 getattr(translation, "y"),
-    #             ]
-    #         case "glam::Affine3A" | "glam::DAffine3":
-    #             mat = getattr(obj, "matrix3")
-    #             x_axis = getattr(mat, "x_axis")
-    #             y_axis = getattr(mat, "y_axis")
-    #             z_axis = getattr(mat, "z_axis")
-    #             translation = getattr(obj, "translation")
-                
-    #             return [
-    #                 getattr(x_axis, "x"),
-    #                 getattr(x_axis, "y"),
-    #                 getattr(x_axis, "z"),
-    #                 getattr(y_axis, "x"),
-    #                 getattr(y_axis, "y"),
-    #                 getattr(y_axis, "z"),
-    #                 getattr(z_axis, "x"),
-    #                 getattr(z_axis, "y"),
-    #                 getattr(z_axis, "z"),
-    #                 getattr(translation, "x"),
-    #                 getattr(translation, "y"),
-    #                 getattr(translation, "z"),
-    #             ]
-            
-    except AttributeError:
-        # Not all PropertyGroups have the type_override attribute, so
-        # this is a common failure case that doesn't actually mean failure
-        pass
-
     # No more special handling, just take the keys and values that are
     # in the annotations, and plug them into the object
     for key, value in annotations.items():
         if "PointerProperty" == value.function.__name__:
-            try:
-                next_type = getattr(obj, key)
-                match next_type.type_override:
-                    case "glam::Vec2" | "glam::DVec2" | "glam::I8Vec2" | "glam::U8Vec2" | "glam::I16Vec2" | "glam::U16Vec2" | "glam::IVec2" | "glam::UVec2" | "glam::I64Vec2" | "glam::U64Vec2" | "glam::BVec2":
-                        render_two(layout, obj, key)
-                    case "glam::Vec3" | "glam::Vec3A" | "glam::DVec3" | "glam::I8Vec3" | "glam::U8Vec3" | "glam::I16Vec3" | "glam::U16Vec3" | "glam::IVec3" | "glam::UVec3" | "glam::I64Vec3" | "glam::U64Vec3" | "glam::BVec3":
-                        render_two(layout, obj, key)
-                    case "glam::Vec4" | "glam::DVec4" | "glam::I8Vec4" | "glam::U8Vec4" | "glam::I16Vec4" | "glam::U16Vec4" | "glam::IVec4" | "glam::UVec4" | "glam::I64Vec4" | "glam::U64Vec4" | "glam::BVec4":
-                        render_two(layout, obj, key)
-                    case "glam::Quat" | "glam::DQuat":
-                        render_two(layout, obj, key)
-                    case _:
-                        layout.label(text=key + ":")
-                        render_two(layout.box(), obj, key)
-            except AttributeError:
-                layout.label(text=key + ":")
-                render_two(layout.box(), obj, key)
+            layout.label(text=key + ":")
+            render_two(layout.box(), obj, key)
         else:
             layout.prop(obj, key)
     return
 
+def render_collection(layout, obj, annotations, collection):
+    entry_annotations = annotations[ENTRIES_FIELD].keywords["type"].__annotations__
+    is_group = "PointerProperty" == entry_annotations[VALUE_FIELD].function.__name__
+
+    # the add/remove operators read the collection from the context
+    layout.context_pointer_set("skein_collection", obj)
+    for index, entry in enumerate(getattr(obj, ENTRIES_FIELD)):
+        row = layout.row()
+        if collection == "map":
+            row.prop(entry, KEY_FIELD, text="")
+        else:
+            row.label(text=str(index) + ":")
+        if is_group:
+            row.operator("wm.skein_remove_collection_entry", text="", icon="X").index = index
+            render_two(layout.box(), entry, VALUE_FIELD)
+        else:
+            row.prop(entry, VALUE_FIELD, text="")
+            row.operator("wm.skein_remove_collection_entry", text="", icon="X").index = index
+    layout.operator("wm.skein_add_collection_entry", icon="ADD")
+
 classes = (
     SkeinPanelObject,
     SkeinPanelMesh,
@@ -1,5 +1,7 @@
 import bpy # type: ignore
-import json
+
+from .presets_cache import PRESETS_TEXT_NAME, preset_names
+from .registry_state import get_registry
 
 # ---------------------------------- #
 #  Skein Panel for adding components #
@@ -17,7 +19,7 @@ class SkeinPanelPresetsObject(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        return bpy.ops.object.insert_component.poll() and "skein-presets.json" in bpy.data.texts
+        return bpy.ops.object.insert_component.poll() and PRESETS_TEXT_NAME in bpy.data.texts
 
     def draw(self, context):
         obj = context.object
@@ -33,7 +35,7 @@ class SkeinPanelPresetsMesh(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        return bpy.ops.mesh.insert_component.poll() and "skein-presets.json" in bpy.data.texts
+        return bpy.ops.mesh.insert_component.poll() and PRESETS_TEXT_NAME in bpy.data.texts
 
     def draw(self, context):
         obj = context.mesh
@@ -49,7 +51,7 @@ class SkeinPanelPresetsMaterial(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        return bpy.ops.material.insert_component.poll() and "skein-presets.json" in bpy.data.texts
+        return bpy.ops.material.insert_component.poll() and PRESETS_TEXT_NAME in bpy.data.texts
 
     def draw(self, context):
         obj = context.material
@@ -65,7 +67,7 @@ class SkeinPanelPresetsScene(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        return bpy.ops.scene.insert_component.poll() and "skein-presets.json" in bpy.data.texts
+        return bpy.ops.scene.insert_component.poll() and PRESETS_TEXT_NAME in bpy.data.texts
 
     def draw(self, context):
         obj = context.scene
@@ -81,7 +83,7 @@ class SkeinPanelPresetsLight(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        return bpy.ops.light.insert_component.poll() and "skein-presets.json" in bpy.data.texts
+        return bpy.ops.light.insert_component.poll() and PRESETS_TEXT_NAME in bpy.data.texts
 
     def draw(self, context):
         obj = context.light
@@ -97,7 +99,7 @@ class SkeinPanelPresetsCollection(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        return bpy.ops.collection.insert_component.poll() and "skein-presets.json" in bpy.data.texts
+        return bpy.ops.collection.insert_component.poll() and PRESETS_TEXT_NAME in bpy.data.texts
 
     def draw(self, context):
         obj = context.collection
@@ -113,7 +115,7 @@ class SkeinPanelPresetsBone(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        return bpy.ops.bone.insert_component.poll() and "skein-presets.json" in bpy.data.texts
+        return bpy.ops.bone.insert_component.poll() and PRESETS_TEXT_NAME in bpy.data.texts
 
     def draw(self, context):
         # we use context.bone because context.active_bone will return 
@@ -122,22 +124,19 @@ class SkeinPanelPresetsBone(bpy.types.Panel):
         draw_generic_panel(context, obj, self.layout, "bone")
 
 def draw_generic_panel(context, obj, layout, execute_mode):
-    global_skein = context.window_manager.skein
-    # TODO: the registry can likely be loaded into a dict in a less
-    # common place. This function runs every draw
-    registry = json.loads(global_skein.registry)
+    registry = get_registry()
     obj_skein = obj.skein_two
 
-    presets = json.loads(bpy.data.texts["skein-presets.json"].as_string())
     if registry and obj_skein:
         active_component_data = obj_skein[obj.active_component_index]
         type_path = active_component_data.selected_type_path
-        if type_path in presets:
+        names = preset_names(type_path)
+        if names:
             
             layout.emboss = 'PULLDOWN_MENU'
             layout.operator_context = 'EXEC_DEFAULT'
 
-            for key in presets[type_path].keys():
+            for key in names:
                 op = layout.operator(execute_mode + ".apply_preset", text=key)
                 op.preset_id = key
 
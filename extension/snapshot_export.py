@@ -0,0 +1,169 @@
+from .collection_values import ENTRIES_FIELD, KEY_FIELD, VALUE_FIELD, to_map_key
+from .glam_types import VECTOR_PROPERTIES, to_glam
+from .serializers import serialize_component, serializer_specs
+from .type_names import field_name
+
+# --------------------------------- #
+#  Exporting components from        #
+#  IDProperty snapshots             #
+# --------------------------------- #
+#
+# Component data is stored in IDProperties. Reading it through RNA
+# (getattr on PropertyGroups) costs a lookup per field, so exports
+# take a plain dict copy of every component on a datablock with
+# `to_dict()` and reshape that into Bevy's reflect format using
+# the compiled specs.
+#
+# The raw IDProperty data is not quite what RNA returns:
+#
+# - EnumProperty values are stored as the index of the item
+# - BoolProperty values are stored as ints
+# - fields that were never set are missing, and get the
+#   property's default, like RNA would return
+#
+# Nothing in this module touches bpy.
+
+def component_snapshots(source):
+    """a plain dict copy of each component in source.skein_two, or None
+    if the raw IDProperties can't be read"""
+    try:
+        groups = source.get("skein_two")
+    except (AttributeError, TypeError):
+        return None
+    if groups is None:
+        return None
+    try:
+        snapshots = [group.to_dict() for group in groups]
+    except AttributeError:
+        return None
+    if len(snapshots) != len(source.skein_two):
+        return None
+    return snapshots
+
+def serialize_snapshot(snapshot, container, type_path):
+    """the json data of a component, read from a snapshot when possible
+
+    Falls back to serialize_component(container, ...) when there is
+    no snapshot or no spec for the type_path.
+
+    @param: snapshot the component's entry in component_snapshots, or None
+    @param: container the component's ComponentContainer
+    """
+    specs = serializer_specs()
+    spec = specs.get(type_path)
+    if snapshot is None or spec is None:
+        return serialize_component(container, field_name(type_path), type_path)
+    if spec["kind"] == "class":
+        spec = {"kind": "group", "type_path": type_path}
+    return reshape(spec, snapshot.get(field_name(type_path)), specs)
+
+def reshape(spec, value, specs):
+    """the json value of raw IDProperty data stored for a field
+
+    @param: value the raw data, None if the field was never set
+    """
+    if spec["kind"] == "group":
+        if value is None:
+            # PointerProperty fields that were never accessed
+            return {}
+        return reshape_class(specs[spec["type_path"]], value, specs)
+    return reshape_property(spec, value)
+
+def reshape_class(spec, data, specs):
+    annotations = spec["annotations"]
+    markers = spec["markers"]
+
+    if "skein_enum_index" in annotations:
+        variant = reshape_property(annotations["skein_enum_index"], data.get("skein_enum_index"))
+        if markers.get("is_core_option"):
+            match variant:
+                case "None":
+                    return None
+                case "Some":
+                    return reshape(annotations["Some"], data.get("Some"), specs)
+        field = annotations.get(variant)
+        if field is None:
+            # unit variants are just their name
+            return variant
+        return {variant: reshape(field, data.get(variant), specs)}
+
+    match markers.get("force_default"):
+        case "object":
+            return {}
+        case "list":
+            return []
+
+    collection = markers.get("collection")
+    if collection is not None:
+        entry_annotations = specs[annotations[ENTRIES_FIELD]["type_path"]]["annotations"]
+        value_spec = entry_annotations[VALUE_FIELD]
+        entries = data.get(ENTRIES_FIELD) or []
+        if collection == "map":
+            key_spec = entry_annotations[KEY_FIELD]
+            return {
+                to_map_key(reshape(key_spec, entry.get(KEY_FIELD), specs)): reshape(value_spec, entry.get(VALUE_FIELD), specs)
+                for entry in entries
+            }
+        return [reshape(value_spec, entry.get(VALUE_FIELD), specs) for entry in entries]
+
+    if markers.get("positional"):
+        return [
+            reshape(field, data.get(key), specs)
+            for key, field in annotations.items()
+            if field is not None
+        ]
+
+    return {
+        key: reshape(field, data.get(key), specs)
+        for key, field in annotations.items()
+        if field is not None
+    }
+
+def reshape_property(spec, value):
+    """the json value of a raw IDProperty value stored for a property spec"""
+    property = spec["property"]
+    options = spec["options"]
+    if value is None:
+        value = property_default(property, options)
+    elif property == "EnumProperty":
+        value = enum_identifier(options, value)
+    elif property == "BoolProperty":
+        value = bool(value)
+    elif property == "BoolVectorProperty":
+        value = [bool(component) for component in value]
+
+    if property in VECTOR_PROPERTIES:
+        return to_glam(options.get("subtype"), value)
+    return value
+
+def enum_identifier(options, value):
+    """the identifier of an enum item from the index it's stored as"""
+    if isinstance(value, str):
+        return value
+    items = options.get("items", [])
+    if 0 <= value < len(items):
+        return items[value][0]
+    return property_default("EnumProperty", options)
+
+def property_default(property, options):
+    """the value RNA returns for a property that was never set"""
+    if "default" in options:
+        return options["default"]
+    match property:
+        case "EnumProperty":
+            items = options.get("items", [])
+            return items[0][0] if items else ""
+        case "StringProperty":
+            return ""
+        case "FloatProperty":
+            return 0.0
+        case "IntProperty":
+            return 0
+        case "BoolProperty":
+            return False
+        case "FloatVectorProperty":
+            return [0.0] * options.get("size", 3)
+        case "IntVectorProperty":
+            return [0] * options.get("size", 3)
+        case "BoolVectorProperty":
+            return [False] * options.get("size", 3)
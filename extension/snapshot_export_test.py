@@ -0,0 +1,94 @@
+from .serializers import set_serializer_specs
+from .snapshot_export import component_snapshots, property_default, reshape_property, serialize_snapshot
+from .spec_fixtures import MAP_TYPE_PATH, component_tests_specs
+from .type_names import field_name
+
+PLAYER = "test_components::Player"
+TEAM = "test_components::Team"
+TEAM_MEMBER = "test_components::TeamMember"
+OPTIONAL_NAME = "test_components::AnOptionalName"
+RICH_ENUM = "test_components::RichAndUnitEnum"
+LONG_NAME = "test_components::ThisIsOverThePythonKeyLengthLimitForBlenderProperties"
+TRANSFORM = "bevy_transform::components::transform::Transform"
+NON_ZERO = "test_components::NonZeroNumbers"
+FLOATS = "alloc::vec::Vec<f32>"
+MULTI_TUPLE = "test_components::MultiElementTupleStruct"
+
+def snapshot(type_path, data):
+    """a component snapshot holding data for type_path"""
+    return {field_name(type_path): data}
+
+class TestClass:
+    def setup_method(self):
+        set_serializer_specs(component_tests_specs())
+
+    def test_enums_are_stored_as_indices(self):
+        data = {"player": {"name": "Chris", "power": 1.5, "test": 3}, "team": 2}
+        assert serialize_snapshot(snapshot(TEAM_MEMBER, data), None, TEAM_MEMBER) == {
+            "player": {"name": "Chris", "power": 1.5, "test": 3},
+            "team": "Blue",
+        }
+        assert serialize_snapshot(snapshot(TEAM, 0), None, TEAM) == "Green"
+
+    def test_bools_are_stored_as_ints(self):
+        data = {"are_you_feeling_it_now_mr_krabs": 1, "im_ready_im_ready_im_ready": "yes"}
+        assert serialize_snapshot(snapshot(LONG_NAME, data), None, LONG_NAME) == {
+            "are_you_feeling_it_now_mr_krabs": True,
+            "im_ready_im_ready_im_ready": "yes",
+        }
+
+    def test_missing_fields_use_defaults(self):
+        assert serialize_snapshot({}, None, TEAM) == "Green"
+        assert serialize_snapshot({}, None, TEAM_MEMBER) == {}
+        assert serialize_snapshot(snapshot(TEAM_MEMBER, {"player": {}}), None, TEAM_MEMBER) == {
+            "player": {"name": "", "power": 0.0, "test": 0},
+            "team": "Green",
+        }
+        # NonZero types default to 1
+        assert serialize_snapshot(snapshot(NON_ZERO, {}), None, NON_ZERO) == {"an_int": 1, "small": 1}
+
+    def test_option(self):
+        assert serialize_snapshot(snapshot(OPTIONAL_NAME, {"name": {}}), None, OPTIONAL_NAME) == {"name": None}
+        data = {"name": {"skein_enum_index": 1, "Some": "Chris"}}
+        assert serialize_snapshot(snapshot(OPTIONAL_NAME, data), None, OPTIONAL_NAME) == {"name": "Chris"}
+
+    def test_enum_variants(self):
+        assert serialize_snapshot(snapshot(RICH_ENUM, {"skein_enum_index": 1}), None, RICH_ENUM) == "NotAPlayer"
+        data = {"skein_enum_index": 0, "Player": {"name": "a", "power": 2.0, "test": 1}}
+        assert serialize_snapshot(snapshot(RICH_ENUM, data), None, RICH_ENUM) == {
+            "Player": {"name": "a", "power": 2.0, "test": 1},
+        }
+
+    def test_glam_layout(self):
+        data = {"rotation": [1.0, 0.0, 0.0, 0.0], "translation": [1.0, 2.0, 3.0]}
+        assert serialize_snapshot(snapshot(TRANSFORM, data), None, TRANSFORM) == {
+            "rotation": [0.0, 0.0, 0.0, 1.0],
+            "scale": [0.0, 0.0, 0.0],
+            "translation": [1.0, 2.0, 3.0],
+        }
+
+    def test_positional(self):
+        data = {"0": 12, "1": [1.0, 2.0, 3.0], "3": "testing"}
+        assert serialize_snapshot(snapshot(MULTI_TUPLE, data), None, MULTI_TUPLE) == [12, [1.0, 2.0, 3.0], 0, "testing"]
+
+    def test_collections(self):
+        floats = {"entries": [{"value": 0.5}, {}]}
+        assert serialize_snapshot(snapshot(FLOATS, floats), None, FLOATS) == [0.5, 0.0]
+        teams = {"entries": [{"key": 3, "value": 2}]}
+        assert serialize_snapshot(snapshot(MAP_TYPE_PATH, teams), None, MAP_TYPE_PATH) == {"3": "Blue"}
+
+    def test_property_defaults(self):
+        assert property_default("IntProperty", {"default": 1}) == 1
+        assert property_default("BoolVectorProperty", {"size": 2}) == [False, False]
+        assert reshape_property(component_tests_specs()[TEAM], 7) == "Green"
+
+    def test_component_snapshots(self):
+        class Group(dict):
+            def to_dict(self):
+                return dict(self)
+        class Source(dict):
+            skein_two = [1, 2]
+        assert component_snapshots(Source(skein_two=[Group(a=1), Group(b=2)])) == [{"a": 1}, {"b": 2}]
+        # out of sync with the collection, so RNA is used instead
+        assert component_snapshots(Source(skein_two=[Group(a=1)])) is None
+        assert component_snapshots(Source()) is None
@@ -0,0 +1,45 @@
+import json
+
+from .property_groups import compile_registry
+
+# --------------------------------- #
+#  Specs for tests, compiled from   #
+#  registry json                    #
+# --------------------------------- #
+#
+# Tests of code that reads specs (serializers, snapshot exports,
+# the component writer) use specs compile_registry produced, so
+# they test against what a processed registry really holds.
+
+# examples/component_tests.json has no Map with keys that can be
+# edited, so this adds one in the same schema format
+MAP_TYPE_PATH = "std::collections::HashMap<u8, test_components::Team>"
+MAP_REGISTRY = {
+    MAP_TYPE_PATH: {
+        "kind": "Map",
+        "type": "object",
+        "typePath": MAP_TYPE_PATH,
+        "shortPath": "HashMap<u8, Team>",
+        "keyType": {"type": {"$ref": "#/$defs/u8"}},
+        "valueType": {"type": {"$ref": "#/$defs/test_components::Team"}},
+    },
+}
+
+_specs = {}
+
+def compile_specs(registry):
+    """the specs for every type in a registry"""
+    specs = {}
+    compile_registry(specs, registry, list(registry), {}, {})
+    return specs
+
+def component_tests_specs():
+    """the specs for examples/component_tests.json, and MAP_TYPE_PATH
+
+    Compiled once, don't mutate them.
+    """
+    if not _specs:
+        with open("./examples/component_tests.json") as registry_json:
+            registry = json.loads(registry_json.read())
+        _specs.update(compile_specs({**registry, **MAP_REGISTRY}))
+    return _specs
@@ -0,0 +1,75 @@
+import base64
+import hashlib
+import re
+
+# --------------------------------- #
+#  Names derived from type_paths:   #
+#  ComponentContainer field names   #
+#  and PropertyGroup class names    #
+# --------------------------------- #
+#
+# Panels, exports, and operators look these up constantly, so
+# they're computed once per type_path (when a registry is
+# processed, see build_type_names) instead of re-hashing on
+# every call.
+#
+# Nothing in this module touches bpy.
+
+# capitalize a word without lowercasing the result
+# of the word. This means TeamMember stays and doesn't
+# turn into Teammember
+def cap(val):
+  return val[0].upper() + val[1:]
+
+def capitalize_path(s):
+    return "".join(map(cap, re.split('[:_]+', s)))
+
+# PropertyGroup classes can't be more than 64 characters,
+# so try to squeeze under the limit by hashing the capitalized
+# paths.
+def hash_type_path(data):
+    m = hashlib.md5(data.encode('ascii'))
+    base64_bytes = base64.b16encode(m.digest())
+    output = base64_bytes.decode("ascii")
+    return "SKEIN_" + output
+
+# hash a type_path if its length is over 63, which can 
+# cause classes to fail to register
+def hash_over_64(type_path):
+    maybe_hashed_type_path = type_path
+    if len(type_path) > 63:
+        maybe_hashed_type_path = hash_type_path(type_path)
+    
+    return maybe_hashed_type_path
+
+_field_names = {}
+_class_names = {}
+
+def build_type_names(type_paths):
+    """compute the names for every type_path in a registry up front"""
+    _field_names.clear()
+    _class_names.clear()
+    for type_path in type_paths:
+        _field_names[type_path] = hash_over_64(type_path)
+        _class_names[type_path] = hash_type_path(capitalize_path(type_path))
+
+def field_name(type_path):
+    """the ComponentContainer field that holds a component's data
+
+    Same as hash_over_64, but looked up instead of re-computed.
+    """
+    try:
+        return _field_names[type_path]
+    except KeyError:
+        # type_paths that aren't in the registry, like components
+        # stored in a .blend file that no longer exist in Bevy
+        name = _field_names[type_path] = hash_over_64(type_path)
+        return name
+
+def class_name(type_path):
+    """the name of the PropertyGroup class generated for a type_path"""
+    try:
+        return _class_names[type_path]
+    except KeyError:
+        name = _class_names[type_path] = hash_type_path(capitalize_path(type_path))
+        return name
@@ -0,0 +1,16 @@
+from .type_names import build_type_names, class_name, field_name, hash_over_64, hash_type_path, capitalize_path
+
+class TestClass:
+    def test_field_name(self):
+        long_path = "avian3d::dynamics::rigid_body::mass_properties::components::Mass"
+        build_type_names(["test_components::Player", long_path])
+        assert field_name("test_components::Player") == "test_components::Player"
+        assert field_name(long_path) == hash_over_64(long_path)
+        assert field_name(long_path).startswith("SKEIN_")
+
+    def test_unknown_type_paths(self):
+        build_type_names([])
+        # type_paths that weren't in the registry are still named
+        assert field_name("test_components::Player") == "test_components::Player"
+        assert class_name("component_tests::Player") == hash_type_path(capitalize_path("component_tests::Player"))
+        assert class_name("component_tests::Player") == "SKEIN_98E71DE56C8EFC57C6540F48FDA45A5E"
@@ -46,6 +46,15 @@ use tracing::{instrument, warn};
 ))]
 pub mod presets;
 
+/// The `skein/registry_hash` BRP method, which
+/// lets Blender skip downloading a registry that
+/// hasn't changed since it was last fetched.
+#[cfg(all(
+    not(target_family = "wasm"),
+    feature = "brp"
+))]
+pub mod registry_hash;
+
 const EXTENSION: &str = "BEVY_skein";
 
 /// [`SkeinPlugin`] is the main plugin.
@@ -141,15 +150,21 @@ impl Plugin for SkeinPlugin {
     ))]
     #[instrument(skip(self, app))]
     fn finish(&self, app: &mut App) {
+        // skein's custom BRP endpoints
+        #[allow(unused_mut)]
+        let mut methods = vec![(
+            registry_hash::BRP_SKEIN_REGISTRY_HASH_METHOD,
+            bevy_remote::RemoteMethodSystemId::Instant(
+                app.main_mut().world_mut().register_system(
+                    registry_hash::export_registry_hash,
+                ),
+            ),
+        )];
+
+        // add presets endpoint
+        #[cfg(feature = "presets")]
         {
-            // add presets endpoint
-            #[cfg(feature = "presets")]
-            {
-                bevy_log::debug!(
-                    "enabling {} endpoint",
-                    presets::BRP_SKEIN_PRESETS_METHOD
-                );
-                let presets_id =
+            let presets_id =
                 bevy_remote::RemoteMethodSystemId::Instant(
                     app.main_mut()
                         .world_mut()
@@ -157,35 +172,39 @@ impl Plugin for SkeinPlugin {
                             presets::export_presets,
                         ),
                 );
-                let remote_methods = app
-                    .world_mut()
-                    .get_resource_mut::<bevy_remote::RemoteMethods>(
+            methods.push((
+                presets::BRP_SKEIN_PRESETS_METHOD,
+                presets_id,
+            ));
+        }
+
+        let remote_methods = app
+            .world_mut()
+            .get_resource_mut::<bevy_remote::RemoteMethods>();
+        if let Some(mut remote_methods) = remote_methods {
+            for (method, id) in methods {
+                bevy_log::debug!(
+                    "enabling {} endpoint",
+                    method
                 );
-                if let Some(mut remote_methods) =
-                    remote_methods
-                {
-                    remote_methods.insert(
-                        presets::BRP_SKEIN_PRESETS_METHOD,
-                        presets_id,
-                    );
+                remote_methods.insert(method, id);
+            }
+        } else {
+            warn!(
+                "bevy_remote::RemoteMethods Resource was not found. Skein can not add custom endpoints without this Resource. `SkeinPlugin::handle_brp` is `{}`, which means `{}` is responsible for adding `bevy_remote::RemotePlugin` and `bevy_remote::http::RemoteHttpPlugin`. {}",
+                self.handle_brp,
+                if self.handle_brp {
+                    "skein"
                 } else {
-                    warn!(
-                        "bevy_remote::RemoteMethods Resource was not found. Skein can not add custom endpoints without this Resource. `SkeinPlugin::handle_brp` is `{}`, which means `{}` is responsible for adding `bevy_remote::RemotePlugin` and `bevy_remote::http::RemoteHttpPlugin`. {}",
-                        self.handle_brp,
-                        if self.handle_brp {
-                            "skein"
-                        } else {
-                            "the user"
-                        },
-                        if self.handle_brp {
-                            // if skein was supposed to add the plugins and didn't, then this is likely a skein bug
-                            "This is likely a bug: https://github.com/rust-adventure/skein/issues"
-                        } else {
-                            ""
-                        }
-                    );
+                    "the user"
+                },
+                if self.handle_brp {
+                    // if skein was supposed to add the plugins and didn't, then this is likely a skein bug
+                    "This is likely a bug: https://github.com/rust-adventure/skein/issues"
+                } else {
+                    ""
                 }
-            }
+            );
         }
     }
 }
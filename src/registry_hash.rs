@@ -0,0 +1,95 @@
+use bevy_ecs::{system::In, world::World};
+use serde_json::Value;
+
+use bevy_remote::{
+    BrpResult, builtin_methods::export_registry_types,
+};
+
+/// The method path for a `skein/registry_hash`
+/// request.
+pub const BRP_SKEIN_REGISTRY_HASH_METHOD: &str =
+    "skein/registry_hash";
+
+/// Handles a `skein/registry_hash` request coming
+/// from a client.
+///
+/// Takes the same params as the registry schema
+/// method and responds with a fingerprint of the
+/// schema that method would respond with. Blender
+/// uses this to skip downloading and re-processing
+/// a registry that hasn't changed.
+pub fn export_registry_hash(
+    In(params): In<Option<Value>>,
+    world: &World,
+) -> BrpResult {
+    let schema = export_registry_types(In(params), world)?;
+
+    let mut hasher = Fnv1a::default();
+    hash_value(&schema, &mut hasher);
+
+    Ok(Value::String(format!(
+        "{:016x}",
+        hasher.0
+    )))
+}
+
+/// 64 bit FNV-1a. Small, dependency-free, and
+/// stable across Rust versions, unlike
+/// `DefaultHasher`.
+struct Fnv1a(u64);
+
+impl Default for Fnv1a {
+    fn default() -> Self {
+        Self(0xcbf2_9ce4_8422_2325)
+    }
+}
+
+impl Fnv1a {
+    fn write(&mut self, bytes: &[u8]) {
+        for byte in bytes {
+            self.0 ^= u64::from(*byte);
+            self.0 = self.0.wrapping_mul(0x0100_0000_01b3);
+        }
+    }
+}
+
+/// Hash a json value with object keys in sorted
+/// order, so that the fingerprint doesn't depend
+/// on the order types are stored in the registry.
+fn hash_value(value: &Value, hasher: &mut Fnv1a) {
+    match value {
+        Value::Null => hasher.write(b"n"),
+        Value::Bool(true) => hasher.write(b"t"),
+        Value::Bool(false) => hasher.write(b"f"),
+        Value::Number(number) => {
+            hasher.write(b"d");
+            hasher.write(number.to_string().as_bytes());
+        }
+        Value::String(string) => hash_str(string, hasher),
+        Value::Array(values) => {
+            hasher.write(b"[");
+            for value in values {
+                hash_value(value, hasher);
+            }
+            hasher.write(b"]");
+        }
+        Value::Object(map) => {
+            let mut keys = map.keys().collect::<Vec<_>>();
+            keys.sort();
+            hasher.write(b"{");
+            for key in keys {
+                hash_str(key, hasher);
+                hash_value(&map[key], hasher);
+            }
+            hasher.write(b"}");
+        }
+    }
+}
+
+fn hash_str(string: &str, hasher: &mut Fnv1a) {
+    // length-prefixed so that ["ab", "c"] and
+    // ["a", "bc"] hash differently
+    hasher.write(b"s");
+    hasher.write(&(string.len() as u64).to_le_bytes());
+    hasher.write(string.as_bytes());
+}
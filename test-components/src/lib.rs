@@ -61,11 +61,8 @@ pub enum Team {
 #[reflect(Component)]
 pub struct ATupleStruct(pub u32);
 
-/// MultiElementTupleStruct is not currently
-/// supported in the Blender addon. if you have a
-/// use case for this that isn't solvable by
-/// converting to a named field struct, open an
-/// issue or a PR
+/// Multi-element tuple structs turn into arrays
+/// of their values, in order
 #[derive(Component, Reflect, Debug)]
 #[reflect(Component)]
 pub struct MultiElementTupleStruct(
@@ -0,0 +1,277 @@
+# Benchmarks for the Blender extension
+#
+# Builds a synthetic scene of N objects (sharing one mesh) with M
+# components each, using types from test-components, and times:
+#
+# - process_registry, without the incremental rebuild or the
+#   on-disk registry cache
+# - insert_component_data
+# - get_data_from_active_editor
+# - a glTF export with the skein hooks, with an empty export cache
+#   and again with every datablock cached
+#
+# Results are written to a json file and compared against a stored
+# baseline. The fastest run of each benchmark is compared, and any
+# benchmark that is slower than the baseline by more than the
+# tolerance fails the run.
+#
+# Timings depend on the machine, so record a baseline on the machine
+# the benchmarks run on with `--update-baseline` and commit
+# tools/benchmark_baseline.json. Running without a baseline fails.
+#
+# blender --background --factory-startup --python tools/blender_benchmarks.py -- --objects 100 --components 8
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import bpy
+
+# this adds the extension to the path so we can import it
+# to call the require function
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(SCRIPT_DIR))
+
+from extension import register as breg
+from extension.export_cache import clear_component_cache
+from extension.component_writer import write_component
+from extension.form_to_object import get_data_from_active_editor
+from extension.op_insert_component import insert_component_data
+from extension.op_registry_loading import process_registry
+from extension.type_names import field_name
+
+# the components inserted on each object, in order. The first
+# --components of them are used.
+COMPONENTS = {
+    # nested structs
+    "test_components::TeamMember": {"player": {"name": "Benchmark", "power": 1.5, "test": 3}, "team": "Blue"},
+    # enums with data
+    "test_components::RichAndUnitEnum": {"Player": {"name": "Benchmark", "power": 2.5, "test": 4}},
+    # Option
+    "test_components::AnOptionalName": {"name": "Benchmark"},
+    # glam
+    "test_components::SuperGlam": None,
+    "test_components::LinearVelocity": [1.0, 2.0, 3.0],
+    "bevy_transform::components::transform::Transform": {"translation": [1.0, 2.0, 3.0], "rotation": [0.0, 0.0, 0.0, 1.0], "scale": [1.0, 1.0, 1.0]},
+    # unit enums
+    "test_components::TaskPriority": "Low",
+    # enums in structs
+    "test_components::AStructWithColor": None,
+}
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="blender_benchmarks.py")
+    parser.add_argument("--objects", type=int, default=100, help="objects in the synthetic scene")
+    parser.add_argument("--components", type=int, default=len(COMPONENTS), help="components on each object and its mesh")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each benchmark")
+    parser.add_argument("--registry", default="registry.json", help="registry json from the component_tests example")
+    parser.add_argument("--output", default="benchmark-results.json", help="where to write the results")
+    parser.add_argument("--baseline", default=os.path.join(SCRIPT_DIR, "benchmark_baseline.json"), help="results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="how much slower than the baseline a benchmark can be, 0.25 is 25%%")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline instead of comparing")
+    return parser.parse_args(argv)
+
+def measure(run, repeat, setup=None):
+    """time run() repeat times, calling setup() untimed before each run"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "median": statistics.median(timings), "runs": timings}
+
+def enable_extension():
+    """register the extension and add it to the enabled addons, which is
+    where the glTF exporter looks for glTF2ExportUserExtension"""
+    breg()
+    addon = bpy.context.preferences.addons.new()
+    addon.module = "extension"
+    preferences = addon.preferences
+    # every process_registry run should do the full amount of work
+    preferences.incremental = False
+    preferences.registry_cache = False
+    preferences.lazy = False
+    preferences.presets = False
+
+def component_data(type_path):
+    """the data written to each benchmark component"""
+    data = COMPONENTS[type_path]
+    if data is None:
+        with open(os.path.join(SCRIPT_DIR, "combined_snapshots.json")) as snapshots_file:
+            for snapshot in json.loads(snapshots_file.read()):
+                if type_path in snapshot:
+                    return snapshot[type_path]
+    return data
+
+def build_scene(object_count):
+    """an empty scene with object_count objects that share one mesh"""
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    mesh = bpy.data.meshes.new("skein_benchmark")
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+    objects = []
+    for index in range(object_count):
+        obj = bpy.data.objects.new("skein_benchmark_" + str(index), mesh)
+        obj.location = (index, 0, 0)
+        bpy.context.scene.collection.objects.link(obj)
+        objects.append(obj)
+    return mesh, objects
+
+def insert_components(datablocks, type_paths):
+    for datablock in datablocks:
+        for type_path in type_paths:
+            bpy.context.window_manager.selected_component = type_path
+            insert_component_data(bpy.context, datablock)
+
+def clear_components(datablocks):
+    for datablock in datablocks:
+        datablock.skein_two.clear()
+        datablock.active_component_index = 0
+
+def write_components(datablocks, type_paths):
+    data = {type_path: component_data(type_path) for type_path in type_paths}
+    for datablock in datablocks:
+        for component in datablock.skein_two:
+            type_path = component.selected_type_path
+            write_component(component, field_name(type_path), type_path, data[type_path])
+
+def read_components(datablocks):
+    for datablock in datablocks:
+        for component in datablock.skein_two:
+            get_data_from_active_editor(component, field_name(component.selected_type_path))
+
+def export_gltf(filepath):
+    bpy.ops.export_scene.gltf(
+        filepath=filepath,
+        export_format="GLTF_SEPARATE",
+        export_extras=True,
+    )
+
+def run_benchmarks(args, registry):
+    type_paths = list(COMPONENTS)[:args.components]
+    results = {}
+
+    results["process_registry"] = measure(
+        lambda: process_registry(bpy.context, registry),
+        args.repeat,
+    )
+
+    mesh, objects = build_scene(args.objects)
+    datablocks = objects + [mesh]
+
+    results["insert_component_data"] = measure(
+        lambda: insert_components(datablocks, type_paths),
+        args.repeat,
+        setup=lambda: clear_components(datablocks),
+    )
+    write_components(datablocks, type_paths)
+
+    results["get_data_from_active_editor"] = measure(
+        lambda: read_components(datablocks),
+        args.repeat,
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "skein_benchmark.gltf")
+        results["gltf_export"] = measure(
+            lambda: export_gltf(filepath),
+            args.repeat,
+            setup=clear_component_cache,
+        )
+        with open(filepath) as gltf_file:
+            if '"skein"' not in gltf_file.read():
+                raise RuntimeError("the exported glTF has no skein data, the export hooks didn't run")
+
+        # every datablock was gathered by the last export
+        results["gltf_export_cached"] = measure(
+            lambda: export_gltf(filepath),
+            args.repeat,
+        )
+
+    return {
+        "blender": bpy.app.version_string,
+        "objects": args.objects,
+        "components": len(type_paths),
+        "repeat": args.repeat,
+        "benchmarks": results,
+    }
+
+def regressions(results, baseline, tolerance):
+    """the benchmarks whose fastest run is slower than the
+    baseline's by more than the tolerance, or that aren't in the
+    baseline, as (name, baseline or None, result)"""
+    slower = []
+    for name, result in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            # a benchmark the baseline doesn't know about can't be
+            # checked, so the baseline has to be re-recorded
+            slower.append((name, None, result["min"]))
+            continue
+        expected = baseline["benchmarks"][name]["min"]
+        if result["min"] > expected * (1 + tolerance):
+            slower.append((name, expected, result["min"]))
+    return slower
+
+def main():
+    args = parse_args()
+
+    try:
+        registry_file = open(args.registry)
+    except OSError:
+        print(args.registry + " file not found. This is created from the component_tests example.")
+        print("cargo run --example component_tests")
+        print("nu ./tools/fetch-types.nu")
+        sys.exit(1)
+
+    with registry_file:
+        registry = json.loads(registry_file.read())
+
+    # without a baseline there's nothing to compare against, which
+    # must not pass silently
+    baseline = None
+    if not args.update_baseline:
+        try:
+            with open(args.baseline) as baseline_file:
+                baseline = json.loads(baseline_file.read())
+        except OSError:
+            print("skein: no benchmark baseline at", args.baseline + ". Record one on this machine with --update-baseline (just update-benchmark-baseline) and commit it")
+            sys.exit(1)
+
+    enable_extension()
+    results = run_benchmarks(args, registry)
+
+    for name, result in results["benchmarks"].items():
+        print(f"{name:<30} min {result['min'] * 1000:10.2f}ms  median {result['median'] * 1000:10.2f}ms")
+
+    with open(args.output, "w") as output_file:
+        output_file.write(json.dumps(results, indent=2))
+    print("skein: wrote benchmark results to", args.output)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            baseline_file.write(json.dumps(results, indent=2))
+        print("skein: wrote benchmark baseline to", args.baseline)
+        return
+
+    if (baseline["objects"], baseline["components"]) != (results["objects"], results["components"]):
+        print("skein: the baseline was recorded with", baseline["objects"], "objects and", baseline["components"], "components, not comparing")
+        sys.exit(1)
+
+    slower = regressions(results, baseline, args.tolerance)
+    for name, expected, actual in slower:
+        if expected is None:
+            print(f"skein: {name} is not in the baseline, re-record it with --update-baseline")
+        else:
+            print(f"skein: {name} regressed: {actual * 1000:.2f}ms, baseline {expected * 1000:.2f}ms")
+    if slower:
+        sys.exit(1)
+    print("skein: no benchmark regressed by more than", str(round(args.tolerance * 100)) + "%")
+
+if __name__ == '__main__':
+    main()
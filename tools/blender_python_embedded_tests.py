@@ -13,6 +13,10 @@ sys.path.append(os.path.dirname(SCRIPT_DIR))
 from extension import register as breg, unregister as bunreg
 from extension.op_registry_loading import process_registry
 from extension.form_to_object import get_data_from_active_editor
+from extension.object_to_form import object_to_form
+from extension.component_writer import write_component
+from extension.serializers import serialize_component
+from extension.snapshot_export import component_snapshots, serialize_snapshot
 from extension.property_groups import hash_over_64
 
 snapshots = {}
@@ -27,10 +31,8 @@ class ComponentPropertyTests(unittest.TestCase):
 
         container = bpy.context.active_object.skein_two[0]
 
-        # load-bearing getattr
-        # without this getattr, the object doesn't actually get initialized
-        obj = getattr(container, "test_components::LinearVelocity")
-        obj.x = 2.
+        # LinearVelocity wraps a glam::Vec3, which is a FloatVectorProperty
+        getattr(container, "test_components::LinearVelocity")[0] = 2.
 
         data = get_data_from_active_editor(
             container,
@@ -40,6 +42,78 @@ class ComponentPropertyTests(unittest.TestCase):
         self.assertEqual(data, [2.0, 0.0, 0.0])
         bpy.ops.object.remove_component()
 
+    def test_quat_order(self):
+        bpy.context.window_manager.selected_component = "bevy_transform::components::transform::Transform";
+        bpy.ops.object.insert_component()
+
+        container = bpy.context.active_object.skein_two[0]
+        object_to_form(
+            container,
+            container.selected_type_path,
+            {"translation": [1.0, 2.0, 3.0], "rotation": [0.0, 0.0, 0.0, 1.0], "scale": [1.0, 1.0, 1.0]},
+        )
+
+        transform = getattr(container, container.selected_type_path)
+        # Blender stores quaternions as w, x, y, z
+        self.assertEqual(list(transform.rotation), [1.0, 0.0, 0.0, 0.0])
+
+        data = get_data_from_active_editor(
+            container,
+            container.selected_type_path
+        )
+        self.assertEqual(data["rotation"], [0.0, 0.0, 0.0, 1.0])
+        self.assertEqual(data["translation"], [1.0, 2.0, 3.0])
+        bpy.ops.object.remove_component()
+
+    def test_write_component(self):
+        bpy.context.window_manager.selected_component = "bevy_transform::components::transform::Transform";
+        bpy.ops.object.insert_component()
+
+        container = bpy.context.active_object.skein_two[0]
+        value = {"translation": [1.0, 2.0, 3.0], "rotation": [0.0, 0.0, 0.0, 1.0], "scale": [1.0, 1.0, 1.0]}
+        write_component(container, container.selected_type_path, container.selected_type_path, value)
+
+        transform = getattr(container, container.selected_type_path)
+        # written straight into IDProperties, in Blender's w, x, y, z order
+        self.assertEqual(list(transform.rotation), [1.0, 0.0, 0.0, 0.0])
+        self.assertEqual(
+            get_data_from_active_editor(container, container.selected_type_path),
+            value
+        )
+        bpy.ops.object.remove_component()
+
+    def test_write_partial_component(self):
+        bpy.context.window_manager.selected_component = "test_components::TeamMember";
+        bpy.ops.object.insert_component()
+
+        container = bpy.context.active_object.skein_two[0]
+        value = {"player": {"name": "Chris", "power": 1.5, "test": 3}, "team": "Blue"}
+        write_component(container, container.selected_type_path, container.selected_type_path, value)
+        # like a preset that only sets some fields
+        write_component(container, container.selected_type_path, container.selected_type_path, {"player": {"power": 9.0}})
+
+        self.assertEqual(
+            get_data_from_active_editor(container, container.selected_type_path),
+            {"player": {"name": "Chris", "power": 9.0, "test": 3}, "team": "Blue"}
+        )
+        bpy.ops.object.remove_component()
+
+    def test_multi_element_tuple_struct(self):
+        bpy.context.window_manager.selected_component = "test_components::MultiElementTupleStruct";
+        bpy.ops.object.insert_component()
+
+        container = bpy.context.active_object.skein_two[0]
+        value = [12, [1.0, 2.0, 3.0], 2, "testing"]
+        object_to_form(container, container.selected_type_path, value)
+
+        data = get_data_from_active_editor(
+            container,
+            container.selected_type_path
+        )
+
+        self.assertEqual(data, value)
+        bpy.ops.object.remove_component()
+
     def test_snapshots(self):
         self.maxDiff = None
         for snapshot in snapshots:
@@ -57,15 +131,25 @@ class ComponentPropertyTests(unittest.TestCase):
                     container = bpy.context.active_object.skein_two[0]
 
                     try:
-                        if inspect.isclass(bpy.context.window_manager.skein_property_groups[container.selected_type_path]):
-                            data = get_data_from_active_editor(
-                                container,
-                                maybe_hashed_type_path
-                            )
-                            self.assertEqual(data, value)
-                        else:
-                            data = getattr(container, maybe_hashed_type_path)
-                            self.assertEqual(data, value)
+                        # PropertyGroups and single values (like glam
+                        # vectors) are both read through get_data_from_active_editor
+                        data = get_data_from_active_editor(
+                            container,
+                            maybe_hashed_type_path
+                        )
+                        self.assertEqual(data, value)
+                        # the compiled serializers exports use
+                        # agree with the generic walk
+                        self.assertEqual(
+                            serialize_component(container, maybe_hashed_type_path, type_path),
+                            value
+                        )
+                        # and so does reshaping the raw IDProperties
+                        data_snapshots = component_snapshots(bpy.context.active_object)
+                        self.assertEqual(
+                            serialize_snapshot(data_snapshots[0], container, type_path),
+                            value
+                        )
                     except Exception as e:
                         raise
                     finally: